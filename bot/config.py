@@ -52,6 +52,22 @@ def get_serpapi_cache_ttl_hours() -> int:
     except (ValueError, TypeError):
         return 24
 
+def get_serpapi_cache_fresh_minutes() -> int | None:
+    """Age after which a cached listing is refreshed in the background; unset disables refreshes."""
+    val = os.getenv("SERPAPI_CACHE_FRESH_MINUTES")
+    if not val:
+        return None
+    try:
+        return int(val)
+    except (ValueError, TypeError):
+        logger.warning("Invalid SERPAPI_CACHE_FRESH_MINUTES: '%s', background refresh disabled", val)
+        return None
+
+def get_serpapi_prefetch_categories() -> list[str]:
+    """Categories fetched ahead when the category menu opens; empty (the default) disables prefetching."""
+    val = os.getenv("SERPAPI_PREFETCH_CATEGORIES", "")
+    return [c.strip().lower() for c in val.split(",") if c.strip()]
+
 def get_tts_language() -> str:
     """Retrieves the TTS language from environment variables, defaulting to 'en-US'."""
     return os.getenv("TTS_LANGUAGE", "en-US")
@@ -17,6 +17,10 @@ from telegram.ext import CallbackContext
 
 from bot.config import (
     get_serpapi_api_key,
+    get_serpapi_cache_fresh_minutes,
+    get_serpapi_cache_ttl_hours,
+    get_serpapi_prefetch_categories,
+    get_serpapi_use_cache,
     get_tts_language
 )
 from bot.services.news_service import NewsService
@@ -52,7 +56,10 @@ def get_news_service_instance() -> NewsService:
     logger.debug("Creating NewsService instance.")
     api_key: Optional[str] = get_serpapi_api_key()
     tts_lang: str = get_tts_language()
-    return NewsService(api_key=api_key, default_language=tts_lang, default_page_size=10)
+    return NewsService(api_key=api_key, default_language=tts_lang, default_page_size=10,
+                       use_cache=get_serpapi_use_cache(), cache_ttl_hours=get_serpapi_cache_ttl_hours(),
+                       cache_fresh_minutes=get_serpapi_cache_fresh_minutes(),
+                       prefetch=get_serpapi_prefetch_categories())
 
 @trace()
 def get_video_service_instance() -> VideoService:
@@ -71,6 +78,8 @@ async def show_category_selection(update: Update, context: CallbackContext) -> N
     message_sender = MessageSender(context=context)
     news_service = get_news_service_instance()
     categories = news_service.get_news_categories()
+    # Fetch the configured never-cached listings while the user is choosing (off by default)
+    news_service.prefetch_categories()
     keyboard = [
         [InlineKeyboardButton(category.capitalize(), callback_data=category)] 
         for category in categories
@@ -2,7 +2,7 @@
 Service layer for handling news-related operations.
 
 This module provides the `NewsService` class, which encapsulates the logic for
-fetching news articles from external APIs, managing a cache of these articles,
+fetching news articles from external APIs through the shared query cache
 and providing access to news categories and individual news items.
 It uses a news provider (e.g., `SerpAPIProvider`) for external communication.
 """
@@ -20,19 +20,24 @@ class NewsService:
     """
     A service class for managing news fetching and caching.
 
+    Listings come from the provider's shared query cache (on disk, per
+    category, stale-while-revalidate), so they survive across the short-lived
+    instances the handlers create and are served instantly once warm.
+
     Attributes:
         api_key (Optional[str]): The API key for the news provider.
         default_language (str): Default language for news fetching.
         default_page_size (int): Default number of news items to fetch.
-        news_cache (Dict[str, Any]): In-memory cache for news articles.
+        news_cache (Dict[str, Any]): The last listing returned by this instance.
             Structure: {"timestamp": float, "news": List[Dict[str, Any]], "category": Optional[str]}
         news_provider (SerpAPIProvider): Instance of the news provider client.
-        CACHE_TIMEOUT (int): Static variable for cache expiration time in seconds.
     """
-    CACHE_TIMEOUT: int = 300  # 5 minutes (300 seconds)
 
     @trace()
-    def __init__(self, api_key: Optional[str], default_language: str = 'en', default_page_size: int = 10):
+    def __init__(self, api_key: Optional[str], default_language: str = 'en', default_page_size: int = 10,
+                 use_cache: bool = True, cache_ttl_hours: int = 24,
+                 cache_fresh_minutes: Optional[int] = None,
+                 prefetch: Optional[List[str]] = None):
         """
         Initializes the NewsService.
 
@@ -41,27 +46,26 @@ class NewsService:
                      in which case a warning is logged and API calls will fail.
             default_language: Default language for news fetching.
             default_page_size: Default page size for news fetching.
+            use_cache: Whether listings go through the shared query cache.
+            cache_ttl_hours: How long a cached listing is served.
+            cache_fresh_minutes: Age after which a served listing is also refreshed in the
+                                 background (None: no background refresh).
+            prefetch: Categories fetched ahead by prefetch_categories (None or empty: none).
         """
         self.api_key: Optional[str] = api_key
         self.default_language: str = default_language
         self.default_page_size: int = default_page_size
         self.news_cache: Dict[str, Any] = {"timestamp": 0, "news": [], "category": None}
+        self.prefetch: List[str] = list(prefetch or [])
         
         if not self.api_key:
             logger.warning("NewsService initialized without an API key. News fetching will not work.")
-        self.news_provider: SerpAPIProvider = SerpAPIProvider(api_key=self.api_key) 
+        self.news_provider: SerpAPIProvider = SerpAPIProvider(
+            api_key=self.api_key, use_cache=use_cache, cache_ttl_hours=cache_ttl_hours,
+            fresh_ttl_minutes=cache_fresh_minutes
+        )
         logger.debug(f"NewsService initialized with language '{default_language}' and page size {default_page_size}.")
 
-    @trace()
-    def is_cache_expired(self) -> bool:
-        """Checks if the news cache has expired based on `CACHE_TIMEOUT`."""
-        expired: bool = time.time() - self.news_cache["timestamp"] > self.CACHE_TIMEOUT
-        if expired:
-            logger.debug("News cache is expired.")
-        else:
-            logger.debug("News cache is still valid.")
-        return expired
-
     @trace()
     def get_news_categories(self) -> List[str]:
         """
@@ -73,11 +77,32 @@ class NewsService:
         logger.debug("Retrieving news categories.")
         return ['business', 'entertainment', 'general', 'health', 'science', 'sports', 'technology']
 
+    @trace()
+    def prefetch_categories(self, language: Optional[str] = None) -> int:
+        """
+        Starts background fetches for the configured prefetch categories that
+        have never been cached, so the listing is ready by the time the user
+        picks one. Off unless categories are configured, since each cold one is
+        a billed search; cached listings (even old ones) cost nothing here.
+
+        Returns:
+            The number of categories being fetched.
+        """
+        categories = [c for c in self.get_news_categories() if c in self.prefetch]
+        if not self.api_key or not categories:
+            return 0
+        started = self.news_provider.warm_categories(categories, language or self.default_language)
+        logger.debug(f"Prefetching {started} news categories.")
+        return started
+
     @trace()
     def fetch_news(self, category: str, language: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Fetches news for a given category.
-        Uses cached news if available and not expired, otherwise fetches fresh news.
+
+        Served from the shared query cache when possible; a stale listing is
+        returned immediately while it is refreshed in the background.
+
         Args:
             category: The category of news to fetch.
             language: The language for the news. If None, uses the service's default language.
@@ -89,48 +114,30 @@ class NewsService:
         """
         current_language: str = language if language else self.default_language
         current_limit: int = limit if limit else self.default_page_size
-        cache_category: Optional[str] = self.news_cache.get("category")
-
-        # Determine if cache needs refresh
-        refresh_needed = (
-            not self.news_cache["news"] or 
-            self.is_cache_expired() or 
-            cache_category != category
-        )
 
-        if refresh_needed:
-            logger.info(f"Cache miss or expired for category '{category}'. Fetching fresh news. "
-                        f"Previous cache category was '{cache_category}'.")
-            if not self.api_key:
-                logger.error("Cannot fetch news: API key is not set.")
-                return []
-            
-            try:
-                logger.debug(f"Fetching news from provider: category='{category}', lang='{current_language}', limit={current_limit}")
-                latest_news_data: List[Dict[str, Any]] = self.news_provider.get_latest_news(
-                    language=current_language,
-                    limit=current_limit,
-                    category=category
-                )
-                self.news_cache["news"] = latest_news_data
-                self.news_cache["timestamp"] = time.time()
-                self.news_cache["category"] = category 
-                logger.info(f"News cache updated for category: {category} with {len(latest_news_data)} items.")
-            except Exception as e:
-                logger.error(f"Error fetching news from provider for category '{category}': {e}", exc_info=True)
-                # Return old cache if it matches the requested category, otherwise empty list
-                if self.news_cache.get("category") == category:
-                    return self.news_cache.get("news", [])
-                return []
-        else:
-            logger.info(f"Using cached news for category: {category}.")
-        
-        return self.news_cache.get("news", [])
+        if not self.api_key:
+            logger.error("Cannot fetch news: API key is not set.")
+            return []
+
+        try:
+            logger.debug(f"Fetching news: category='{category}', lang='{current_language}', limit={current_limit}")
+            latest_news_data: List[Dict[str, Any]] = self.news_provider.get_latest_news(
+                language=current_language,
+                limit=current_limit,
+                category=category
+            )
+        except Exception as e:
+            logger.error(f"Error fetching news from provider for category '{category}': {e}", exc_info=True)
+            latest_news_data = []
+
+        self.news_cache = {"timestamp": time.time(), "news": latest_news_data, "category": category}
+        logger.info(f"Fetched {len(latest_news_data)} news items for category: {category}.")
+        return latest_news_data
 
     @trace()
     def get_cached_news(self) -> List[Dict[str, Any]]:
         """
-        Returns the currently cached list of news items.
+        Returns the last listing fetched by this instance.
         
         Returns:
             A list of dictionaries, where each dictionary is a news item.
@@ -1,6 +1,7 @@
 import asyncio
 import json
 import logging
+import threading
 from typing import Any, Awaitable, Callable, Dict, Optional
 
 from telegram import Bot, CallbackQuery
@@ -14,6 +15,7 @@ from scripts.utils.app_logger import trace
 logger = logging.getLogger(__name__)
 
 MAX_CONSECUTIVE_ERRORS = 3
+VIRAL_BATCH_SIZE = 3  # stories whose LLM content is generated ahead of rendering
 PROCESSING_TIMEOUT = 600  # seconds (10 min) for full pipeline
 
 
@@ -31,6 +33,7 @@ class VideoService:
         style: Optional[str] = None,
         callback_query: Optional[CallbackQuery] = None,
         bot: Optional[Bot] = None,
+        generated: Optional[tuple] = None,
     ) -> Optional[Dict[str, Any]]:
         logger.info("Processing short news - Title: %s", news_item_title)
 
@@ -50,7 +53,7 @@ class VideoService:
             news_data = {"title": news_item_title, "description": news_item_description}
             if style:
                 news_data["style"] = style
-            return processor.process_latest_news_in_short_format(news_data)
+            return processor.process_latest_news_in_short_format(news_data, generated=generated)
 
         try:
             return await asyncio.wait_for(
@@ -189,6 +192,8 @@ class VideoService:
             return
 
         news_processor_instance = NewsProcessor(config)
+        batch_size = max(1, int(config.get("settings", {}).get("viral_batch_size", VIRAL_BATCH_SIZE)))
+        article_generator = None
 
         if num_to_process is None:
             await send_msg("Processing all available viral news (iteration based)...")
@@ -196,57 +201,92 @@ class VideoService:
         processed_count = 0
         consecutive_errors = 0
         items_to_fetch = float("inf") if num_to_process is None else num_to_process
-
-        while processed_count < items_to_fetch:
-            news_item = news_processor_instance.get_next_viral_news()
-            if not news_item:
+        exhausted = False
+
+        while processed_count < items_to_fetch and not exhausted:
+            batch = []
+            wanted = min(batch_size, items_to_fetch - processed_count)
+            while len(batch) < wanted:
+                news_item = news_processor_instance.get_next_viral_news()
+                if not news_item:
+                    exhausted = True
+                    break
+                url = news_item.get("url", "")
+                logger.info("Found viral news: Title: %s, URL: %s", news_item.get("title", "N/A"), url)
+                if not url or await self._check_url_processed(url):
+                    logger.info("Skipping already processed or invalid URL: %s", url or "N/A")
+                    continue
+                batch.append(news_item)
+
+            if not batch:
                 if items_to_fetch == float("inf"):
                     await send_msg(
                         "No more viral news to process at the moment."
                     )
                 break
 
-            title = news_item.get("title", "N/A")
-            url = news_item.get("url", "")
-            logger.info("Found viral news: Title: %s, URL: %s", title, url)
+            # Article bundles for the whole batch are written concurrently in the
+            # background; each story is rendered as soon as its bundle lands.
+            if article_generator is None:
+                article_generator = await asyncio.to_thread(NewsVideoProcessor.build_article_generator, config)
+            stop_event = threading.Event()
+            results = article_generator.generate_batch(
+                [{"title": item["url"], "url": item["url"]} for item in batch],
+                max_workers=batch_size,
+                stop_event=stop_event,
+                max_errors=MAX_CONSECUTIVE_ERRORS,
+            )
+
+            while True:
+                batch_result = await asyncio.to_thread(results.get)
+                if batch_result is None:
+                    break
+                news_item = batch[batch_result.index]
+                title = news_item.get("title", "N/A")
+                url = news_item.get("url", "")
+
+                try:
+                    if batch_result.error is not None:
+                        raise batch_result.error
+                    await send_msg(f"Processing viral news (short format): {title}...")
+                    result = await self.process_short_news(
+                        news_item_title=url,
+                        news_item_description="",
+                        generated=batch_result.bundle,
+                    )
+                    if result is None:
+                        raise RuntimeError("Processing returned no result")
 
-            if not url or await self._check_url_processed(url):
-                logger.info("Skipping already processed or invalid URL: %s", url or "N/A")
-                continue
+                    video_id = result.get("id", "N/A") if result else "N/A"
+                    await send_msg(
+                        f"Successfully processed: {title}. Video ID: {video_id}" if video_id != "N/A"
+                        else f"Successfully processed: {title}."
+                    )
 
-            try:
-                await send_msg(f"Processing viral news (short format): {title}...")
-                result = await self.process_short_news(
-                    news_item_title=url,
-                    news_item_description="",
-                )
-                if result is None:
-                    raise RuntimeError("Processing returned no result")
-
-                video_id = result.get("id", "N/A") if result else "N/A"
-                await send_msg(
-                    f"Successfully processed: {title}. Video ID: {video_id}" if video_id != "N/A"
-                    else f"Successfully processed: {title}."
-                )
-
-                await self._save_processed(news_item)
-                processed_count += 1
-                consecutive_errors = 0
-            except Exception as e:
-                consecutive_errors += 1
-                logger.error(
-                    "Error processing URL %s (consecutive errors: %d): %s",
-                    url, consecutive_errors, e,
-                )
-                await send_msg(
-                    f"Error processing news from URL {url}: {e}",
-                    logging.ERROR,
-                )
-                if consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
+                    await self._save_processed(news_item)
+                    processed_count += 1
+                    consecutive_errors = 0
+                except Exception as e:
+                    consecutive_errors += 1
+                    logger.error(
+                        "Error processing URL %s (consecutive errors: %d): %s",
+                        url, consecutive_errors, e,
+                    )
                     await send_msg(
-                        "Too many consecutive errors. Stopping viral processing.",
+                        f"Error processing news from URL {url}: {e}",
                         logging.ERROR,
                     )
+                    if consecutive_errors >= MAX_CONSECUTIVE_ERRORS:
+                        await send_msg(
+                            "Too many consecutive errors. Stopping viral processing.",
+                            logging.ERROR,
+                        )
+                        stop_event.set()
+                        exhausted = True
+                        break
+                if processed_count >= items_to_fetch:
+                    # Enough videos; don't let the generator start the rest of the batch
+                    stop_event.set()
                     break
 
         if processed_count > 0:
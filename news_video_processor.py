@@ -17,13 +17,14 @@ from scripts.AI.speech_to_text import stt_whisper
 from scripts.AI.text_to_speech import TTSFactory, TTSProvider
 from scripts.AI.text_to_image import FluxImageGenerator, AspectRatio, StylePreset
 from scripts.DataFetcher.pexels_media_fetcher import PexelsMediaFetcher
-from scripts.DataFetcher.serpapi_client import SerpAPIProvider
+from scripts.DataFetcher.serpapi_client import DEFAULT_CACHE_DIR as SERPAPI_CACHE_DIR, SerpAPIProvider
 from scripts.MediaManagers.SRT_Processor import SRTProcessor
 from scripts.video_assembler import VideoAssembler
 from scripts.helpers.media_helper import ImageHelper, Position, Style
 from scripts.Uploaders.youtube_uploader import YoutubeMediaUploader
 from scripts.utils.app_logger import trace
 from scripts.utils.rate_limiter import RateLimiter
+from scripts.utils.http_client import get_http_client
 
 # Initialize Colorama
 init(autoreset=True)
@@ -68,27 +69,32 @@ class NewsVideoProcessor:
         self.config = self._load_configuration()
         self.temp_dir = self.config[CONFIG_SETTINGS]['temp_dir']
         self.parallel_workers = self.config[CONFIG_SETTINGS].get('parallel_workers', 6)
+        self.streaming_render = self.config[CONFIG_SETTINGS].get('streaming_render', False)
         images_per_minute = self.config[CONFIG_SETTINGS].get('images_per_minute', 20)
         self._img_rate_limiter = RateLimiter(images_per_minute, 60.0) if images_per_minute and images_per_minute > 0 else None
+        get_http_client().configure_rate_limits(self.config.get('http', {}).get('rate_limits', {}))
         serpapi_cfg = self.config[CONFIG_SERPAPI]
         self.news_client = SerpAPIProvider(
             api_key=serpapi_cfg['api_key'],
             use_cache=serpapi_cfg.get('use_cache', True),
             cache_ttl_hours=serpapi_cfg.get('cache_ttl_hours', 24),
-            cache_dir=serpapi_cfg.get('cache_dir', '.temp/cache/serpapi'),
-        )
-        llm_providers = self.config.get("llm", {}).get("providers", [])
-        self.article_generator = Chatbot(
-            language=self.config[CONFIG_ARTICLE_SETTINGS]['language'],
-            model=self.config[CONFIG_ARTICLE_SETTINGS]['model'],
-            providers=llm_providers,
+            cache_dir=serpapi_cfg.get('cache_dir', SERPAPI_CACHE_DIR),
+            fresh_ttl_minutes=serpapi_cfg.get('fresh_ttl_minutes'),
         )
+        self.article_generator = self.build_article_generator(self.config)
         self.media_fetcher = PexelsMediaFetcher(
             api_key=self.config[CONFIG_PEXELS]['api_key'],
             temp_dir=self.temp_dir
         )
-        self.stt = stt_whisper()
-        self.tts = TTSFactory(TTSProvider.EDGE, output_dir=self.temp_dir)
+        self._stt: Optional[stt_whisper] = None
+        tts_cfg = self.config.get(CONFIG_TTS_EDGE, {})
+        self.tts = TTSFactory(
+            TTSProvider.EDGE,
+            output_dir=self.temp_dir,
+            max_workers=tts_cfg.get('parallel_chunks', 4),
+            chunk_chars=tts_cfg.get('chunk_chars', 600),
+            cache_dir=tts_cfg.get('cache_dir', '.cache/tts') if tts_cfg.get('use_cache', True) else None,
+        )
         azure_img = self.config.get("azure_images", {})
         self.image_generator = FluxImageGenerator(
             output_dir=self.temp_dir,
@@ -104,6 +110,29 @@ class NewsVideoProcessor:
         self.video_files: List[str] = []
         self.cover_path: Optional[str] = None
 
+    @property
+    def stt(self) -> stt_whisper:
+        """Whisper helper, created on first use; the model itself is shared process-wide."""
+        if self._stt is None:
+            stt_cfg = self.config.get('stt', {})
+            self._stt = stt_whisper(
+                model_name=stt_cfg.get('model', 'small'),
+                device=stt_cfg.get('device'),
+                quantize=stt_cfg.get('quantize', False),
+            )
+        return self._stt
+
+    @staticmethod
+    def build_article_generator(config: Dict[str, Any]) -> Chatbot:
+        """Create the Chatbot described by the article_settings and llm sections of a config."""
+        llm_config = config.get("llm", {})
+        return Chatbot(
+            language=config[CONFIG_ARTICLE_SETTINGS]['language'],
+            model=config[CONFIG_ARTICLE_SETTINGS]['model'],
+            providers=llm_config.get("providers", []),
+            measure_prompt_cache=llm_config.get("measure_prompt_cache", False),
+        )
+
     @trace()
     def send_progress(self, message_text: str) -> None:
         if not self._bot or not self._event_loop:
@@ -384,12 +413,16 @@ class NewsVideoProcessor:
         return random.choice(presets)
 
     @trace()
-    def process_latest_news_in_short_format(self, forze_topic: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def process_latest_news_in_short_format(
+        self, forze_topic: Dict[str, Any], generated: Optional[Tuple] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Process the latest news, generating articles, media, subtitles, and uploading the videos (short format).
 
         Args:
             forze_topic (dict): News topic to process.
+            generated (tuple, optional): Article bundle already produced by Chatbot
+                (e.g. via Chatbot.generate_batch); skips the content generation step.
 
         Returns:
             dict or None: YouTube upload response or None if failed.
@@ -416,7 +449,7 @@ class NewsVideoProcessor:
                 )
 
                 article, phrases, title, description, tags, cover_text, cover_image = \
-                    self.article_generator.generate_article_and_phrases_short(topic)
+                    generated or self.article_generator.generate_article_and_phrases_short(topic)
 
                 if not article:
                     self.send_progress(
@@ -437,56 +470,61 @@ class NewsVideoProcessor:
                     target_size=(1080, 1920),
                 )
 
-                self.send_progress(
-                    "🎤 *Audio Generation*\n\n"
-                    "Creating professional voiceover\n"
-                    "_This may take a few moments..._"
-                )
-
+                output_file = os.path.join(self.temp_dir, self.clean_filename(title))
                 subtitle_path = os.path.join(self.temp_dir, 'subtitles.srt')
-                audio_path = self.tts.text_to_speech_file(
-                    article,
-                    voice=self.config[CONFIG_TTS_EDGE]['voice'],
-                    language=self.config[CONFIG_TTS_EDGE].get('language', 'es'),
-                    srt_path=subtitle_path,
-                    rate=self.config[CONFIG_TTS_EDGE].get('speech_rate_adjustment', 0),
-                    pitch=self.config[CONFIG_TTS_EDGE].get('pitch_adjustment', 0),
-                )
-
-                self._write_state("audio_ready", subtitle_path=subtitle_path, audio_path=audio_path)
-
-                self.send_progress(
-                    "🖼️ *Media Generation*\n\n"
-                    f"Creating `{len(phrases)}` visual elements\n"
-                    "_Generating engaging visuals..._"
-                )
-
-                self.image_generator.model = "black-forest-labs/FLUX.1-schnell"
                 style_name = topic.get('style')
                 if style_name:
                     random_style = StylePreset[style_name]
                 else:
                     random_style = self.get_random_style()
-                media_images = self.fetch_related_media(phrases, random_style, len(phrases))
 
-                self._write_state("media_ready", image_count=len(media_images))
+                if not (self.streaming_render and self._render_streaming(
+                    article, phrases, random_style, AspectRatio.PORTRAIT, '9:16',
+                    output_file, subtitle_path, Style.DEFAULT, Position.BOTTOM_CENTER,
+                )):
+                    self.send_progress(
+                        "🎤 *Audio Generation*\n\n"
+                        "Creating professional voiceover\n"
+                        "_This may take a few moments..._"
+                    )
+
+                    audio_path = self.tts.text_to_speech_file(
+                        article,
+                        voice=self.config[CONFIG_TTS_EDGE]['voice'],
+                        language=self.config[CONFIG_TTS_EDGE].get('language', 'es'),
+                        srt_path=subtitle_path,
+                        rate=self.config[CONFIG_TTS_EDGE].get('speech_rate_adjustment', 0),
+                        pitch=self.config[CONFIG_TTS_EDGE].get('pitch_adjustment', 0),
+                    )
 
-                self.send_progress(
-                    "🎥 *Video Assembly*\n\n"
-                    "Combining all elements\n"
-                    "_Creating final composition..._"
-                )
+                    self._write_state("audio_ready", subtitle_path=subtitle_path, audio_path=audio_path)
 
-                output_file = os.path.join(self.temp_dir, self.clean_filename(title))
-                video_assembler = VideoAssembler(
-                    subtitle_file=subtitle_path if os.path.exists(subtitle_path) else None,
-                    voiceover_file=audio_path,
-                    output_file=output_file,
-                    media_images=media_images,
-                    background_music=self.config.get(CONFIG_VIDEO_RESULT, {}).get('background_music', ''),
-                    aspect_ratio='9:16'
-                )
-                video_assembler.assemble_video(Style.DEFAULT, position=Position.BOTTOM_CENTER)
+                    self.send_progress(
+                        "🖼️ *Media Generation*\n\n"
+                        f"Creating `{len(phrases)}` visual elements\n"
+                        "_Generating engaging visuals..._"
+                    )
+
+                    self.image_generator.model = "black-forest-labs/FLUX.1-schnell"
+                    media_images = self.fetch_related_media(phrases, random_style, len(phrases))
+
+                    self._write_state("media_ready", image_count=len(media_images))
+
+                    self.send_progress(
+                        "🎥 *Video Assembly*\n\n"
+                        "Combining all elements\n"
+                        "_Creating final composition..._"
+                    )
+
+                    video_assembler = VideoAssembler(
+                        subtitle_file=subtitle_path if os.path.exists(subtitle_path) else None,
+                        voiceover_file=audio_path,
+                        output_file=output_file,
+                        media_images=media_images,
+                        background_music=self.config.get(CONFIG_VIDEO_RESULT, {}).get('background_music', ''),
+                        aspect_ratio='9:16'
+                    )
+                    video_assembler.assemble_video(Style.DEFAULT, position=Position.BOTTOM_CENTER)
 
                 self._write_state("video_ready", output_file=output_file)
 
@@ -521,12 +559,16 @@ class NewsVideoProcessor:
             return None
 
     @trace()
-    def process_latest_news_in_long_format(self, forze_topic: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    def process_latest_news_in_long_format(
+        self, forze_topic: Dict[str, Any], generated: Optional[Tuple] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Process the latest news, generating articles, media, subtitles, and uploading the videos (long format).
 
         Args:
             forze_topic (dict): News topic to process.
+            generated (tuple, optional): Article bundle already produced by Chatbot
+                (e.g. via Chatbot.generate_batch); skips the content generation step.
 
         Returns:
             dict or None: YouTube upload response or None if failed.
@@ -554,7 +596,7 @@ class NewsVideoProcessor:
                 )
 
                 article, phrases, title, description, tags, cover_text, cover_image = \
-                    self.article_generator.generate_article_and_phrases_long(topic['title'])
+                    generated or self.article_generator.generate_article_and_phrases_long(topic['title'])
 
                 if not article:
                     self.send_progress(
@@ -581,60 +623,65 @@ class NewsVideoProcessor:
                 else:
                     self.cover_path = None
 
-                self.send_progress(
-                    "🎤 *Audio Production*\n\n"
-                    "Creating professional narration\n"
-                    "_Generating clear voiceover..._"
-                )
-
-                audio_path = self.tts.text_to_speech_file(
-                    article,
-                    voice=self.config[CONFIG_TTS_EDGE]['voice'],
-                    language=self.config[CONFIG_TTS_EDGE].get('language', 'es'),
-                    srt_path=os.path.join(self.temp_dir, 'subtitles.srt'),
-                    rate=self.config[CONFIG_TTS_EDGE].get('speech_rate_adjustment', 0),
-                    pitch=self.config[CONFIG_TTS_EDGE].get('pitch_adjustment', 0),
-                    boundary_type="WordBoundary",
-                )
-
+                output_file = os.path.join(self.temp_dir, self.clean_filename(title))
                 subtitle_path = os.path.join(self.temp_dir, 'subtitles.srt')
-                processor = SRTProcessor(subtitle_path, max_duration=4.0, max_words=8, pause_threshold=0.3)
-                processor.process()
-
-                self._write_state("audio_ready", subtitle_path=subtitle_path, audio_path=audio_path)
-
-                self.send_progress(
-                    "🖼️ *Visual Content*\n\n"
-                    f"Generating `{len(phrases)}` visual segments\n"
-                    "_Creating professional imagery..._"
-                )
-
-                self.image_generator.model = "black-forest-labs/FLUX.1-schnell"
                 style_name = topic.get('style')
                 if style_name:
                     random_style = StylePreset[style_name]
                 else:
                     random_style = self.get_random_style()
-                media_images = self.fetch_related_media(phrases, random_style, len(phrases), orientation=AspectRatio.LANDSCAPE)
 
-                self._write_state("media_ready", image_count=len(media_images))
+                if not (self.streaming_render and self._render_streaming(
+                    article, phrases, random_style, AspectRatio.LANDSCAPE, '16:9',
+                    output_file, subtitle_path, Style.FORMAL, Position.BOTTOM_CENTER,
+                    subtitle_postprocess=self._regroup_subtitles,
+                )):
+                    self.send_progress(
+                        "🎤 *Audio Production*\n\n"
+                        "Creating professional narration\n"
+                        "_Generating clear voiceover..._"
+                    )
 
-                self.send_progress(
-                    "🎬 *Video Production*\n\n"
-                    "Assembling final video\n"
-                    "_Combining all elements..._"
-                )
+                    audio_path = self.tts.text_to_speech_file(
+                        article,
+                        voice=self.config[CONFIG_TTS_EDGE]['voice'],
+                        language=self.config[CONFIG_TTS_EDGE].get('language', 'es'),
+                        srt_path=subtitle_path,
+                        rate=self.config[CONFIG_TTS_EDGE].get('speech_rate_adjustment', 0),
+                        pitch=self.config[CONFIG_TTS_EDGE].get('pitch_adjustment', 0),
+                        boundary_type="WordBoundary",
+                    )
 
-                output_file = os.path.join(self.temp_dir, self.clean_filename(title))
-                video_assembler = VideoAssembler(
-                    subtitle_file=subtitle_path if os.path.exists(subtitle_path) else None,
-                    voiceover_file=audio_path,
-                    output_file=output_file,
-                    media_images=media_images,
-                    background_music=self.config.get(CONFIG_VIDEO_RESULT, {}).get('background_music', ''),
-                    aspect_ratio='16:9'
-                )
-                video_assembler.assemble_video(Style.FORMAL, position=Position.BOTTOM_CENTER)
+                    self._regroup_subtitles(subtitle_path)
+
+                    self._write_state("audio_ready", subtitle_path=subtitle_path, audio_path=audio_path)
+
+                    self.send_progress(
+                        "🖼️ *Visual Content*\n\n"
+                        f"Generating `{len(phrases)}` visual segments\n"
+                        "_Creating professional imagery..._"
+                    )
+
+                    self.image_generator.model = "black-forest-labs/FLUX.1-schnell"
+                    media_images = self.fetch_related_media(phrases, random_style, len(phrases), orientation=AspectRatio.LANDSCAPE)
+
+                    self._write_state("media_ready", image_count=len(media_images))
+
+                    self.send_progress(
+                        "🎬 *Video Production*\n\n"
+                        "Assembling final video\n"
+                        "_Combining all elements..._"
+                    )
+
+                    video_assembler = VideoAssembler(
+                        subtitle_file=subtitle_path if os.path.exists(subtitle_path) else None,
+                        voiceover_file=audio_path,
+                        output_file=output_file,
+                        media_images=media_images,
+                        background_music=self.config.get(CONFIG_VIDEO_RESULT, {}).get('background_music', ''),
+                        aspect_ratio='16:9'
+                    )
+                    video_assembler.assemble_video(Style.FORMAL, position=Position.BOTTOM_CENTER)
 
                 self._write_state("video_ready", output_file=output_file)
 
@@ -668,6 +715,74 @@ class NewsVideoProcessor:
             self.logger.warning(f"Temp files preserved in {self.temp_dir!r} for analysis")
             return None
 
+    @staticmethod
+    def _regroup_subtitles(subtitle_path: str) -> None:
+        """Group word-level cues into readable lines (long format)."""
+        processor = SRTProcessor(subtitle_path, max_duration=4.0, max_words=8, pause_threshold=0.3)
+        processor.process()
+
+    def _render_streaming(
+        self,
+        article: str,
+        phrases: List[str],
+        style: StylePreset,
+        orientation: AspectRatio,
+        aspect_ratio: str,
+        output_file: str,
+        subtitle_path: str,
+        subtitle_style: Style,
+        position: Position,
+        subtitle_postprocess=None,
+    ) -> bool:
+        """
+        Narrate, generate images and encode video segments concurrently.
+
+        Images are generated in the background while the narration is being
+        synthesized; each narration chunk is encoded as soon as it lands.
+        Returns False without doing anything when the narration is already
+        cached, so the caller takes the regular (cheaper) path.
+        """
+        tts_cfg = self.config[CONFIG_TTS_EDGE]
+        stream = self.tts.text_to_speech_stream(
+            article,
+            language=tts_cfg.get('language', 'es'),
+            srt_path=subtitle_path,
+            rate=tts_cfg.get('speech_rate_adjustment', 0),
+            pitch=tts_cfg.get('pitch_adjustment', 0),
+            boundary_type="WordBoundary",
+        )
+        if stream is None:
+            return False
+
+        self.send_progress(
+            "🎬 *Streaming Production*\n\n"
+            f"Narrating `{len(stream.texts)}` parts while creating `{len(phrases)}` visuals\n"
+            "_Rendering segments as the voiceover arrives..._"
+        )
+        self.image_generator.model = "black-forest-labs/FLUX.1-schnell"
+        video_assembler = VideoAssembler(
+            output_file=output_file,
+            background_music=self.config.get(CONFIG_VIDEO_RESULT, {}).get('background_music', ''),
+            aspect_ratio=aspect_ratio,
+        )
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            media_future = executor.submit(
+                self.fetch_related_media, phrases, style, len(phrases), orientation=orientation
+            )
+            video_assembler.assemble_streaming(
+                stream,
+                media_future,
+                subtitle_style,
+                position=position,
+                subtitle_postprocess=subtitle_postprocess,
+                max_workers=max(1, self.parallel_workers // 3),
+            )
+        if subtitle_postprocess is not None and os.path.exists(subtitle_path):
+            subtitle_postprocess(subtitle_path)
+        self._write_state("audio_ready", subtitle_path=subtitle_path, audio_path=stream.audio_path)
+        self._write_state("media_ready", image_count=len(media_future.result()))
+        return True
+
     @trace()
     def _generate_and_enhance_thumbnail(
         self,
@@ -0,0 +1,289 @@
+"""
+Chunked Edge TTS with gapless stitching and merged word-boundary subtitles.
+
+A single edge-tts websocket stream synthesizes roughly in real time, so a long
+narration is bounded by one serial connection. ChunkedEdgeTTS splits the script
+at sentence boundaries, synthesizes the chunks concurrently (bounded by
+``max_workers``), joins the MP3 chunks with ffmpeg's concat demuxer using stream
+copy (no decode/re-encode) and shifts each chunk's WordBoundary events by the
+duration of the audio before it to build one SRT for the whole narration.
+A chunk that comes back without boundary events gets estimated ones from its
+own audio (``subtitle_alignment.boundaries_from_audio``), so the SRT still
+covers it.
+"""
+import asyncio
+import os
+import queue
+import re
+import shutil
+import tempfile
+import uuid
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterator, List, Optional, Tuple
+
+import edge_tts
+import numpy as np
+
+from scripts.MediaManagers.SRT_Processor import SubtitleTrack
+from scripts.services.subtitle_alignment import boundaries_from_audio
+from scripts.utils.audio_concat import concat_files
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_CHARS = 600
+DEFAULT_MAX_WORKERS = 4
+
+# edge-tts streams "audio-24khz-48kbitrate-mono-mp3": constant 48 kbit/s, so the
+# duration of a chunk follows from its byte count without probing the file.
+EDGE_MP3_BITRATE = 48000
+TICKS_PER_SECOND = 10_000_000  # boundary offsets/durations are in 100 ns units
+
+_SENTENCE_RE = re.compile(r'(?<=[.!?…:;])\s+')
+_CLAUSE_RE = re.compile(r'(?<=[,])\s+')
+
+
+def split_sentences(text: str, max_chars: int = DEFAULT_CHUNK_CHARS) -> List[str]:
+    """
+    Group sentences into chunks of at most `max_chars` characters.
+
+    Sentences longer than `max_chars` are split at commas, then at word
+    boundaries, so no chunk ever exceeds the limit.
+    """
+    pieces: List[str] = []
+    for sentence in _SENTENCE_RE.split(" ".join(text.split())):
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+            continue
+        for clause in _CLAUSE_RE.split(sentence):
+            while len(clause) > max_chars:
+                cut = clause.rfind(" ", 0, max_chars)
+                cut = cut if cut > 0 else max_chars
+                pieces.append(clause[:cut])
+                clause = clause[cut:].lstrip()
+            if clause:
+                pieces.append(clause)
+
+    chunks: List[str] = []
+    current = ""
+    for piece in pieces:
+        if not piece:
+            continue
+        candidate = f"{current} {piece}" if current else piece
+        if len(candidate) <= max_chars:
+            current = candidate
+        else:
+            chunks.append(current)
+            current = piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+@dataclass
+class ChunkResult:
+    index: int
+    text: str
+    audio_path: str
+    audio_bytes: int
+    boundaries: List[dict] = field(default_factory=list)
+
+    @property
+    def duration(self) -> float:
+        """Chunk duration in seconds (CBR estimate)."""
+        return self.audio_bytes * 8 / EDGE_MP3_BITRATE
+
+
+def merge_boundaries(chunks: List[ChunkResult]) -> List[dict]:
+    """Concatenate per-chunk boundary events onto one timeline."""
+    merged = []
+    offset = 0
+    for chunk in sorted(chunks, key=lambda c: c.index):
+        for event in chunk.boundaries:
+            merged.append({
+                "offset": event["offset"] + offset,
+                "duration": event["duration"],
+                "text": event["text"],
+            })
+        offset += int(round(chunk.duration * TICKS_PER_SECOND))
+    return merged
+
+
+def estimate_boundaries(audio_path: str, text: str) -> List[dict]:
+    """Word boundaries for a chunk synthesized without them, from its audio energy."""
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(audio_path).set_channels(1)
+    samples = np.array(audio.get_array_of_samples())
+    return boundaries_from_audio(text, samples, audio.frame_rate)
+
+
+def boundaries_to_srt(boundaries: List[dict]) -> str:
+    """One SRT cue per boundary event, the same layout edge_tts.SubMaker produces."""
+    return SubtitleTrack.from_boundaries(boundaries).to_srt()
+
+
+class ChunkedEdgeTTS:
+    """
+    Parallel edge-tts synthesis of long narrations.
+
+    Args:
+        output_dir: Directory for the final MP3 (chunks go to a temporary subfolder).
+        max_workers: Maximum concurrent edge-tts streams.
+        chunk_chars: Maximum characters per chunk.
+    """
+
+    def __init__(self, output_dir: str = "output_audio", max_workers: int = DEFAULT_MAX_WORKERS,
+                 chunk_chars: int = DEFAULT_CHUNK_CHARS):
+        self.output_dir = output_dir
+        self.max_workers = max(1, max_workers)
+        self.chunk_chars = chunk_chars
+        os.makedirs(self.output_dir, exist_ok=True)
+
+    async def _synthesize_chunk(self, semaphore: asyncio.Semaphore, index: int, text: str, voice: str,
+                                rate: str, pitch: str, boundary_type: str, work_dir: str) -> ChunkResult:
+        path = os.path.join(work_dir, f"chunk_{index:04d}.mp3")
+        boundaries = []
+        size = 0
+        async with semaphore:
+            communicate = edge_tts.Communicate(text, voice, rate=rate, pitch=pitch, boundary=boundary_type)
+            with open(path, "wb") as audio_file:
+                async for message in communicate.stream():
+                    if message["type"] == "audio":
+                        audio_file.write(message["data"])
+                        size += len(message["data"])
+                    elif message["type"] in ("WordBoundary", "SentenceBoundary"):
+                        boundaries.append({
+                            "offset": message["offset"],
+                            "duration": message["duration"],
+                            "text": message["text"],
+                        })
+        if size == 0:
+            raise RuntimeError(f"edge-tts returned no audio for chunk {index}")
+        if not boundaries:
+            try:
+                boundaries = await asyncio.to_thread(estimate_boundaries, path, text)
+                logger.info("No boundary events for chunk %d; estimated %d from its audio", index, len(boundaries))
+            except Exception as e:
+                logger.warning("No boundary events for chunk %d and estimating them failed: %s", index, e)
+        return ChunkResult(index, text, path, size, boundaries)
+
+    async def stream(self, chunks: List[str], voice: str, rate: int, pitch: int, boundary_type: str,
+                     work_dir: str) -> AsyncIterator[ChunkResult]:
+        """Yield chunk results in narration order, each as soon as it and its predecessors are done."""
+        semaphore = asyncio.Semaphore(self.max_workers)
+        tasks = [
+            asyncio.ensure_future(self._synthesize_chunk(semaphore, i, chunk, voice, f"{rate:+d}%", f"{pitch:+d}Hz",
+                                                         boundary_type, work_dir))
+            for i, chunk in enumerate(chunks)
+        ]
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def finish(self, results: List[ChunkResult], output_path: str, srt_path: Optional[str] = None) -> str:
+        """Join the chunk audio into `output_path` and write the merged SRT."""
+        concat_files([r.audio_path for r in results], output_path)
+        if srt_path:
+            os.makedirs(os.path.dirname(srt_path) or ".", exist_ok=True)
+            with open(srt_path, "w", encoding="utf-8") as f:
+                f.write(boundaries_to_srt(merge_boundaries(results)))
+        logger.info("Synthesized %d chunks (%.1fs of audio) with %d workers",
+                    len(results), sum(r.duration for r in results), self.max_workers)
+        return output_path
+
+    async def synthesize(
+        self,
+        text: str,
+        voice: str,
+        rate: int = 0,
+        pitch: int = 0,
+        srt_path: Optional[str] = None,
+        boundary_type: str = "WordBoundary",
+        output_path: Optional[str] = None,
+    ) -> Tuple[str, List[ChunkResult]]:
+        """
+        Synthesize `text` chunk by chunk and return (mp3 path, chunk results in order).
+
+        Writes the merged SRT to `srt_path` when given. Chunk audio files are
+        removed once joined; the results keep their text, sizes and boundaries.
+        """
+        chunks = split_sentences(text, self.chunk_chars)
+        if not chunks:
+            raise ValueError("The input text is empty.")
+        output_path = output_path or str(Path(self.output_dir) / f"{uuid.uuid4()}.mp3")
+        work_dir = tempfile.mkdtemp(prefix="tts_chunks_", dir=self.output_dir)
+        try:
+            results = [r async for r in self.stream(chunks, voice, rate, pitch, boundary_type, work_dir)]
+            return self.finish(results, output_path, srt_path), results
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+class ChunkStream:
+    """
+    Synchronous, in-order iterator over the chunks of a narration being synthesized.
+
+    Synthesis runs on the shared TTS worker loop; iterating yields each
+    ChunkResult (text, duration, word boundaries) as soon as it lands, so
+    downstream work can start before the whole narration exists. When the
+    iteration ends the joined MP3 is at ``audio_path`` and the merged SRT at
+    ``srt_path``; ``on_complete(audio_path, srt_path)`` is called at that point.
+    """
+
+    _DONE = object()
+
+    def __init__(self, engine: ChunkedEdgeTTS, worker, text: str, voice: str, rate: int = 0, pitch: int = 0,
+                 boundary_type: str = "WordBoundary", output_path: Optional[str] = None,
+                 srt_path: Optional[str] = None, on_complete: Optional[Callable[[str, Optional[str]], None]] = None):
+        self.engine = engine
+        self.worker = worker
+        self.texts = split_sentences(text, engine.chunk_chars)
+        if not self.texts:
+            raise ValueError("The input text is empty.")
+        self.voice = voice
+        self.rate = rate
+        self.pitch = pitch
+        self.boundary_type = boundary_type
+        self.audio_path = output_path or str(Path(engine.output_dir) / f"{uuid.uuid4()}.mp3")
+        self.srt_path = srt_path
+        self.on_complete = on_complete
+        self.results: List[ChunkResult] = []
+
+    @property
+    def total_chars(self) -> int:
+        return sum(len(t) for t in self.texts)
+
+    async def _produce(self, out: "queue.Queue", work_dir: str) -> None:
+        try:
+            async for result in self.engine.stream(self.texts, self.voice, self.rate, self.pitch,
+                                                   self.boundary_type, work_dir):
+                out.put(result)
+            out.put(self._DONE)
+        except BaseException as e:
+            out.put(e)
+            raise
+
+    def __iter__(self) -> Iterator[ChunkResult]:
+        out: "queue.Queue" = queue.Queue()
+        work_dir = tempfile.mkdtemp(prefix="tts_chunks_", dir=self.engine.output_dir)
+        future = self.worker.submit(self._produce(out, work_dir))
+        try:
+            while True:
+                item = out.get()
+                if item is self._DONE:
+                    break
+                if isinstance(item, BaseException):
+                    raise item
+                self.results.append(item)
+                yield item
+            self.engine.finish(self.results, self.audio_path, self.srt_path)
+            if self.on_complete is not None:
+                self.on_complete(self.audio_path, self.srt_path)
+        finally:
+            future.cancel()
+            shutil.rmtree(work_dir, ignore_errors=True)
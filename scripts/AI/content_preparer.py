@@ -0,0 +1,183 @@
+"""
+Token-budgeted article context for LLM prompts.
+
+Scraped pages range from a few paragraphs to tens of thousands of tokens. Rather
+than cutting the raw text at a fixed character count, the preparer ranks the
+article's sentences with TF-IDF (plus title overlap and lead position), keeps the
+best ones that fit the model's token budget and returns them in reading order.
+Prepared contexts are cached per URL so every generator reuses the same text.
+"""
+import math
+import re
+import threading
+import logging
+from collections import Counter
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional
+
+from scripts.AI.prompt_templates import estimate_tokens
+from scripts.DataFetcher.news_extractor import NewsExtractor
+from scripts.utils.file_cache import FileCache
+
+DEFAULT_CONTEXT_BUDGET = 1500
+# Outside .temp, which the video processor wipes at the start of every run
+DEFAULT_CONTEXT_CACHE_DIR = ".cache/context"
+
+_SENTENCE_RE = re.compile(r'(?<=[.!?…])\s+|\n+')
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_STOPWORDS = frozenset((
+    "the a an and or but of to in on at for with by from as is are was were be been it its this that these those "
+    "he she they we you i his her their our not no has have had will would can could said says "
+    "el la los las un una unos unas y o pero de del al en con por para como es son fue fueron ser ha han "
+    "se su sus lo le les que qué este esta estos estas ese esa no sí más muy ya también dijo"
+).split())
+
+
+class TokenCounter:
+    """Counts tokens with tiktoken when installed, otherwise with a regex estimate."""
+
+    def __init__(self, encoding: str = "cl100k_base"):
+        self._encoder = None
+        try:
+            import tiktoken
+            self._encoder = tiktoken.get_encoding(encoding)
+        except Exception:
+            pass
+
+    def count(self, text: str) -> int:
+        if self._encoder is not None:
+            return len(self._encoder.encode(text, disallowed_special=()))
+        return estimate_tokens(text)
+
+    def truncate(self, text: str, budget: int) -> str:
+        """Leading part of `text` that fits in `budget` tokens."""
+        if self._encoder is not None:
+            return self._encoder.decode(self._encoder.encode(text, disallowed_special=())[:budget]).strip()
+        words = text.split()[:budget]  # every word is at least one token
+        while words and estimate_tokens(" ".join(words)) > budget:
+            words.pop()
+        return " ".join(words)
+
+
+@dataclass
+class PreparedContext:
+    url: str
+    title: str
+    text: str
+    tokens: int
+    source_tokens: int
+    budget: int
+
+
+class ContentPreparer:
+    """
+    Extracts, ranks and trims article text to a token budget.
+
+    Args:
+        budget: Maximum tokens of article text handed to a prompt.
+        cache_dir: On-disk cache for prepared contexts (None disables it).
+        cache_ttl: Seconds a prepared context stays valid on disk.
+    """
+
+    def __init__(
+        self,
+        budget: int = DEFAULT_CONTEXT_BUDGET,
+        cache_dir: Optional[str] = DEFAULT_CONTEXT_CACHE_DIR,
+        cache_ttl: int = 86400,
+        extractor: Optional[NewsExtractor] = None,
+    ):
+        self.budget = budget
+        self.logger = logging.getLogger(__name__)
+        self.tokens = TokenCounter()
+        self.extractor = extractor or NewsExtractor()
+        self._disk = FileCache(cache_dir=cache_dir, ttl=cache_ttl) if cache_dir else None
+        self._memory: Dict[str, PreparedContext] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_url(value) -> bool:
+        return isinstance(value, str) and value.strip().lower().startswith(("http://", "https://"))
+
+    def _cache_key(self, url: str, budget: int) -> str:
+        return f"{url.strip()}|{budget}"
+
+    def prepare_url(self, url: str, budget: Optional[int] = None) -> Optional[PreparedContext]:
+        """Return the budgeted context for an article URL, extracting it at most once."""
+        budget = budget or self.budget
+        key = self._cache_key(url, budget)
+        with self._lock:
+            cached = self._memory.get(key)
+        if cached is not None:
+            return cached
+        if self._disk is not None:
+            entry = self._disk.get(key)
+            if entry:
+                context = PreparedContext(**entry)
+                with self._lock:
+                    self._memory[key] = context
+                return context
+
+        article = self.extractor.extract_article(url)
+        if article is None or not article.text:
+            return None
+        context = self.prepare_text(article.text, title=article.title or "", url=url, budget=budget)
+        with self._lock:
+            self._memory[key] = context
+        if self._disk is not None:
+            self._disk.set(key, asdict(context))
+        return context
+
+    def prepare_text(self, text: str, title: str = "", url: str = "", budget: Optional[int] = None) -> PreparedContext:
+        """Keep the highest-ranked sentences of `text` that fit in `budget` tokens."""
+        budget = budget or self.budget
+        source_tokens = self.tokens.count(text)
+        if source_tokens <= budget:
+            return PreparedContext(url, title, text.strip(), source_tokens, source_tokens, budget)
+
+        sentences = [s.strip() for s in _SENTENCE_RE.split(text) if len(s.strip()) > 1]
+        costs = [self.tokens.count(s) for s in sentences]
+        scores = self._score_sentences(sentences, title)
+
+        chosen: List[int] = []
+        used = 0
+        for idx in sorted(range(len(sentences)), key=lambda i: scores[i], reverse=True):
+            if used + costs[idx] > budget:
+                continue
+            chosen.append(idx)
+            used += costs[idx]
+            if budget - used < 8:
+                break
+        chosen.sort()
+        selected = " ".join(sentences[i] for i in chosen)
+        if not chosen and sentences:
+            # Every sentence is over budget (e.g. text without punctuation): keep the lead, cut
+            selected = self.tokens.truncate(sentences[0], budget)
+            used = self.tokens.count(selected)
+        self.logger.debug("Prepared context for %s: %d -> %d tokens (%d/%d sentences)",
+                          url or title[:40], source_tokens, used, len(chosen), len(sentences))
+        return PreparedContext(url, title, selected, used, source_tokens, budget)
+
+    @staticmethod
+    def _terms(sentence: str) -> List[str]:
+        return [w for w in _WORD_RE.findall(sentence.lower()) if w not in _STOPWORDS and len(w) > 2]
+
+    def _score_sentences(self, sentences: List[str], title: str) -> List[float]:
+        terms = [self._terms(s) for s in sentences]
+        doc_freq = Counter(t for words in terms for t in set(words))
+        n = len(sentences)
+        idf = {t: math.log((1 + n) / (1 + df)) + 1.0 for t, df in doc_freq.items()}
+        title_terms = set(self._terms(title))
+
+        scores = []
+        for position, words in enumerate(terms):
+            if not words:
+                scores.append(0.0)
+                continue
+            tf = Counter(words)
+            score = sum(count * idf[t] for t, count in tf.items()) / math.sqrt(len(words))
+            if title_terms:
+                score *= 1.0 + len(title_terms.intersection(tf)) / len(title_terms)
+            if position < 3:
+                score *= 1.25  # news leads carry the who/what/when
+            scores.append(score)
+        return scores
@@ -0,0 +1,236 @@
+"""
+ElevenLabs account pool with cached quota state.
+
+Checking every account's subscription (``client.user.get()``) serially before the
+first synthesis costs one API round trip per account on every construction. The
+pool instead:
+
+* probes accounts concurrently, only when their cached state is older than the TTL;
+* persists remaining-character counts to disk, so a fresh process starts warm;
+* reserves the characters of a synthesis when it picks the account (under the same
+  lock), so concurrent callers can't both spend the last of one account's quota;
+* picks accounts at random weighted by remaining quota;
+* refreshes stale entries on a background thread, off the synthesis path.
+"""
+import hashlib
+import json
+import random
+import threading
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from elevenlabs.client import ElevenLabs
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STATE_PATH = ".cache/elevenlabs/quota.json"
+DEFAULT_QUOTA_TTL = 600
+DEFAULT_PROBE_WORKERS = 4
+
+
+@dataclass
+class AccountState:
+    name: str
+    api_key: str
+    voices: List[dict] = field(default_factory=list)
+    remaining: Optional[int] = None
+    checked_at: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def fingerprint(self) -> str:
+        return hashlib.sha256(self.api_key.encode("utf-8")).hexdigest()[:16]
+
+
+class ElevenLabsAccountPool:
+    """
+    Quota-aware account selection over an ``elevenlabsaccounts`` credentials file.
+
+    Args:
+        credentials_path: JSON file mapping account names to ApiKey/Voices.
+        quota_min: Minimum remaining characters for an account to be eligible.
+        state_path: Where quota state is persisted (None keeps it in memory only).
+        ttl: Seconds before an account's quota is probed again.
+        max_workers: Concurrent quota probes.
+    """
+
+    def __init__(
+        self,
+        credentials_path: str,
+        quota_min: int = 0,
+        state_path: Optional[str] = DEFAULT_STATE_PATH,
+        ttl: int = DEFAULT_QUOTA_TTL,
+        max_workers: int = DEFAULT_PROBE_WORKERS,
+        client_factory: Callable[[str], ElevenLabs] = lambda key: ElevenLabs(api_key=key),
+    ):
+        self.settings = dict(quota_min=quota_min, state_path=state_path, ttl=ttl,
+                             max_workers=max_workers, client_factory=client_factory)
+        self.quota_min = quota_min
+        self.state_path = Path(state_path) if state_path else None
+        self.ttl = ttl
+        self.max_workers = max_workers
+        self._client_factory = client_factory
+        self._clients: Dict[str, ElevenLabs] = {}
+        self._lock = threading.RLock()
+        self._refreshing: Optional[threading.Thread] = None
+
+        with open(credentials_path, 'r', encoding='utf-8') as f:
+            accounts = json.load(f)
+        self.accounts: Dict[str, AccountState] = {
+            name: AccountState(name=name, api_key=data['ApiKey'], voices=data.get('Voices', []))
+            for name, data in accounts.items()
+        }
+        self._load_state()
+
+    # -- persistence -------------------------------------------------------
+
+    def _load_state(self) -> None:
+        if self.state_path is None or not self.state_path.exists():
+            return
+        try:
+            saved = json.loads(self.state_path.read_text(encoding='utf-8'))
+        except (json.JSONDecodeError, OSError):
+            return
+        for account in self.accounts.values():
+            entry = saved.get(account.fingerprint)
+            if entry:
+                account.remaining = entry.get('remaining')
+                account.checked_at = entry.get('checked_at', 0.0)
+
+    def _save_state(self) -> None:
+        if self.state_path is None:
+            return
+        with self._lock:
+            data = {a.fingerprint: {'remaining': a.remaining, 'checked_at': a.checked_at}
+                    for a in self.accounts.values()}
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_path.with_suffix('.tmp')
+            tmp.write_text(json.dumps(data), encoding='utf-8')
+            tmp.replace(self.state_path)
+        except OSError as e:
+            logger.warning(f"Could not persist ElevenLabs quota state: {e}")
+
+    # -- probing -----------------------------------------------------------
+
+    def client(self, account: AccountState) -> ElevenLabs:
+        with self._lock:
+            client = self._clients.get(account.api_key)
+            if client is None:
+                client = self._clients[account.api_key] = self._client_factory(account.api_key)
+            return client
+
+    def _probe(self, account: AccountState) -> None:
+        try:
+            subscription = self.client(account).user.get().subscription
+            remaining = subscription.character_limit - subscription.character_count
+            with self._lock:
+                account.remaining, account.error = remaining, None
+        except Exception as e:
+            with self._lock:
+                account.remaining, account.error = None, str(e)
+            logger.warning(f"Error checking ElevenLabs account {account.name}: {e}")
+        finally:
+            with self._lock:
+                account.checked_at = time.time()
+
+    def refresh(self, names: Optional[List[str]] = None) -> None:
+        """Probe the given accounts (default: all) concurrently and persist the result."""
+        targets = [self.accounts[n] for n in names] if names else list(self.accounts.values())
+        if not targets:
+            return
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(targets))) as executor:
+            list(executor.map(self._probe, targets))
+        self._save_state()
+
+    def _stale(self) -> List[str]:
+        now = time.time()
+        return [a.name for a in self.accounts.values() if now - a.checked_at > self.ttl]
+
+    def refresh_in_background(self) -> None:
+        """Re-probe stale accounts on a daemon thread (at most one refresh at a time)."""
+        stale = self._stale()
+        if not stale:
+            return
+        with self._lock:
+            if self._refreshing is not None and self._refreshing.is_alive():
+                return
+            self._refreshing = threading.Thread(
+                target=self.refresh, args=(stale,), name="elevenlabs-quota-refresh", daemon=True
+            )
+            self._refreshing.start()
+
+    # -- selection ---------------------------------------------------------
+
+    def acquire(self, chars: int = 0, quota_min: Optional[int] = None) -> Optional[AccountState]:
+        """
+        Pick an account with enough quota for `chars` characters, weighted by remaining quota,
+        and reserve those characters on it.
+
+        The pick and the reservation happen under one lock, so concurrent callers see each
+        other's pending syntheses. Call `release` if the synthesis fails for a reason other
+        than quota. `quota_min` overrides the pool's minimum for this call.
+
+        Probes synchronously only when no account has ever been checked; otherwise
+        works from cached counts and refreshes stale ones in the background.
+        """
+        if all(a.checked_at == 0.0 for a in self.accounts.values()):
+            self.refresh()
+        else:
+            self.refresh_in_background()
+        needed = max(self.quota_min if quota_min is None else quota_min, chars)
+        with self._lock:
+            eligible = [a for a in self.accounts.values() if a.remaining is not None and a.remaining >= needed]
+            if not eligible:
+                return None
+            account = random.choices(eligible, weights=[a.remaining for a in eligible])[0]
+            account.remaining -= chars
+        if chars:
+            self._save_state()
+        return account
+
+    def release(self, account: AccountState, chars: int) -> None:
+        """Give back characters reserved by `acquire` for a synthesis that did not happen."""
+        with self._lock:
+            if account.remaining is not None:
+                account.remaining += chars
+        self._save_state()
+
+    def mark_exhausted(self, account: AccountState) -> None:
+        with self._lock:
+            account.remaining = 0
+            account.checked_at = time.time()
+        self._save_state()
+
+    def summary(self) -> Dict[str, dict]:
+        with self._lock:
+            return {a.name: {k: v for k, v in asdict(a).items() if k not in ('api_key', 'voices')}
+                    for a in self.accounts.values()}
+
+
+_pools: Dict[str, ElevenLabsAccountPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_account_pool(credentials_path: str, **kwargs) -> ElevenLabsAccountPool:
+    """
+    Process-wide pool per credentials file, so every TTSElevenlabs shares one quota view.
+
+    Options only apply when the pool is created; asking for an existing pool with
+    different options raises ValueError instead of silently ignoring them.
+    """
+    key = str(Path(credentials_path).resolve())
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            return _pools.setdefault(key, ElevenLabsAccountPool(credentials_path, **kwargs))
+    conflicts = [k for k, v in kwargs.items() if pool.settings.get(k) != v]
+    if conflicts:
+        current = {k: pool.settings.get(k) for k in conflicts}
+        requested = {k: kwargs[k] for k in conflicts}
+        raise ValueError(f"ElevenLabs pool for {credentials_path} already exists with {current}, not {requested}")
+    return pool
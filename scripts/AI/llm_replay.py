@@ -0,0 +1,182 @@
+"""
+Recorded-fixture LLM backend for offline runs and benchmarks.
+
+A fixture file maps prompt task names (the PromptCompiler template names, e.g.
+``title`` or ``full_article``) to lists of captured raw responses::
+
+    {"title": ["{\\"title\\": \\"...\\"}"], "full_article": ["..."], "default": ["{}"]}
+
+Use it as a provider entry in the ``llm.providers`` config::
+
+    {"type": "replay", "fixtures": "Resources/Fixtures/llm_responses.json",
+     "latency": {"distribution": "lognormal", "mean_ms": 900, "sigma": 0.4, "seed": 7}}
+
+Responses are served round-robin per task, so a run is fully deterministic for a
+given fixture file and seed. Fixtures are captured from live providers by adding
+``"record_fixtures": "<path>"`` to any real provider entry; captures are
+buffered and merged into the file when the process exits.
+"""
+import atexit
+import json
+import math
+import random
+import threading
+import time
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from scripts.AI.prompt_templates import estimate_tokens
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FIXTURES = Path(__file__).resolve().parent.parent.parent / "Resources" / "Fixtures" / "llm_responses.json"
+
+
+class LatencyModel:
+    """
+    Seeded latency sampler.
+
+    Args:
+        distribution: "none", "fixed", "uniform", "normal" or "lognormal".
+        mean_ms: Mean (fixed/normal/lognormal) latency in milliseconds.
+        min_ms / max_ms: Bounds for "uniform"; "normal" is clamped at min_ms.
+        stddev_ms: Standard deviation for "normal".
+        sigma: Shape parameter for "lognormal".
+        per_token_ms: Extra generation time per response token.
+        seed: RNG seed; identical seeds replay identical latencies.
+    """
+
+    def __init__(
+        self,
+        distribution: str = "none",
+        mean_ms: float = 0.0,
+        min_ms: float = 0.0,
+        max_ms: float = 0.0,
+        stddev_ms: float = 0.0,
+        sigma: float = 0.5,
+        per_token_ms: float = 0.0,
+        seed: Optional[int] = 0,
+    ):
+        self.distribution = distribution
+        self.mean_ms = mean_ms
+        self.min_ms = min_ms
+        self.max_ms = max_ms
+        self.stddev_ms = stddev_ms
+        self.sigma = sigma
+        self.per_token_ms = per_token_ms
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]]) -> "LatencyModel":
+        return cls(**(config or {}))
+
+    def sample(self, response_tokens: int = 0) -> float:
+        """Latency in seconds for one response."""
+        with self._lock:
+            if self.distribution == "fixed":
+                ms = self.mean_ms
+            elif self.distribution == "uniform":
+                ms = self._rng.uniform(self.min_ms, self.max_ms)
+            elif self.distribution == "normal":
+                ms = max(self.min_ms, self._rng.gauss(self.mean_ms, self.stddev_ms))
+            elif self.distribution == "lognormal":
+                # Parametrised so the distribution mean equals mean_ms
+                mu = math.log(max(self.mean_ms, 1e-3)) - self.sigma ** 2 / 2
+                ms = self._rng.lognormvariate(mu, self.sigma)
+            else:
+                ms = 0.0
+        return (ms + self.per_token_ms * response_tokens) / 1000.0
+
+
+class ReplayClient:
+    """Serves captured responses per task with simulated latency."""
+
+    def __init__(self, fixtures: Any = None, latency: Optional[Dict[str, Any]] = None):
+        self.fixtures = self._load(fixtures)
+        self.latency = LatencyModel.from_config(latency)
+        self._cursor: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.output_tokens = 0
+
+    @staticmethod
+    def _load(fixtures: Any) -> Dict[str, List[str]]:
+        if isinstance(fixtures, dict):
+            data = fixtures
+        else:
+            with open(fixtures or DEFAULT_FIXTURES, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        return {task: [r if isinstance(r, str) else json.dumps(r, ensure_ascii=False) for r in responses]
+                for task, responses in data.items() if responses}
+
+    def complete(self, task: Optional[str] = None) -> str:
+        task = task if task in self.fixtures else "default"
+        if task not in self.fixtures:
+            raise KeyError(f"No replay fixture for task '{task}' and no 'default' entry")
+        with self._lock:
+            responses = self.fixtures[task]
+            position = self._cursor.get(task, 0)
+            self._cursor[task] = position + 1
+            response = responses[position % len(responses)]
+        tokens = estimate_tokens(response)
+        delay = self.latency.sample(tokens)
+        if delay > 0:
+            time.sleep(delay)
+        with self._lock:
+            self.calls += 1
+            self.output_tokens += tokens
+        return response
+
+
+class FixtureRecorder:
+    """
+    Collects live responses for a fixture file, grouped by task.
+
+    Responses are buffered in memory and merged into the file in one write by
+    `flush()`, which runs at interpreter exit. Use `for_path` to share one
+    recorder (and one buffer) per file.
+    """
+
+    _recorders: Dict[str, "FixtureRecorder"] = {}
+    _recorders_guard = threading.Lock()
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._pending: Dict[str, List[str]] = {}
+
+    @classmethod
+    def for_path(cls, path: str) -> "FixtureRecorder":
+        key = str(Path(path).resolve())
+        with cls._recorders_guard:
+            recorder = cls._recorders.get(key)
+            if recorder is None:
+                recorder = cls._recorders[key] = cls(path)
+                atexit.register(recorder.flush)
+            return recorder
+
+    def record(self, task: Optional[str], response: str) -> None:
+        with self._lock:
+            self._pending.setdefault(task or "default", []).append(response)
+
+    def flush(self) -> None:
+        """Merge the buffered responses into the fixture file."""
+        with self._lock:
+            if not self._pending:
+                return
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8")) if self.path.exists() else {}
+            except (json.JSONDecodeError, OSError):
+                data = {}
+            for task, responses in self._pending.items():
+                data.setdefault(task, []).extend(responses)
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_suffix(".tmp")
+                tmp.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+                tmp.replace(self.path)
+                self._pending.clear()
+            except OSError as e:
+                logger.warning("Could not record LLM fixture to %s: %s", self.path, e)
@@ -1,19 +1,34 @@
-import re
 import os
 import uuid
 import json
+import queue
 import random
 import time
 import logging
+import threading
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Optional
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional
 from colorama import Fore, Style, init
 
-from scripts.DataFetcher.news_extractor import NewsExtractor, ArticleData
+from scripts.AI.content_preparer import ContentPreparer, PreparedContext, DEFAULT_CONTEXT_BUDGET
+from scripts.AI.prompt_templates import CompiledPrompt, PromptCompiler
+from scripts.AI.response_parser import ResponseParseError, extract_json_text, parse_json_object, parse_json_response
 from scripts.utils.app_logger import trace
 
 init(autoreset=True)
 
+DEFAULT_PROVIDER_CONCURRENCY = 6
+
+
+@dataclass
+class BatchResult:
+    """One finished topic of Chatbot.generate_batch; `bundle` is the generate_article_and_phrases_* tuple."""
+    index: int
+    topic: Any
+    bundle: Optional[tuple] = None
+    error: Optional[Exception] = None
+
 
 class LLMProvider:
     """Handles multi-provider LLM requests with fallback (Ollama -> Groq -> Azure placeholder)"""
@@ -24,6 +39,11 @@ class LLMProvider:
         if providers:
             for p in providers:
                 self._add_provider(p)
+        # Per-provider cap on in-flight requests ("max_concurrency"), shared by every caller thread
+        self._limits = [
+            threading.BoundedSemaphore(max(1, int(cfg.get("max_concurrency", DEFAULT_PROVIDER_CONCURRENCY))))
+            for _, _, _, cfg in self._clients
+        ]
 
     def _add_provider(self, config: dict):
         ptype = config.get("type", "").lower()
@@ -57,6 +77,12 @@ class LLMProvider:
                 self._clients.append(("azure", model, client, config))
                 self.logger.info("Azure provider ready (%s @ %s)", model, endpoint)
 
+            elif ptype == "replay":
+                from scripts.AI.llm_replay import ReplayClient
+                client = ReplayClient(fixtures=config.get("fixtures"), latency=config.get("latency"))
+                self._clients.append(("replay", model or "replay", client, config))
+                self.logger.info("Replay provider ready (%s)", config.get("fixtures") or "default fixtures")
+
             else:
                 self.logger.warning("Unknown provider type: %s", ptype)
 
@@ -67,43 +93,40 @@ class LLMProvider:
     def available(self) -> bool:
         return len(self._clients) > 0
 
-    def complete(self, prompt: str, **kwargs) -> str:
-        """Try each provider in order until one succeeds."""
+    def client(self, provider_type: str):
+        """Client object of the first configured provider of `provider_type`, or None."""
+        for ptype, _, client, _ in self._clients:
+            if ptype == provider_type:
+                return client
+        return None
+
+    def context_budget(self, default: int) -> int:
+        """Smallest `context_budget` among configured providers, since any of them may serve a call."""
+        budgets = [cfg["context_budget"] for _, _, _, cfg in self._clients if cfg.get("context_budget")]
+        return min(budgets) if budgets else default
+
+    @staticmethod
+    def _messages(prompt: str, system: Optional[str] = None) -> list:
+        # The system message goes first so its tokens form a reusable cache prefix
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": prompt})
+        return messages
+
+    def complete(self, prompt: str, system: Optional[str] = None, **kwargs) -> str:
+        """
+        Try each provider in order until one succeeds.
+        `task` (kwarg) names the prompt template; used by replay/recording only.
+        """
         last_error = None
-        for provider_type, model, client, cfg in self._clients:
+        messages = self._messages(prompt, system)
+        for (provider_type, model, client, cfg), limit in zip(self._clients, self._limits):
             try:
-                timeout = cfg.get("timeout", 60)
-                if provider_type == "ollama":
-                    resp = client.chat(
-                        model=model,
-                        messages=[{"role": "user", "content": prompt}],
-                        options={"num_predict": kwargs.get("max_tokens", 8192)},
-                        format="json",
-                        timeout=timeout,
-                    )
-                    return resp["message"]["content"]
-
-                elif provider_type == "groq":
-                    resp = client.chat.completions.create(
-                        model=model,
-                        messages=[{"role": "user", "content": prompt}],
-                        temperature=kwargs.get("temperature", 0.7),
-                        max_tokens=kwargs.get("max_tokens", 8192),
-                        response_format={"type": "json_object"},
-                        timeout=timeout,
-                    )
-                    return resp.choices[0].message.content
-
-                elif provider_type == "azure":
-                    resp = client.chat.completions.create(
-                        model=model,
-                        messages=[{"role": "user", "content": prompt}],
-                        temperature=kwargs.get("temperature", 0.7),
-                        max_tokens=kwargs.get("max_tokens", 8192),
-                        timeout=timeout,
-                    )
-                    return resp.choices[0].message.content
-
+                with limit:
+                    response = self._complete_one(provider_type, model, client, cfg, messages, **kwargs)
+                if cfg.get("record_fixtures"):
+                    from scripts.AI.llm_replay import FixtureRecorder
+                    FixtureRecorder.for_path(cfg["record_fixtures"]).record(kwargs.get("task"), response)
+                return response
             except Exception as e:
                 last_error = e
                 self.logger.warning("%s failed (model=%s): %s", provider_type, model, e)
@@ -111,10 +134,50 @@ class LLMProvider:
 
         raise RuntimeError(f"All LLM providers failed: {last_error}")
 
+    @staticmethod
+    def _complete_one(provider_type: str, model: str, client, cfg: dict, messages: list, **kwargs) -> str:
+        """Send one chat request to a single provider."""
+        timeout = cfg.get("timeout", 60)
+        if provider_type == "ollama":
+            resp = client.chat(
+                model=model,
+                messages=messages,
+                options={"num_predict": kwargs.get("max_tokens", 8192)},
+                format="json",
+                timeout=timeout,
+            )
+            return resp["message"]["content"]
+
+        elif provider_type == "groq":
+            resp = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=kwargs.get("temperature", 0.7),
+                max_tokens=kwargs.get("max_tokens", 8192),
+                response_format={"type": "json_object"},
+                timeout=timeout,
+            )
+            return resp.choices[0].message.content
+
+        elif provider_type == "azure":
+            resp = client.chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=kwargs.get("temperature", 0.7),
+                max_tokens=kwargs.get("max_tokens", 8192),
+                timeout=timeout,
+            )
+            return resp.choices[0].message.content
+
+        elif provider_type == "replay":
+            return client.complete(task=kwargs.get("task"))
+
+        raise ValueError(f"Unknown provider type: {provider_type}")
+
 
 class Chatbot:
     @trace()
-    def __init__(self, language, model, providers=None):
+    def __init__(self, language, model, providers=None, measure_prompt_cache=False, llm=None):
         """
         Initializes the Chatbot with language, model, and optional multi-provider config.
 
@@ -122,11 +185,13 @@ class Chatbot:
             language (str): The language in which to generate the articles.
             model (str): Legacy model name (kept for backward compat).
             providers (list): List of provider dicts. If None, defaults to Ollama.
+            measure_prompt_cache (bool): Track cached-prefix token ratios (see prompt_cache_report).
+            llm (LLMProvider): Ready provider to use instead of building one from `providers`.
         """
         self.language = language
         self.model = model
         self.logger = logging.getLogger(__name__)
-        self.llm = LLMProvider(providers or [
+        self.llm = llm or LLMProvider(providers or [
             {"type": "ollama", "model": "nemotron-3-super:cloud"},
         ])
         self.standard_rules = ('Your output must be a valid JSON object with double quotes for both keys and string values. Ensure proper nesting, avoid trailing commas, and escape special characters when necessary.'
@@ -177,10 +242,51 @@ class Chatbot:
             "'Suscríbete para más contenido como este.' "
             "'Compártelo si crees que más gente debería saber esto.' "
         )
+        self.prompts = self._build_prompts(measure_prompt_cache)
+        self.preparer = ContentPreparer(budget=self.llm.context_budget(DEFAULT_CONTEXT_BUDGET))
 
-    @trace()
-    def generate_title(self, topic):
-        title_prompt = (
+    def prepare_context(self, topic) -> Optional[PreparedContext]:
+        """
+        Token-budgeted article text for a topic given as an article URL (or a dict with 'url').
+        Prepared contexts are cached per URL, so repeated calls do not re-download the page.
+        """
+        url = topic.get('url', '') if isinstance(topic, dict) else topic
+        if not ContentPreparer.is_url(url):
+            return None
+        try:
+            return self.preparer.prepare_url(url)
+        except Exception as e:
+            self.logger.warning("Could not prepare article context for %s: %s", url, e)
+            return None
+
+    def _build_prompts(self, measure: bool) -> PromptCompiler:
+        """
+        Render the shared system message and every task template once.
+
+        The rule blocks live in the system message so they form an identical
+        prefix for every call; tasks cite the blocks they need by name and keep
+        per-call values (topic, text, counts) in their trailing parameters.
+        """
+        compiler = PromptCompiler(
+            preamble=(
+                "You are the writing engine of a news video channel. Each request contains a task "
+                "and its parameters. The OUTPUT RULES apply to every task; the other reference "
+                "blocks below apply only when the task cites them by name."
+            ),
+            sections=[
+                ("OUTPUT RULES", self.standard_rules),
+                ("IDEOLOGY", self.ideology),
+                ("TONE", self.tone),
+                ("HOOK RULES", self.hook_rules),
+                ("NUMBER RULES", self.numbers_as_words),
+                ("SPAIN SPANISH RULES", self.spanish_spain_rules),
+                ("CTA RULES", self.cta_rules),
+            ],
+            measure=measure,
+        )
+        language = self.language
+
+        compiler.register('title', (
             'Generate a response that must be a fully structured JSON object with the following format:\n'
             '{'
             '  "title": ""  // Create a highly engaging and SEO-optimized YouTube news title '
@@ -189,51 +295,29 @@ class Chatbot:
             'and include relevant emojis to increase engagement.'
             ' It should clearly indicate that the content is news-related, '
             'either by specifying the topic (e.g., Economy, Politics, Tech) or using words like "Breaking," "Latest," or "Report".'
-            '}'
-            f'{self.standard_rules}'
-            f'Parameters:\n'
-            f'- **Language of the title must be: [{self.language}]**\n'
-            f'- Headline: [{topic}]\n'
-        )
+            '}\n'
+            f'- **Language of the title must be: [{language}]**\n'
+        ), [('Headline', 'topic')])
 
-        print(Fore.BLUE + 'Generating Title...')
-        title_json = self._generate_json_element(title_prompt)
-        return title_json.get('title', '')
-    
-    @trace()
-    def generate_description(self, topic):
-        description_prompt = (
+        compiler.register('description', (
             'You are a creative and engaging news writer. Based on the headline and language I provide, '
             'generate a response that must be a fully structured JSON object with the following format:\n'
             '{\n'
-            '  "description": ""  // Write a brief, SEO-optimized video description in ' + self.language + ' that highlights key points while keeping the most intriguing details hidden.'
+            '  "description": ""  // Write a brief, SEO-optimized video description in ' + language + ' that highlights key points while keeping the most intriguing details hidden.'
                                      ' Maximum 1000 characters. Use relevant keywords to enhance search visibility and create curiosity, enticing viewers to watch the video for the full story.'
             '}\n'
-            f'{self.standard_rules}'
-            f'Parameters:\n'
-            f'- **Languageof the article must be: [{self.language}]**\n'
-            f'- Headline: [{topic}]\n'
-        )
-        print(Fore.BLUE + f'description')
-        description_json = self._generate_json_element(description_prompt)
-        return description_json.get('description', '')
+            f'- **Language of the article must be: [{language}]**\n'
+        ), [('Headline', 'topic')])
 
-    @trace()
-    def generate_short_article(self, topic, source="", length=50, accept_labels =False):
-        """
-        Generates a short article based on the given topic.
-        """
-        print(Fore.BLUE + 'Generating YouTube narration')
-        source_line = f'The news comes from {source}.' if source else ''
-        narration_prompt = (
+        compiler.register('short_article', (
             "Generate a fully structured JSON object with the following format:\n"
             "{\n"
-            '  "article": ""  // Write a fast-paced, news-bulletin style YouTube Shorts narration in ' + self.language + ' about the topic.\n'
+            '  "article": ""  // Write a fast-paced, news-bulletin style YouTube Shorts narration in ' + language + ' about the topic.\n'
             "}\n\n"
             "STRUCTURE (strict order):\n"
             "1. HOOK (first 5-8 seconds — ~40-50 words): Open with a direct spoken hook addressed to the viewer.\n"
             '   Examples: "¿Te has enterado de lo que ha pasado con...?" / "Pues resulta que..." / "Acabo de leer en [actual news source] que..."\n'
-            f"   {source_line}\n"
+            "   If a Source parameter is given, that is where the news comes from.\n"
             "   Mention specifically where you read/heard this to make it organic.\n"
             "2. EXPLAIN (main body — ~70-100 words): Actually explain WHAT the news is about.\n"
             "   Give key facts: what happened, who is involved, why it matters, contexto relevante.\n"
@@ -245,33 +329,22 @@ class Chatbot:
             "   Incluye: resumen provocador + llamado a la acción final.\n"
             "   Ejemplos: 'Esto apenas comienza, así que ya sabes: like, suscríbete y comparte.' "
             "/ 'Y tú, ¿qué opinas? Te leo en los comentarios.'\n\n"
-            f"5. {self.hook_rules}\n"
-            f"6. {self.numbers_as_words}\n"
-            f"7. {self.spanish_spain_rules}\n"
-            f"8. {self.cta_rules}\n"
+            "5. Follow the HOOK RULES.\n"
+            "6. Follow the NUMBER RULES.\n"
+            "7. Follow the SPAIN SPANISH RULES.\n"
+            "8. Follow the CTA RULES.\n"
             "9. The TOTAL article must be between 180 and 250 words — desarrolla bien la noticia pero sin relleno.\n"
             "10. Write conversationally, as if telling a friend something shocking you just read.\n"
             "11. La narrativa debe tener ritmo: sube y baja la intensidad para mantener la atención.\n"
-            f"Parameters:\n"
-            f"- Language: [{self.language}]\n"
-            f"- Topic: [{topic}]\n"
-            f"- Tone: fast news bulletin, urgent but not alarmist.\n"
-            f"{self.standard_rules}\n"
-        )
-        narration_json = self._generate_json_element(narration_prompt)
-        return narration_json.get('article', '')
+            "12. If an Article excerpt parameter is given, base the facts on it.\n"
+            f"- Language: [{language}]\n"
+            "- Tone: fast news bulletin, urgent but not alarmist.\n"
+        ), [('Source', 'source'), ('Topic', 'topic'), ('Article excerpt', 'context')])
 
-    @trace()
-    def generate_full_article(self, topic, length=150):
-        """
-        Generates a full-length article and a short summary based on the given topic.
-        Returns a tuple of (full_article, short_summary).
-        """
-        print(Fore.BLUE + 'Generating full-length YouTube narration')
-        full_prompt = (
+        compiler.register('full_article', (
             "Generate a fully structured JSON object with the following format:\n"
             "{\n"
-            '  "full_article": "",  // Write a detailed, in-depth news narration in ' + self.language + ' about the topic. Cover key details, background context, and implications.'
+            '  "full_article": "",  // Write a detailed, in-depth news narration in ' + language + ' about the topic. Cover key details, background context, and implications.'
             '  "short_summary": ""  // Write a brief 3-4 sentence summary of the key points.'
             "}\n\n"
             "Instructions:\n"
@@ -290,22 +363,16 @@ class Chatbot:
             "5. Escribe con ritmo narrativo: alterna frases cortas impactantes con explicaciones más detalladas.\n"
             "6. Incluye preguntas retóricas al espectador para mantener su atención.\n"
             "7. La short_summary debe capturar la esencia en 3-4 frases impactantes.\n"
-            f"8. {self.hook_rules}\n"
-            f"9. {self.numbers_as_words}\n"
-            f"10. {self.spanish_spain_rules}\n"
-            f"11. {self.cta_rules}\n"
-            f"Parameters:\n"
-            f"- Language: [{self.language}]\n"
-            f"- Topic: [{topic}]\n"
-            f"- Tone: periodístico, provocador, con ritmo narrativo.\n"
-            f"{self.standard_rules}\n"
-        )
-        print(Fore.BLUE + 'Full article')
-        article_json = self._generate_json_element(full_prompt)
-        return article_json.get('full_article', ''), article_json.get('short_summary', '')
-    
-    def generate_conclusion_from_text(self, article_text):
-        conclusion_prompt = (
+            "8. Follow the HOOK RULES.\n"
+            "9. Follow the NUMBER RULES.\n"
+            "10. Follow the SPAIN SPANISH RULES.\n"
+            "11. Follow the CTA RULES.\n"
+            "12. If an Article excerpt parameter is given, base the facts on it.\n"
+            f"- Language: [{language}]\n"
+            "- Tone: periodístico, provocador, con ritmo narrativo.\n"
+        ), [('Topic', 'topic'), ('Article excerpt', 'context')])
+
+        compiler.register('conclusion', (
             "Generate a fully structured JSON object with the following format:\n"
             "{\n"
             '  "article": "" // Write a 50-100 word conclusion that offers a personal opinion on the issue from a liberal-progressive perspective.\n'
@@ -318,39 +385,20 @@ class Chatbot:
             "Formatting Requirements:\n"
             "- Use a serious tone with a slightly conspiratorial undertone (e.g., 'It is striking that...').\n"
             "- All numbers must be written in words (e.g., 'two hundred million' instead of '200M').\n"
-            "- Maintain the ideological framing by critiquing elites and emphasizing the impact on marginalized groups.\n\n"
-            f"{self.standard_rules}\n"
-            f"- Ideological Framing: {self.ideology}\n"
-            f"- Tone: {self.tone}\n\n"
-            f"Parameters:\n"
-            f"- Language of article must be : [{self.language}]\n"
-            f"- Article Text: [{article_text}]\n"
+            "- Maintain the ideological framing by critiquing elites and emphasizing the impact on marginalized groups.\n"
+            "- Follow the IDEOLOGY and TONE blocks.\n"
+            f"- Language of article must be : [{language}]\n"
             "Ensure the output is a properly formatted JSON object without any markdown or extra formatting.\n"
-        )
+        ), [('Article Text', 'text')])
 
-        print(Fore.BLUE + f'Article: Conclusion')
-        conclusion_json = self._generate_json_element(conclusion_prompt)
-        return conclusion_json.get('article', '')
-
-    def generate_image_descriptions(self, text, count=10):
-        """
-        Genera descripciones de imágenes basadas en un texto narrativo.
-        
-        Args:
-            text (str): Texto narrativo del que extraer las imágenes (noticia, etc.).
-            count (int): Número de descripciones de imágenes a generar.
-            
-        Returns:
-            list: Lista de descripciones breves y concretas.
-        """
-        image_descriptions_prompt = (
+        compiler.register('image_descriptions', (
             'You are a visual storyteller specializing in news content. Based on the given news narrative, '
             'extract the most relevant visual elements directly related to the story. '
             'Each description MUST be SPECIFICALLY tied to the actual news content — '
             'people mentioned, locations described, events referenced, objects of relevance. '
             'Generate a structured JSON object in the following format:\n'
             '{\n'
-            '  "image_descriptions": ["", "", "..."]  // Generate ' + str(count) + ' image descriptions. '
+            '  "image_descriptions": ["", "", "..."]  // Generate as many image descriptions as the Count parameter says. '
             'Each description should be detailed and concrete, describing what is seen in the image as if it were a real photograph. '
             'CRITICAL: Tie every description to specific elements from the news story. '
             'Avoid generic phrases like "a person" — instead say "a Spanish businessman in a suit" or '
@@ -358,112 +406,64 @@ class Chatbot:
             'Include relevant settings from the story (e.g., "outside the European Parliament in Brussels", '
             '"in an office in Madrid", "in the middle of a flooded street"). '
             'Each description must be usable as a text-to-image prompt for AI image generation.\n'
-            '}\n\n'
-            'Parameters:\n'
-            '- News narrative text: """' + text + '"""'
-        )
-
-        print(Fore.BLUE + 'Generating image descriptions...')
-        image_descriptions_json = self._generate_json_element(image_descriptions_prompt)
-        return image_descriptions_json.get('image_descriptions', [])
+            '}\n'
+        ), [('Count', 'count'), ('News narrative text', 'text')])
 
-    def generate_scene_descriptions(self, text, count=10):
-        """Generate scene/visual descriptions from narrative text for media prompts."""
-        prompt = (
+        compiler.register('scenes', (
             'You are a visual director for news videos. Based on the news narrative text, '
             'extract the most relevant visual scenes that are DIRECTLY related to the story. '
             'Each scene must be SPECIFIC to the news content — not generic stock footage prompts. '
             'Generate a structured JSON object:\n'
             '{\n'
-            '  "scenes": ["", "", "..."]  // Generate ' + str(count) + ' detailed visual scene descriptions '
+            '  "scenes": ["", "", "..."]  // Generate as many detailed visual scene descriptions as the Count parameter says, '
             'suitable for searching stock video footage. Each description should be a concrete visual scene '
             'tied to elements from the news story (e.g., if the story is about Amazon deforestation, '
             'describe "aerial view of burning Amazon rainforest with smoke plumes rising" instead of '
             'just "a forest"). Include specific people, locations, objects, and actions from the story.\n'
-            '}\n\n'
-            'Parameters:\n'
-            '- News narrative text: """' + text + '"""'
-        )
-        print(Fore.BLUE + 'Generating scene descriptions...')
-        scenes_json = self._generate_json_element(prompt)
-        return scenes_json.get('scenes', [])
-
-    def summarize_news_from_url(self, url):
-        extractor = NewsExtractor()
-        article = extractor.extract_article(url)
-        
-        if article is None:
-            return []
+            '}\n'
+        ), [('Count', 'count'), ('News narrative text', 'text')])
 
-        summary_prompt = (
+        compiler.register('summary', (
             'You are a creative writer. Based on the article text I provide, generate a response that must be a fully structured JSON object with the following format: '
             '{'
             '  "summary": "" // Write a brief summary of the news article in English, highlighting the main points and key details. The summary should be concise and informative, providing a clear overview of the article\'s content.'
-            '}'
-            f"{self.standard_rules}\n"
-            f'Parameters:\n'
-            f'- Article Text: [{article.text}]'
-        )
-        print(Fore.BLUE + f'Summary')
-        summary_json = self._generate_json_element(summary_prompt)
-        return summary_json.get('summary', '')
+            '}\n'
+        ), [('Article Text', 'text')])
 
-    def generate_tags(self, topic):
-        tags_prompt = (
+        compiler.register('tags', (
             'generate a response that must be a fully structured JSON object with the following format:'
             '{'
             '  "tags": ["","",""...] // Provide a list of exactly 20 of the most effective and widely used tags for this topic in English, optimized for YouTube SEO. Focus on including both single words and multi-word phrases that are highly relevant. Do NOT use the "#" symbol.'
-            '}'
-            f"{self.standard_rules}\n"
-            f'Parameters:\n'
-            f'- Language: [{self.language}]\n'
-            f'- Headline: [{topic}]\n'
-        )
-        print(Fore.BLUE + f'tags')
-        tags_json = self._generate_json_element(tags_prompt)
-        return tags_json.get('tags', [])
+            '}\n'
+            f'- Language: [{language}]\n'
+        ), [('Headline', 'topic')])
 
-    def generate_cover(self, topic):
-        cover_prompt = (
+        compiler.register('cover', (
             "You are an expert headline writer with a focus on clarity, precision, and SEO for news covers. "
             "Your task is to create a **very brief (max 5-6 words), clear, and informative** phrase "
             "based on the provided headline and language. Avoid generic or vague expressions. "
             "Prioritize delivering **the core information or main impact** of the topic without exaggeration.\n"
             "The output must be a **fully structured JSON object** in the following format:\n"
             "{\n"
-            '  "cover": ""  // A specific, concise, and descriptive phrase in ' + self.language + ' that captures the key subject or event.\n'
+            '  "cover": ""  // A specific, concise, and descriptive phrase in ' + language + ' that captures the key subject or event.\n'
             "}\n"
-            f"Parameters:\n"
-            f"- Language: [{self.language}]\n"
-            f"- Headline: [{topic}]\n"
-            "Avoid filler words, drama, or ambiguity. Focus on **accuracy and direct value**."
-        )
+            "Avoid filler words, drama, or ambiguity. Focus on **accuracy and direct value**.\n"
+            f"- Language: [{language}]\n"
+        ), [('Headline', 'topic')])
 
-        print(Fore.BLUE + f'cover')
-        cover_json = self._generate_json_element(cover_prompt)
-        return cover_json.get('cover', '')
-    
-    def enhance_prompt(self, topic):
-        cover_prompt = (
+        compiler.register('enhance', (
             "You are a professional clickbait headline writer specializing in news covers. "
             "Your task is to generate a **highly engaging, curiosity-inducing, and dramatic** short phrase, "
             "based on the headline and language provided. The phrase should feel like a **movie title** and be **no longer than 5 words**.\n"
             "The output must be a **fully structured JSON object** in the following format:\n"
             "{\n"
-            '  "cover": ""  // A gripping, clickbait phrase in ' + self.language + ', focusing on the main person or impact of the event.\n'
+            '  "cover": ""  // A gripping, clickbait phrase in ' + language + ', focusing on the main person or impact of the event.\n'
             "}\n"
-            f"Parameters:\n"
-            f"- Language: [{self.language}]\n"
-            f"- Headline: [{topic}]\n"
-            "Make it **bold, shocking, and impossible to ignore**."
-        )
+            "Make it **bold, shocking, and impossible to ignore**.\n"
+            f"- Language: [{language}]\n"
+        ), [('Headline', 'topic')])
 
-        print(Fore.BLUE + f'cover')
-        cover_json = self._generate_json_element(cover_prompt)
-        return cover_json.get('cover', '')
-
-    def generate_cover_image(self, topic):
-        cover_image_prompt = (
+        compiler.register('cover_image', (
             'Describe an image for a YouTube thumbnail cover that includes all key elements from the news '
             'in a single, cohesive description string perfect for AI image generation:\n'
             '{\n'
@@ -473,84 +473,130 @@ class Chatbot:
             'at a glance. Make it dramatic, visually striking, and newsworthy. '
             'Avoid generic backgrounds — tie it to the specific news location or context.\n'
             '}\n'
-            f"{self.standard_rules}\n"
-            f'Parameters:\n'
-            f'- Headline: [{topic}]\n'
+        ), [('Headline', 'topic')])
+
+        return compiler
+
+    def prompt_cache_report(self) -> dict:
+        """Cached-prefix token estimates collected when measure_prompt_cache is enabled."""
+        return self.prompts.cache_report()
+
+    def _log_prompt_cache_report(self):
+        report = self.prompt_cache_report()
+        if report:
+            self.logger.info(
+                "Prompt prefix cache: %d/%d prompt tokens reusable (ratio %.2f, system prefix %d tokens)",
+                report['cached_tokens'], report['prompt_tokens'], report['cached_ratio'], report['system_tokens'],
+            )
+
+    @trace()
+    def generate_title(self, topic):
+        print(Fore.BLUE + 'Generating Title...')
+        title_json = self._generate_json_element(self.prompts.compile('title', topic=topic))
+        return title_json.get('title', '')
+    
+    @trace()
+    def generate_description(self, topic):
+        print(Fore.BLUE + f'description')
+        description_json = self._generate_json_element(self.prompts.compile('description', topic=topic))
+        return description_json.get('description', '')
+
+    @trace()
+    def generate_short_article(self, topic, source="", length=50, accept_labels =False, context=None):
+        """
+        Generates a short article based on the given topic.
+        `context` is optional prepared article text (see prepare_context).
+        """
+        print(Fore.BLUE + 'Generating YouTube narration')
+        narration_prompt = self.prompts.compile('short_article', source=source or None, topic=topic, context=context or None)
+        narration_json = self._generate_json_element(narration_prompt)
+        return narration_json.get('article', '')
+
+    @trace()
+    def generate_full_article(self, topic, length=150, context=None):
+        """
+        Generates a full-length article and a short summary based on the given topic.
+        `context` is optional prepared article text (see prepare_context).
+        Returns a tuple of (full_article, short_summary).
+        """
+        print(Fore.BLUE + 'Generating full-length YouTube narration')
+        print(Fore.BLUE + 'Full article')
+        article_json = self._generate_json_element(
+            self.prompts.compile('full_article', topic=topic, context=context or None)
+        )
+        return article_json.get('full_article', ''), article_json.get('short_summary', '')
+    
+    def generate_conclusion_from_text(self, article_text):
+        print(Fore.BLUE + f'Article: Conclusion')
+        conclusion_json = self._generate_json_element(self.prompts.compile('conclusion', text=article_text))
+        return conclusion_json.get('article', '')
+
+    def generate_image_descriptions(self, text, count=10):
+        """
+        Genera descripciones de imágenes basadas en un texto narrativo.
+        
+        Args:
+            text (str): Texto narrativo del que extraer las imágenes (noticia, etc.).
+            count (int): Número de descripciones de imágenes a generar.
+            
+        Returns:
+            list: Lista de descripciones breves y concretas.
+        """
+        print(Fore.BLUE + 'Generating image descriptions...')
+        image_descriptions_json = self._generate_json_element(
+            self.prompts.compile('image_descriptions', count=count, text=text)
         )
+        return image_descriptions_json.get('image_descriptions', [])
+
+    def generate_scene_descriptions(self, text, count=10):
+        """Generate scene/visual descriptions from narrative text for media prompts."""
+        print(Fore.BLUE + 'Generating scene descriptions...')
+        scenes_json = self._generate_json_element(self.prompts.compile('scenes', count=count, text=text))
+        return scenes_json.get('scenes', [])
+
+    def summarize_news_from_url(self, url):
+        prepared = self.prepare_context(url)
+        
+        if prepared is None:
+            return []
+
+        print(Fore.BLUE + f'Summary')
+        summary_json = self._generate_json_element(self.prompts.compile('summary', text=prepared.text))
+        return summary_json.get('summary', '')
+
+    def generate_tags(self, topic):
+        print(Fore.BLUE + f'tags')
+        tags_json = self._generate_json_element(self.prompts.compile('tags', topic=topic))
+        return tags_json.get('tags', [])
+
+    def generate_cover(self, topic):
+        print(Fore.BLUE + f'cover')
+        cover_json = self._generate_json_element(self.prompts.compile('cover', topic=topic))
+        return cover_json.get('cover', '')
+    
+    def enhance_prompt(self, topic):
+        print(Fore.BLUE + f'cover')
+        cover_json = self._generate_json_element(self.prompts.compile('enhance', topic=topic))
+        return cover_json.get('cover', '')
+
+    def generate_cover_image(self, topic):
         print(Fore.BLUE + f'coverImage')
-        cover_image_json = self._generate_json_element(cover_image_prompt)
+        cover_image_json = self._generate_json_element(self.prompts.compile('cover_image', topic=topic))
         return cover_image_json.get('coverImage', '')
 
 
     
     def _extract_json(self, text: str) -> Optional[str]:
-        """Extract a JSON object from text, trying multiple strategies."""
-        text = text.strip()
-        # Strategy 1: try to parse the whole response as JSON
-        try:
-            json.loads(text)
-            return text
-        except json.JSONDecodeError:
-            pass
-
-        # Strategy 2: find outermost { ... } skipping braces inside strings
-        start = text.find('{')
-        if start != -1:
-            depth = 0
-            in_string = False
-            escape = False
-            for i in range(start, len(text)):
-                ch = text[i]
-                if escape:
-                    escape = False
-                    continue
-                if ch == '\\':
-                    escape = True
-                    continue
-                if ch == '"':
-                    in_string = not in_string
-                    continue
-                if in_string:
-                    continue
-                if ch == '{':
-                    depth += 1
-                elif ch == '}':
-                    depth -= 1
-                    if depth == 0:
-                        return text[start:i + 1]
-
-        # Strategy 3: find outermost [ ... ] skipping brackets inside strings
-        start = text.find('[')
-        if start != -1:
-            depth = 0
-            in_string = False
-            escape = False
-            for i in range(start, len(text)):
-                ch = text[i]
-                if escape:
-                    escape = False
-                    continue
-                if ch == '\\':
-                    escape = True
-                    continue
-                if ch == '"':
-                    in_string = not in_string
-                    continue
-                if in_string:
-                    continue
-                if ch == '[':
-                    depth += 1
-                elif ch == ']':
-                    depth -= 1
-                    if depth == 0:
-                        return text[start:i + 1]
-
-        return None
+        """Extract a JSON object from text (see scripts.AI.response_parser)."""
+        return extract_json_text(text)
 
     def _generate_json_element(self, prompt_template, clean: bool = True):
         """
         Helper function to generate a single JSON element based on the provided prompt.
         Tries each LLM provider (Ollama -> Groq -> Azure) until one succeeds.
+
+        `prompt_template` is either a CompiledPrompt (sent as system + user messages)
+        or a plain prompt string.
         """
         if not self.llm.available:
             self.logger.error("No LLM providers available.")
@@ -559,17 +605,26 @@ class Chatbot:
         retries = 2
         for attempt in range(retries):
             try:
-                response = self.llm.complete(prompt_template, max_tokens=8192)
+                if isinstance(prompt_template, CompiledPrompt):
+                    response = self.llm.complete(
+                        prompt_template.user, system=prompt_template.system,
+                        max_tokens=8192, task=prompt_template.name,
+                    )
+                else:
+                    response = self.llm.complete(prompt_template, max_tokens=8192)
+
+                # Callers read fields, so anything but an object is retried like a parse failure
+                if clean:
+                    return parse_json_object(response)
 
                 content = self._extract_json(response)
                 if content is None:
                     self.logger.warning("No valid JSON object found in response")
                     raise json.JSONDecodeError("No JSON object found", response, 0)
-
-                if clean:
-                    content = self.clean_and_load_json(content)
-                    return content
-                return json.loads(content)
+                value = json.loads(content)
+                if not isinstance(value, dict):
+                    raise ResponseParseError(f"Expected a JSON object, got {type(value).__name__}")
+                return value
 
             except (json.JSONDecodeError, ValueError) as e:
                 snippet = response[:200] if attempt < retries - 1 else ""
@@ -588,38 +643,15 @@ class Chatbot:
 
     def clean_and_load_json(self, json_string: str):
         """
-        Cleans a given JSON string to remove unwanted characters and make it valid for parsing.
-        Accepts both double-quoted and single-quoted string values (via ast.literal_eval).
+        Parses a JSON string, repairing common LLM formatting slips only when strict parsing fails.
+        Accepts both double-quoted and single-quoted string values.
         
         :param json_string: A string containing JSON data.
-        :return: A Python dictionary parsed from the cleaned JSON string.
-        :raises ValueError: If the cleaned string is still not valid JSON.
+        :return: A Python dictionary parsed from the JSON string.
+        :raises ValueError: If the string is still not valid JSON after repair.
         """
-        import ast
-        try:
-            # Safe print - handle Unicode errors on Windows console
-            try:
-                print(Fore.BLUE, json_string)
-            except (UnicodeEncodeError, UnicodeError):
-                print(Fore.BLUE + "[JSON output suppressed - Unicode encoding issue]")
-
-            json_string = re.sub(r'[\x00-\x1F\x7F]', '', json_string)
-            json_string = json_string.strip()
-            json_string = re.sub(r',\s*([}\]])', r'\1', json_string)
-            json_string = re.sub(r'(?<=\{|,)(\s*)([a-zA-Z0-9_]+)(\s*):', r'"\2":', json_string)
-
-            # Try ast.literal_eval first (handles both ' and " strings, arrays, nested)
-            try:
-                json_dict = ast.literal_eval(json_string)
-                return json_dict
-            except (ValueError, SyntaxError):
-                pass
-
-            # Fallback to json.loads for strict JSON
-            json_dict = json.loads(json_string)
-            return json_dict
-        except (json.JSONDecodeError, ValueError) as e:
-            raise ValueError(f"Invalid JSON after cleaning: {e}\n{json_string}")
+        self.logger.debug("Parsing JSON response (%d chars)", len(json_string))
+        return parse_json_response(json_string)
         
     def save_json(self, file_path, data):
         """Saves JSON data to a file."""
@@ -651,12 +683,18 @@ class Chatbot:
             topic_source = ''
         print(Fore.CYAN + f"Generating article and phrases for topic: {topic_title}")
 
+        prepared = self.prepare_context(topic if isinstance(topic, dict) and topic.get('url') else topic_title)
+        if prepared is not None:
+            topic_title = prepared.title or topic_title
+
         # Generate a unique GUID
         file_guid = str(uuid.uuid4())
         folder_path = '.temp'
         file_path = os.path.join(folder_path, f'{file_guid}.json')
 
-        article = self.generate_short_article(topic_title, source=topic_source)
+        article = self.generate_short_article(
+            topic_title, source=topic_source, context=prepared.text if prepared else None
+        )
 
         # Parallelize independent LLM calls
         results = {}
@@ -688,6 +726,7 @@ class Chatbot:
         short_phrases = random.sample(image_descriptions, min(20, len(image_descriptions)))
 
         print(Fore.GREEN + "Article and phrases generated successfully.")
+        self._log_prompt_cache_report()
 
         # Create the complete JSON response
         response_json = {
@@ -713,6 +752,7 @@ class Chatbot:
 
         Parameters:
             topic (str): The topic for which the article and phrases should be generated.
+                         An article URL is expanded into its token-budgeted text.
 
         Returns:
             tuple: A tuple containing the generated article, short phrases, title, description, tags, cover, and cover image.
@@ -724,7 +764,11 @@ class Chatbot:
         folder_path = '.temp'
         file_path = os.path.join(folder_path, f'{file_guid}.json')
 
-        article, short = self.generate_full_article(topic)
+        prepared = self.prepare_context(topic)
+        article, short = self.generate_full_article(
+            prepared.title or topic if prepared else topic,
+            context=prepared.text if prepared else None,
+        )
 
         # Parallelize independent LLM calls
         results = {}
@@ -756,6 +800,7 @@ class Chatbot:
         short_phrases = random.sample(image_descriptions, min(40, len(image_descriptions)))
 
         print(Fore.GREEN + "Long article and phrases generated successfully.")
+        self._log_prompt_cache_report()
 
         # Create the complete JSON response
         response_json = {
@@ -773,5 +818,76 @@ class Chatbot:
 
         return article.replace('\n', ''), short_phrases, title, description, tags, cover, cover_image
 
+    def generate_batch(
+        self,
+        topics: List[Any],
+        long_form: bool = False,
+        max_workers: int = 3,
+        stop_event: Optional[threading.Event] = None,
+        max_errors: Optional[int] = None,
+    ) -> "queue.Queue[Optional[BatchResult]]":
+        """
+        Generates article bundles for several topics concurrently and returns immediately.
+
+        Finished topics are put on the returned queue as BatchResult items in completion
+        order, followed by a final None, so callers can start TTS/media/render for one
+        story while the others are still being written. Provider calls stay bounded by
+        each provider's max_concurrency.
 
-    
\ No newline at end of file
+        Topics are submitted one at a time as workers free up, and `stop_event` is checked
+        before each submit: once it is set, no further topic reaches the LLM. The batch
+        sets it itself after `max_errors` consecutive failed topics. A bundle with an empty
+        article counts as failed and is reported with an error, not a bundle.
+        """
+        results: "queue.Queue[Optional[BatchResult]]" = queue.Queue()
+        generate = self.generate_article_and_phrases_long if long_form else self.generate_article_and_phrases_short
+        stop_event = stop_event if stop_event is not None else threading.Event()
+        workers = max(1, min(max_workers, len(topics)))
+        slots = threading.Semaphore(workers)
+        errors_lock = threading.Lock()
+        consecutive_errors = 0
+
+        def _run_one(index, topic):
+            nonlocal consecutive_errors
+            try:
+                bundle = generate(topic)
+                if not bundle or not bundle[0]:
+                    # Provider failures come back as empty fields rather than exceptions
+                    raise RuntimeError("LLM returned an empty article")
+            except Exception as e:
+                self.logger.error("Batch generation failed for topic %d: %s", index, e)
+                with errors_lock:
+                    consecutive_errors += 1
+                    if max_errors is not None and consecutive_errors >= max_errors:
+                        stop_event.set()
+                results.put(BatchResult(index=index, topic=topic, error=e))
+            else:
+                with errors_lock:
+                    consecutive_errors = 0
+                results.put(BatchResult(index=index, topic=topic, bundle=bundle))
+            finally:
+                slots.release()
+
+        def _run_all():
+            try:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for index, topic in enumerate(topics):
+                        slots.acquire()
+                        if stop_event.is_set():
+                            slots.release()
+                            break
+                        executor.submit(_run_one, index, topic)
+            finally:
+                results.put(None)
+
+        threading.Thread(target=_run_all, name="chatbot-batch", daemon=True).start()
+        return results
+
+    def iter_batch(self, topics: List[Any], long_form: bool = False, max_workers: int = 3) -> Iterator[BatchResult]:
+        """Blocking iterator over generate_batch results, in completion order."""
+        results = self.generate_batch(topics, long_form=long_form, max_workers=max_workers)
+        while True:
+            item = results.get()
+            if item is None:
+                return
+            yield item
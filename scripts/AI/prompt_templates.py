@@ -0,0 +1,138 @@
+"""
+Prompt templates laid out for provider-side prefix caching.
+
+Ollama reuses the KV cache of the previous request when a new prompt starts with
+the same tokens, and hosted providers (Groq, Azure OpenAI) serve repeated prompt
+prefixes from cache. Both only help when the static part of a prompt comes first
+and is byte-identical between calls, so every prompt is emitted as:
+
+1. a system message shared by every task of a ``Chatbot`` (rendered once),
+2. the task instructions (rendered once per task and interned),
+3. the per-call parameters, always last.
+"""
+import re
+import sys
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Sequence, Tuple
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough, tokenizer-free token count (words and punctuation marks)."""
+    return len(_TOKEN_RE.findall(text))
+
+
+@dataclass(frozen=True)
+class CompiledPrompt:
+    name: str
+    system: str
+    user: str
+    static_chars: int  # leading chars of `user` that are identical on every call of this task
+
+    @property
+    def variable_part(self) -> str:
+        return self.user[self.static_chars:]
+
+
+class PromptTemplate:
+    """
+    Task instructions followed by a ``Parameters:`` block filled per call.
+
+    Parameters passed as ``None`` are left out of the block.
+    """
+
+    def __init__(self, name: str, instructions: str, fields: Sequence[Tuple[str, str]]):
+        self.name = name
+        self.instructions = sys.intern(instructions.rstrip() + "\n\nParameters:\n")
+        self.fields = tuple(fields)
+
+    def render(self, values: Dict[str, Any]) -> str:
+        missing = [key for _, key in self.fields if key not in values]
+        if missing:
+            raise KeyError(f"Prompt '{self.name}' missing parameters: {', '.join(missing)}")
+        params = "".join(
+            f"- {label}: [{values[key]}]\n" for label, key in self.fields if values[key] is not None
+        )
+        return self.instructions + params
+
+
+class PromptCacheStats:
+    """
+    Estimates how many prompt tokens a prefix cache can serve.
+
+    The system message counts as cached once any prompt has been sent, and a
+    task's instructions count as cached once that task has been sent before.
+    """
+
+    def __init__(self, system_tokens: int):
+        self.system_tokens = system_tokens
+        self._lock = threading.Lock()
+        self._instruction_tokens: Dict[str, int] = {}
+        self._per_task: Dict[str, Dict[str, int]] = {}
+
+    def record(self, prompt: CompiledPrompt) -> None:
+        variable_tokens = estimate_tokens(prompt.variable_part)
+        with self._lock:
+            seen_any = bool(self._per_task)
+            seen_task = prompt.name in self._instruction_tokens
+            if not seen_task:
+                self._instruction_tokens[prompt.name] = estimate_tokens(prompt.user[:prompt.static_chars])
+            instruction_tokens = self._instruction_tokens[prompt.name]
+
+            cached = (self.system_tokens if seen_any else 0) + (instruction_tokens if seen_task else 0)
+            entry = self._per_task.setdefault(prompt.name, {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0})
+            entry["calls"] += 1
+            entry["prompt_tokens"] += self.system_tokens + instruction_tokens + variable_tokens
+            entry["cached_tokens"] += cached
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            tasks = {name: dict(entry) for name, entry in self._per_task.items()}
+        total_prompt = sum(e["prompt_tokens"] for e in tasks.values())
+        total_cached = sum(e["cached_tokens"] for e in tasks.values())
+        for entry in tasks.values():
+            entry["cached_ratio"] = round(entry["cached_tokens"] / entry["prompt_tokens"], 3) if entry["prompt_tokens"] else 0.0
+        return {
+            "system_tokens": self.system_tokens,
+            "prompt_tokens": total_prompt,
+            "cached_tokens": total_cached,
+            "cached_ratio": round(total_cached / total_prompt, 3) if total_prompt else 0.0,
+            "tasks": tasks,
+        }
+
+
+class PromptCompiler:
+    """
+    Renders the shared system message once and compiles registered task templates.
+
+    Args:
+        preamble: Opening line of the system message.
+        sections: Ordered (name, text) reference blocks tasks can cite by name.
+        measure: Collect cached-prefix token estimates (see ``cache_report``).
+    """
+
+    def __init__(self, preamble: str, sections: Sequence[Tuple[str, str]], measure: bool = False):
+        blocks = [preamble.strip()] + [f"[{name}]\n{text.strip()}" for name, text in sections]
+        self.system = sys.intern("\n\n".join(blocks))
+        self._templates: Dict[str, PromptTemplate] = {}
+        self.stats = PromptCacheStats(estimate_tokens(self.system)) if measure else None
+
+    def register(self, name: str, instructions: str, fields: Sequence[Tuple[str, str]]) -> None:
+        self._templates[name] = PromptTemplate(name, instructions, fields)
+
+    def compile(self, name: str, **values: Any) -> CompiledPrompt:
+        template = self._templates[name]
+        prompt = CompiledPrompt(
+            name=name,
+            system=self.system,
+            user=template.render(values),
+            static_chars=len(template.instructions),
+        )
+        if self.stats is not None:
+            self.stats.record(prompt)
+        return prompt
+
+    def cache_report(self) -> Dict[str, Any]:
+        return self.stats.report() if self.stats is not None else {}
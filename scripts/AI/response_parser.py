@@ -0,0 +1,250 @@
+"""
+Fast JSON extraction from LLM responses.
+
+Parsing order, cheapest first:
+
+1. ``json.loads`` on the whole (stripped) response - the common case when the
+   provider honours JSON mode.
+2. ``json.JSONDecoder.raw_decode`` at the first ``{`` located with
+   ``str.find``. Both run in C, so prose or code fences around the payload cost
+   no Python-level character loop. A leading ``[`` wins only when its array
+   encloses that object (or there is no object).
+3. Repair heuristics (control characters, trailing commas, unquoted keys,
+   single-quoted literals) on the opener's whole balanced span, only when the
+   strict paths fail.
+"""
+import ast
+import json
+import re
+import time
+import logging
+from typing import Any, Callable, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_DECODER = json.JSONDecoder()
+_CONTROL_CHARS_RE = re.compile(r'[\x00-\x1F\x7F]')
+_TRAILING_COMMA_RE = re.compile(r',\s*([}\]])')
+_UNQUOTED_KEY_RE = re.compile(r'(?<=\{|,)(\s*)([a-zA-Z0-9_]+)(\s*):')
+_STRUCTURE_RE = re.compile(r'"(?:[^"\\]|\\.)*"|[{}\[\]]')
+
+
+class ResponseParseError(ValueError):
+    """Raised when no JSON value can be recovered from a response."""
+
+
+def _matching_close(text: str, start: int) -> Optional[int]:
+    """Index just past the closer that balances the opener at `start` (strings skipped), or None."""
+    depth = 0
+    for match in _STRUCTURE_RE.finditer(text, start):
+        token = match.group()
+        if token in "{[":
+            depth += 1
+        elif token in "}]":
+            depth -= 1
+            if depth == 0:
+                return match.end()
+    return None
+
+
+def _candidate(text: str, opener: str, limit: int = -1) -> Optional[Tuple[Any, int, int]]:
+    """
+    First value starting at a top-level `opener` before `limit`, as (value, start, end).
+
+    A strict ``raw_decode`` hit is accepted as is (it ends at the opener's
+    matching closer by construction). When it fails, the whole balanced span
+    goes to ``repair_json``; openers nested inside it are never tried on
+    their own, so a broken outer object cannot degrade to one of its members.
+    """
+    limit = len(text) if limit < 0 else limit
+    closer = "}" if opener == "{" else "]"
+    start = text.find(opener, 0, limit)
+    while start != -1:
+        try:
+            value, end = _DECODER.raw_decode(text, start)
+            return value, start, end
+        except json.JSONDecodeError:
+            pass
+        end = _matching_close(text, start)
+        if end is None:
+            # Truncated payload: repair up to the last closer
+            end = text.rfind(closer) + 1
+            if end <= start:
+                return None
+        try:
+            return repair_json(text[start:end]), start, end
+        except ResponseParseError:
+            start = text.find(opener, end, limit)
+    return None
+
+
+def _first_value(text: str) -> Optional[Tuple[Any, int, int]]:
+    """
+    The response's JSON object, or its array when the array holds the object.
+
+    A bracketed aside ahead of the payload ("Respuesta [1]: {...}") is not
+    taken for the answer: an array only wins when it encloses the first
+    object or there is no object at all.
+    """
+    obj = _candidate(text, "{")
+    arr = _candidate(text, "[", obj[1] if obj else -1)
+    if obj is None:
+        return arr
+    if arr is not None and arr[2] > obj[1]:
+        return arr
+    return obj
+
+
+def extract_json_text(text: str) -> Optional[str]:
+    """Return the first JSON object/array in `text` as a substring."""
+    text = text.strip()
+    try:
+        json.loads(text)
+        return text
+    except json.JSONDecodeError:
+        pass
+    hit = _first_value(text)
+    if hit is not None:
+        return text[hit[1]:hit[2]]
+    return _outermost_span(text)
+
+
+def _outermost_span(text: str) -> Optional[str]:
+    """Span from the first opening brace/bracket to its last closer, for repair attempts."""
+    for opener, closer in (("{", "}"), ("[", "]")):
+        start, end = text.find(opener), text.rfind(closer)
+        if start != -1 and end > start:
+            return text[start:end + 1]
+    return None
+
+
+def repair_json(text: str) -> Any:
+    """Best-effort parse of almost-JSON. Raises ResponseParseError."""
+    cleaned = _CONTROL_CHARS_RE.sub('', text).strip()
+    cleaned = _TRAILING_COMMA_RE.sub(r'\1', cleaned)
+    cleaned = _UNQUOTED_KEY_RE.sub(r'"\2":', cleaned)
+    try:
+        return json.loads(cleaned)
+    except json.JSONDecodeError:
+        pass
+    try:
+        # Handles single-quoted strings and Python literals (True/None)
+        return ast.literal_eval(cleaned)
+    except (ValueError, SyntaxError) as e:
+        raise ResponseParseError(f"Invalid JSON after repair: {e}") from e
+
+
+def parse_json_response(text: str) -> Any:
+    """
+    Parse the JSON payload of an LLM response.
+
+    Raises:
+        ResponseParseError: if neither the strict nor the repair path yields a value.
+    """
+    if not text:
+        raise ResponseParseError("Empty response")
+    stripped = text.strip()
+    try:
+        return json.loads(stripped)
+    except json.JSONDecodeError:
+        pass
+
+    hit = _first_value(stripped)
+    if hit is not None:
+        return hit[0]
+
+    candidate = _outermost_span(stripped)
+    if candidate is None:
+        raise ResponseParseError("No JSON object found")
+    logger.debug("Falling back to JSON repair for %d-char response", len(stripped))
+    return repair_json(candidate)
+
+
+def parse_json_object(text: str) -> dict:
+    """
+    Like ``parse_json_response`` but for callers that read fields: a JSON object or
+    ResponseParseError (a bare array or scalar counts as unparseable).
+    """
+    value = parse_json_response(text)
+    if not isinstance(value, dict):
+        raise ResponseParseError(f"Expected a JSON object, got {type(value).__name__}")
+    return value
+
+
+def benchmark(
+    samples: Iterable[str],
+    parsers: Optional[List[Tuple[str, Callable[[str], Any]]]] = None,
+    repeat: int = 50,
+) -> dict:
+    """Mean microseconds per sample for each parser (failures count as completed calls)."""
+    samples = list(samples)
+    parsers = parsers or [("parse_json_response", parse_json_response)]
+    results = {}
+    for name, parser in parsers:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            for sample in samples:
+                try:
+                    parser(sample)
+                except ValueError:
+                    pass
+        elapsed = time.perf_counter() - start
+        results[name] = round(elapsed / (repeat * max(len(samples), 1)) * 1e6, 2)
+    return results
+
+
+def _legacy_parse(text: str) -> Any:
+    """The pre-existing Chatbot path: char-loop extraction, regex cleaning, literal_eval, json.loads."""
+    text = text.strip()
+    start, depth, in_string, escape, span = text.find('{'), 0, False, False, None
+    if start != -1:
+        for i in range(start, len(text)):
+            ch = text[i]
+            if escape:
+                escape = False
+                continue
+            if ch == '\\':
+                escape = True
+                continue
+            if ch == '"':
+                in_string = not in_string
+                continue
+            if in_string:
+                continue
+            if ch == '{':
+                depth += 1
+            elif ch == '}':
+                depth -= 1
+                if depth == 0:
+                    span = text[start:i + 1]
+                    break
+    if span is None:
+        raise ValueError("No JSON object found")
+    span = _CONTROL_CHARS_RE.sub('', span).strip()
+    span = _TRAILING_COMMA_RE.sub(r'\1', span)
+    span = _UNQUOTED_KEY_RE.sub(r'"\2":', span)
+    try:
+        return ast.literal_eval(span)
+    except (ValueError, SyntaxError):
+        return json.loads(span)
+
+
+if __name__ == '__main__':
+    import sys
+    from pathlib import Path
+
+    logging.basicConfig(level=logging.INFO)
+    # Captured responses: pass files as arguments (raw provider output, one per file).
+    # Without arguments, synthesize ~8k-token responses shaped like the real ones.
+    paths = [Path(p) for p in sys.argv[1:]]
+    if paths:
+        responses = [p.read_text(encoding='utf-8') for p in paths]
+    else:
+        narration = "Esto te va a sorprender: " + " ".join(f"frase número {i} con \\\"comillas\\\" y datos." for i in range(1500))
+        payload = json.dumps({"full_article": narration, "short_summary": "Resumen {breve} [con] llaves."}, ensure_ascii=False)
+        responses = [
+            payload,
+            "Claro, aquí tienes el JSON:\n```json\n" + payload + "\n```",
+            "Nota previa {no json}. " + payload,
+        ]
+    print(benchmark(responses, [("legacy", _legacy_parse), ("parse_json_response", parse_json_response)], repeat=20))
@@ -1,34 +1,131 @@
 import os
+import threading
 
-import pyttsx3
 import configparser
-from moviepy.editor import AudioFileClip
-import whisper
 import re
 from colorama import Fore, Style, init
 import time
+from typing import Dict, List, Optional, Sequence
+
+from scripts.MediaManagers.SRT_Processor import SubtitleTrack
 
 # Inicializar Colorama
 init(autoreset=True)
 
+DEFAULT_WHISPER_MODEL = "small"
+
+_models: Dict[tuple, object] = {}
+# One lock per loaded model: the model is shared process-wide, so its users must be too
+_model_locks: Dict[tuple, threading.Lock] = {}
+_models_lock = threading.Lock()
+
+
+def _model_key(name: str, device: Optional[str], quantize: bool) -> tuple:
+    return (name, "cpu" if quantize else device, quantize)
+
+
+def _quantize_linear_layers(model):
+    """
+    Dynamically quantizes the model's Linear layers to int8; returns (model, layers quantized).
+
+    Whisper builds its layers from ``whisper.model.Linear``, a subclass that
+    only casts weights to the input dtype. quantize_dynamic matches exact
+    module types (and nnqd.Linear.from_float rejects subclasses), so those
+    layers are first turned back into plain ``nn.Linear``. On CPU in float32
+    the cast is a no-op, so the forward pass is unchanged.
+    """
+    import torch
+    from torch.ao.nn.quantized import dynamic as nnqd
+
+    for module in model.modules():
+        if isinstance(module, torch.nn.Linear) and type(module) is not torch.nn.Linear:
+            module.__class__ = torch.nn.Linear
+    model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model, sum(1 for module in model.modules() if isinstance(module, nnqd.Linear))
+
+
+def get_whisper_model(name: str = DEFAULT_WHISPER_MODEL, device: Optional[str] = None, quantize: bool = False):
+    """
+    Process-wide Whisper model registry: each (name, device, quantize) is loaded once, on first use.
+
+    With quantize=True the model runs on CPU with its Linear layers dynamically
+    quantized to int8 (torch.quantization.quantize_dynamic), which roughly halves
+    memory and speeds up CPU inference at a small accuracy cost.
+    Serialize calls on the returned model with ``get_whisper_lock`` (same arguments).
+    """
+    key = _model_key(name, device, quantize)
+    with _models_lock:
+        model = _models.get(key)
+        if model is None:
+            import whisper
+            start = time.time()
+            model = whisper.load_model(name, device=key[1])
+            precision = key[1] or 'default device'
+            if quantize:
+                model, quantized = _quantize_linear_layers(model)
+                if quantized:
+                    precision = f"cpu, int8 dynamic on {quantized} Linear layers"
+                else:
+                    precision = "cpu, float32 - no layers were quantized"
+                    print(f"{Fore.YELLOW}Whisper quantization replaced no layers; running '{name}' unquantized")
+            print(f"{Fore.CYAN}Loaded Whisper '{name}' ({precision}) in {time.time() - start:.1f}s")
+            _models[key] = model
+            _model_locks.setdefault(key, threading.Lock())
+        return model
+
+
+def get_whisper_lock(name: str = DEFAULT_WHISPER_MODEL, device: Optional[str] = None,
+                     quantize: bool = False) -> threading.Lock:
+    """Lock guarding the shared model for these arguments; every user of that model takes the same one."""
+    key = _model_key(name, device, quantize)
+    with _models_lock:
+        return _model_locks.setdefault(key, threading.Lock())
+
+
+def release_whisper_models() -> None:
+    """Drop every cached model (e.g. to reclaim memory after a batch job)."""
+    with _models_lock:
+        _models.clear()
+
+
 class stt_whisper:
-    def __init__(self, config_file='settings.config'):
+    def __init__(self, config_file='settings.config', model_name: str = DEFAULT_WHISPER_MODEL,
+                 device: Optional[str] = None, quantize: bool = False):
+        """
+        Whisper transcription and pyttsx3 voiceover helpers.
+
+        Nothing heavy happens here: the Whisper model comes from the shared
+        registry on first transcription and pyttsx3 starts on first voiceover.
+        """
         self.config = configparser.ConfigParser()
         self.config.read(config_file)
-        self.engine = pyttsx3.init()
-        self.whisper_model = whisper.load_model("small")  # Load the Whisper model
-
-        # Text-to-speech engine configuration
-        voices = self.engine.getProperty('voices')
-        self.engine.setProperty('voice', voices[0].id)
-        self.engine.setProperty('rate', 150)
-        self.engine.setProperty('volume', 1.0)
+        self.model_name = model_name
+        self.device = device
+        self.quantize = quantize
+        self._engine = None
 
         # Set up the temporary directory in the project's root directory
         self.temp_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '.temp')
         self.temp_dir = os.path.abspath(self.temp_dir)  # Ensure an absolute path is obtained
         os.makedirs(self.temp_dir, exist_ok=True)
 
+    @property
+    def whisper_model(self):
+        return get_whisper_model(self.model_name, self.device, self.quantize)
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            import pyttsx3
+            engine = pyttsx3.init()
+            # Text-to-speech engine configuration
+            voices = engine.getProperty('voices')
+            engine.setProperty('voice', voices[0].id)
+            engine.setProperty('rate', 150)
+            engine.setProperty('volume', 1.0)
+            self._engine = engine
+        return self._engine
+
     def generate_voiceover(self, text: str):
         """
         Generates a voice file (mp3) from the text using pyttsx3.
@@ -47,6 +144,7 @@ class stt_whisper:
         """
         Gets the duration of the audio file in seconds.
         """
+        from moviepy.editor import AudioFileClip
         # Use AudioFileClip to open the audio file
         with AudioFileClip(audio_file) as audio:
             return audio.duration
@@ -86,8 +184,13 @@ class stt_whisper:
             if best_of is not None:
                 options['best_of'] = best_of
 
-            # Transcribe the audio file with Whisper
-            result = self.whisper_model.transcribe(audio_file, **options)
+            if self.quantize or self.device == "cpu":
+                options['fp16'] = False
+
+            # Transcribe the audio file with Whisper (the model is shared process-wide, so serialize use)
+            model = self.whisper_model
+            with get_whisper_lock(self.model_name, self.device, self.quantize):
+                result = model.transcribe(audio_file, **options)
 
             if verbose:
                 print(f"{Fore.GREEN}Transcription result: {result}")
@@ -114,6 +217,23 @@ class stt_whisper:
             # log_error(f"Transcription error: {str(e)}")
             return []
     
+    def transcribe_batch(self, audio_files: Sequence[str], **options) -> Dict[str, List[dict]]:
+        """
+        Transcribes several files with one loaded model.
+
+        Parameters:
+            audio_files (list): Paths of the audio files.
+            **options: Passed to transcribe_audio (language, temperature, beam_size, best_of...).
+
+        Returns:
+            dict: Segments per audio file path (an empty list for files that failed).
+        """
+        start_time = time.time()
+        self.whisper_model  # load once up front so the first file doesn't carry the load time
+        results = {audio_file: self.transcribe_audio(audio_file, **options) for audio_file in audio_files}
+        print(f"{Fore.GREEN}Batch of {len(results)} files transcribed in {time.time() - start_time:.2f} seconds.")
+        return results
+
     # def generate_subtitles(self, audio_file):
     #     """
     #     Generates a subtitle file (.srt) based on the audio transcription.
@@ -143,18 +263,11 @@ class stt_whisper:
         subtitle_path = os.path.join(self.temp_dir, "subtitles.srt")
         segments = self.transcribe_audio(audio_file)
         
-        with open(subtitle_path, 'w') as file:
-            for i, segment in enumerate(segments):
-                start_time = segment['start']
-                end_time = segment['end']
-                text = segment['text']
-                
-                start_h, start_m, start_s = self.seconds_to_hms(start_time)
-                end_h, end_m, end_s = self.seconds_to_hms(end_time)
-                
-                file.write(f"{i + 1}\n")
-                file.write(f"{start_h}:{start_m}:{start_s},000 --> {end_h}:{end_m}:{end_s},000\n")
-                file.write(f"{text}\n\n")
+        SubtitleTrack.from_cues(
+            [segment['start'] for segment in segments],
+            [segment['end'] for segment in segments],
+            [segment['text'] for segment in segments],
+        ).write(subtitle_path)
 
         return subtitle_path
     
@@ -166,51 +279,48 @@ class stt_whisper:
         subtitle_path = os.path.join(self.temp_dir, "word_level_subtitles.srt")
         segments = self.transcribe_audio(audio_file)
 
-        with open(subtitle_path, 'w') as file:
-            subtitle_index = 1
+        starts, ends, words_out = [], [], []
 
-            # Set minimum word duration (in milliseconds)
-            min_word_duration_ms = 300  # Minimum time for a word to display
-            for segment in segments:
-                text = segment['text']
-                start_time = segment['start']
-                end_time = segment['end']
-                duration_ms = (end_time - start_time) * 1000  # Segment duration in milliseconds
-                words = re.findall(r'\S+', text)
+        # Set minimum word duration (in milliseconds)
+        min_word_duration_ms = 300  # Minimum time for a word to display
+        for segment in segments:
+            text = segment['text']
+            start_time = segment['start']
+            end_time = segment['end']
+            duration_ms = (end_time - start_time) * 1000  # Segment duration in milliseconds
+            words = re.findall(r'\S+', text)
 
-                # Calculate total character length including spaces
-                total_chars = sum(len(word) for word in words) + text.count(' ')
+            # Calculate total character length including spaces
+            total_chars = sum(len(word) for word in words) + text.count(' ')
 
-                if total_chars == 0:
-                    continue
+            if total_chars == 0:
+                continue
 
-                # Start time in milliseconds
-                current_time = start_time * 1000  
+            # Start time in milliseconds
+            current_time = start_time * 1000  
 
-                for i, word in enumerate(words):
-                    word_clean = re.sub(r'[^a-zA-ZáéíóúÁÉÍÓÚñÑüÜ0-9\s.,;:!?¿¡\'"-]', '', word)
+            for i, word in enumerate(words):
+                word_clean = re.sub(r'[^a-zA-ZáéíóúÁÉÍÓÚñÑüÜ0-9\s.,;:!?¿¡\'"-]', '', word)
 
-                    # Calculate the word duration proportional to the length of the word
-                    proportional_duration_ms = max((len(word) / total_chars) * duration_ms, min_word_duration_ms)
+                # Calculate the word duration proportional to the length of the word
+                proportional_duration_ms = max((len(word) / total_chars) * duration_ms, min_word_duration_ms)
 
-                    # Calculate start and end time for the word
-                    start_time_for_word = current_time
-                    end_time_for_word = start_time_for_word + proportional_duration_ms
+                # Calculate start and end time for the word
+                start_time_for_word = current_time
+                end_time_for_word = start_time_for_word + proportional_duration_ms
 
-                    # Write the subtitle line in SRT format
-                    file.write(f"{subtitle_index}\n")
-                    file.write(f"{self.milis_to_hms(start_time_for_word)} --> {self.milis_to_hms(end_time_for_word)}\n")
-                    file.write(f"{word_clean}\n\n")
+                starts.append(start_time_for_word / 1000)
+                ends.append(end_time_for_word / 1000)
+                words_out.append(word_clean)
 
-                    # Increment the subtitle index
-                    subtitle_index += 1
+                # Update current time for the next word
+                current_time = end_time_for_word
 
-                    # Update current time for the next word
-                    current_time = end_time_for_word
+                # Add pause duration if punctuation (increase space for better readability)
+                if i < len(words) - 1 and text[text.index(word) + len(word)] in [',', '.']:
+                    current_time += proportional_duration_ms * 0.5  # Small pause after punctuation
 
-                    # Add pause duration if punctuation (increase space for better readability)
-                    if i < len(words) - 1 and text[text.index(word) + len(word)] in [',', '.']:
-                        current_time += proportional_duration_ms * 0.5  # Small pause after punctuation
+        SubtitleTrack.from_cues(starts, ends, words_out).write(subtitle_path)
 
         print(f"{Fore.GREEN}Word-level subtitles saved to {subtitle_path}")
         return subtitle_path
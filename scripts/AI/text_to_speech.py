@@ -4,7 +4,6 @@
 and feed them to SubMaker to generate subtitles using TTSFactory"""
 
 import asyncio
-import json
 import os
 import random
 import re
@@ -16,8 +15,6 @@ from uuid import uuid4
 import uuid
 from colorama import Fore,  init
 from elevenlabs import VoiceSettings
-from elevenlabs.client import ElevenLabs
-from pydub import AudioSegment
 # from scipy.io.wavfile import write as write_wav
 try:
     from bark import generate_audio, preload_models, SAMPLE_RATE
@@ -25,6 +22,11 @@ try:
 except ImportError:
     _BARK_AVAILABLE = False
 import edge_tts
+from scripts.AI.chunked_tts import ChunkedEdgeTTS, ChunkStream, DEFAULT_CHUNK_CHARS, DEFAULT_MAX_WORKERS
+from scripts.AI.tts_cache import TTSCache, DEFAULT_TTS_CACHE_DIR
+from scripts.AI.tts_worker import get_tts_worker
+from scripts.AI.elevenlabs_pool import get_account_pool, DEFAULT_QUOTA_TTL
+from scripts.utils.audio_concat import concat_pcm_to_wav
 from scripts.utils.app_logger import trace
 
 # Initialize colorama
@@ -68,6 +70,15 @@ class TTSFactory:
         """
         return self.tts.text_to_speech_file(text, *args, **kwargs)
 
+    def text_to_speech_stream(self, text: str, *args, **kwargs):
+        """
+        Starts a chunked synthesis that can be consumed chunk by chunk (Edge only).
+        :return: A ChunkStream, or None when the provider cannot stream or the narration is cached.
+        """
+        if not hasattr(self.tts, "text_to_speech_stream"):
+            return None
+        return self.tts.text_to_speech_stream(text, *args, **kwargs)
+
     def get_voices(self, *args, **kwargs) -> dict:
         """
         Get available voices using the selected TTS provider.
@@ -80,15 +91,23 @@ class TTSFactory:
 class TTSEdge:
     _voices_cache = None
 
-    def __init__(self, api_key: str = None, output_dir="output_audio"):
+    def __init__(self, api_key: str = None, output_dir="output_audio",
+                 max_workers: int = DEFAULT_MAX_WORKERS, chunk_chars: int = DEFAULT_CHUNK_CHARS,
+                 cache_dir: Optional[str] = DEFAULT_TTS_CACHE_DIR):
         """
         Initializes the object TTSEdge with the directory where audio files will be saved.
         :param api_key: API key optional for authentication (not used in this context).
         :param output_dir: Directory where audio files will be saved.
+        :param max_workers: Concurrent edge-tts streams used for texts longer than one chunk.
+        :param chunk_chars: Maximum characters per chunk; shorter texts use a single stream.
+        :param cache_dir: Persistent cache for the voice list and synthesized audio (None disables it).
         """
         # Configure the output directory, creating it if it doesn't exist
         self.output_dir = output_dir
         os.makedirs(self.output_dir, exist_ok=True)
+        self.chunked = ChunkedEdgeTTS(output_dir, max_workers=max_workers, chunk_chars=chunk_chars)
+        self.cache = TTSCache(cache_dir) if cache_dir else None
+        self.worker = get_tts_worker()
 
     async def text_to_speech(self, text: str, voice: str = "es-ES-XimenaNeural", rate: int = 0, pitch: int = 0, srt_path: Optional[str] = None, boundary_type: str = "WordBoundary"):
         """
@@ -147,16 +166,12 @@ class TTSEdge:
         return {f"{v['ShortName']} - {v['Locale']} ({v['Gender']})": v['ShortName'] for v in voices}
 
     def _run_async(self, coro):
-        """Run an async coroutine safely, whether or not a loop is already running."""
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            return asyncio.run(coro)
-        if loop.is_running():
-            import nest_asyncio
-            nest_asyncio.apply(loop)
-            return loop.run_until_complete(coro)
-        return loop.run_until_complete(coro)
+        """Run an edge-tts coroutine on the shared TTS worker loop and wait for the result."""
+        return self.worker.run(coro)
+
+    async def text_to_speech_file_async(self, *args, **kwargs) -> str:
+        """Awaitable text_to_speech_file for callers already on an event loop."""
+        return await asyncio.to_thread(self.text_to_speech_file, *args, **kwargs)
 
     def text_to_speech_file(
         self,
@@ -169,9 +184,48 @@ class TTSEdge:
         pitch: int = 0,
         boundary_type: str = "WordBoundary",
     ) -> str:
-        if TTSEdge._voices_cache is None:
-            TTSEdge._voices_cache = self._run_async(self.get_voices())
-        voices_dict = TTSEdge._voices_cache
+        selected = self._select_voice(text, language)
+        cache_key = None
+        if self.cache is not None:
+            cache_key = TTSCache.key(text, selected, rate, pitch, boundary_type)
+            target = output_path or str(Path(self.output_dir) / f"{uuid.uuid4()}.mp3")
+            cached = self.cache.fetch(cache_key, target, srt_path)
+            if cached:
+                print(Fore.GREEN + "Reusing cached narration")
+                return cached
+        audio_file = self._synthesize(text, selected, output_path, srt_path, rate, pitch, boundary_type)
+        if cache_key is not None:
+            self.cache.store(cache_key, audio_file, srt_path)
+        return audio_file
+
+    def text_to_speech_stream(
+        self,
+        text: str,
+        language: str = 'es',
+        output_path: Optional[str] = None,
+        srt_path: Optional[str] = None,
+        rate: int = 0,
+        pitch: int = 0,
+        boundary_type: str = "WordBoundary",
+    ) -> Optional[ChunkStream]:
+        """
+        Start a chunked synthesis whose chunks can be consumed while later ones are still rendering.
+        :return: A ChunkStream, or None when the narration is already cached (text_to_speech_file
+                 then returns it without synthesizing).
+        """
+        selected = self._select_voice(text, language)
+        on_complete = None
+        if self.cache is not None:
+            cache_key = TTSCache.key(text, selected, rate, pitch, boundary_type)
+            if self.cache.contains(cache_key, with_srt=bool(srt_path)):
+                return None
+            on_complete = lambda audio, srt: self.cache.store(cache_key, audio, srt)
+        return ChunkStream(self.chunked, self.worker, text, selected, rate=rate, pitch=pitch,
+                           boundary_type=boundary_type, output_path=output_path, srt_path=srt_path,
+                           on_complete=on_complete)
+
+    def _select_voice(self, text: str, language: str) -> str:
+        voices_dict = self._load_voices()
         # Filter voices that start with the text language locale (e.g. 'es' → 'es-ES', 'es-MX', etc.)
         lang_prefix = f"{language.lower()}-"
         filtered = {}
@@ -180,9 +234,34 @@ class TTSEdge:
                 filtered[display] = short
         if not filtered:
             raise Exception(Fore.RED + f"No voices available for language '{language}'.")
-        # Always pick a random voice from the matching language pool
-        selected = random.choice(list(filtered.values()))
+        # Pick a random voice from the matching language pool, seeded by the text so a
+        # retry of the same narration gets the same voice (and hits the audio cache)
+        selected = random.Random(text).choice(sorted(filtered.values()))
         print(Fore.GREEN + f"Voice: {selected} (language: {language})")
+        return selected
+
+    def _load_voices(self) -> dict:
+        """Voice catalog from memory, then the disk cache, then the network."""
+        if TTSEdge._voices_cache is None:
+            voices = self.cache.get_voices() if self.cache is not None else None
+            if not voices:
+                voices = self._run_async(self.get_voices())
+                if self.cache is not None:
+                    self.cache.set_voices(voices)
+            TTSEdge._voices_cache = voices
+        return TTSEdge._voices_cache
+
+    def _synthesize(self, text: str, selected: str, output_path: Optional[str], srt_path: Optional[str],
+                    rate: int, pitch: int, boundary_type: str) -> str:
+        if len(text) > self.chunked.chunk_chars:
+            try:
+                audio_file, _ = self._run_async(
+                    self.chunked.synthesize(text, selected, rate=rate, pitch=pitch, srt_path=srt_path,
+                                            boundary_type=boundary_type, output_path=output_path)
+                )
+            except Exception as e:
+                raise Exception(Fore.RED + f"Error generating audio: {e}") from e
+            return audio_file
         audio_file, error = self._run_async(
             self.text_to_speech(text, selected, srt_path=srt_path, rate=rate, pitch=pitch, boundary_type=boundary_type)
         )
@@ -195,77 +274,80 @@ class TTSEdge:
         return audio_file
 
 class TTSElevenlabs:
-    def __init__(self, credentials_path, quota_min: int):
+    def __init__(self, credentials_path, quota_min: int, output_dir: str = "output_audio", quota_ttl: int = DEFAULT_QUOTA_TTL):
+        """
+        Initializes ElevenLabs TTS over the accounts in `credentials_path`.
+        :param credentials_path: JSON file with the accounts (ApiKey, Voices).
+        :param quota_min: Minimum remaining characters for an account to be used.
+        :param output_dir: Default directory for generated audio.
+        :param quota_ttl: Seconds cached quota counts are trusted before a background re-probe.
+        """
         self.credentials_path = Path(credentials_path)
         self.quota_min = quota_min
+        self.output_dir = output_dir
+        self.pool = get_account_pool(str(self.credentials_path), ttl=quota_ttl)
         self.api_key, self.model_id, self.voice_id = self.get_valid_account()
-        if self.api_key:
-            self.client = ElevenLabs(api_key=self.api_key)
-        else:
+        if not self.api_key:
             raise ValueError("No valid account found with sufficient quota.")
 
-    def text_to_speech_file(self, text: str, output_dir: str) -> str:
+    def text_to_speech_file(self, text: str, output_dir: Optional[str] = None, **kwargs) -> str:
         """
         Converts the text to speech and saves the result as an MP3 file.
         :param text: The text content to convert to speech.
         :param output_dir: The directory where the audio file will be saved.
         :return: The path of the file where the audio is saved.
         """
-        # Call to the text-to-speech API with detailed parameters
-        response = self.client.text_to_speech.convert(
-            voice_id=self.voice_id,
-            optimize_streaming_latency="0",
-            output_format="mp3_22050_32",
-            text=text,
-            model_id=self.model_id,
-            voice_settings=VoiceSettings(
-                stability=0.5,  # Reduce stability for more dynamic voice
-                similarity_boost=0.8,  # Reduce similarity for more human-like voice
-                style=0.8,  # Increase style for more emphasis
-                use_speaker_boost=True,  # Maintain speaker boost for more forceful voice
-                speed_boost=1.7  # Increase speed for faster voice
-            ),
-        )
-        # Create a unique file name for the output MP3 file
-        file_name = f"{uuid.uuid4()}.mp3"
-        # Create the full file path using pathlib
-        output_path = Path(output_dir) / file_name
-        # Write the audio stream to the file
-        with open(output_path, "wb") as f:
-            for chunk in response:
-                if chunk:
-                    f.write(chunk)
+        account = self.pool.acquire(len(text), quota_min=self.quota_min)
+        if account is None:
+            raise ValueError(f"No ElevenLabs account has quota for {len(text)} characters.")
+        voice_id = random.choice(account.voices)['ID']
+        try:
+            # Call to the text-to-speech API with detailed parameters
+            response = self.pool.client(account).text_to_speech.convert(
+                voice_id=voice_id,
+                optimize_streaming_latency="0",
+                output_format="mp3_22050_32",
+                text=text,
+                model_id=self.model_id,
+                voice_settings=VoiceSettings(
+                    stability=0.5,  # Reduce stability for more dynamic voice
+                    similarity_boost=0.8,  # Reduce similarity for more human-like voice
+                    style=0.8,  # Increase style for more emphasis
+                    use_speaker_boost=True,  # Maintain speaker boost for more forceful voice
+                    speed_boost=1.7  # Increase speed for faster voice
+                ),
+            )
+            # Create a unique file name for the output MP3 file
+            file_name = f"{uuid.uuid4()}.mp3"
+            # Create the full file path using pathlib
+            output_path = Path(output_dir or self.output_dir) / file_name
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            # Write the audio stream to the file
+            with open(output_path, "wb") as f:
+                for chunk in response:
+                    if chunk:
+                        f.write(chunk)
+        except Exception as e:
+            if "quota" in str(e).lower():
+                self.pool.mark_exhausted(account)
+            else:
+                self.pool.release(account, len(text))
+            raise
         # Print a success message with color
         print(Fore.GREEN + f"A new audio file was saved successfully at {output_path}")
         # Return the path of the saved audio file
         return str(output_path)
 
     def get_valid_account(self):
-        with open(self.credentials_path, 'r') as f:
-            accounts = json.load(f)
-        valid_accounts = []
-        for account_name, account_data in accounts.items():
-            api_key = account_data['ApiKey']
-            client = ElevenLabs(api_key=api_key)
-            try:
-                user = client.user.get()
-                subscription = user.subscription
-                remaining_characters = subscription.character_limit - subscription.character_count
-                if remaining_characters >= self.quota_min:
-                    print(Fore.GREEN + f"Cuenta {account_name} tiene {remaining_characters} caracteres restantes.")
-                    valid_accounts.append((api_key, account_data))
-                else:
-                    print(Fore.YELLOW + f"Cuenta {account_name} no tiene suficiente cuota ({remaining_characters} caracteres).")
-            except Exception as e:
-                print(Fore.RED + f"Error al verificar la cuenta {account_name}: {str(e)}")
-        if not valid_accounts:
+        """Pick an account with at least quota_min characters left (cached quota, weighted by remaining)."""
+        account = self.pool.acquire(quota_min=self.quota_min)
+        if account is None:
+            for name, state in self.pool.summary().items():
+                print(Fore.YELLOW + f"Cuenta {name} no disponible (restantes: {state['remaining']}, error: {state['error']}).")
             return None, None, None
-        # Select a random valid account
-        selected_api_key, selected_account = random.choice(valid_accounts)
-        # Select a random voice from the selected account
-        selected_voice = random.choice(selected_account['Voices'])
-        print(Fore.GREEN + f"Usando cuenta con API Key: {'***' + selected_api_key[-4:]} y voz ID: {selected_voice['ID']}")
-        return selected_api_key, "eleven_multilingual_v2", selected_voice['ID']
+        selected_voice = random.choice(account.voices)
+        print(Fore.GREEN + f"Usando cuenta {account.name} ({account.remaining} caracteres restantes) y voz ID: {selected_voice['ID']}")
+        return account.api_key, "eleven_multilingual_v2", selected_voice['ID']
 
 class TTSBark:
     def __init__(self, output_dir="output_audio", optimize_for_low_vram=False):
@@ -308,16 +390,14 @@ class TTSBark:
             segments.append(current_segment.strip())
         return segments
 
-    def _combine_audio_segments(self, audio_segments: list) -> AudioSegment:
+    def _combine_audio_segments(self, audio_segments: list, output_path: str) -> str:
         """
-        Combines multiple AudioSegment objects into one.
-        :param audio_segments: List of AudioSegment objects.
-        :return: Combined AudioSegment object.
+        Writes the Bark PCM arrays back to back as one WAV file.
+        :param audio_segments: List of float PCM arrays at Bark's SAMPLE_RATE.
+        :param output_path: Path of the WAV file to write.
+        :return: The output path.
         """
-        combined = AudioSegment.empty()
-        for segment in audio_segments:
-            combined += segment
-        return combined
+        return concat_pcm_to_wav(audio_segments, SAMPLE_RATE, output_path)
 
     def text_to_speech_file(self, text: str, language: str = 'es', voice: str = 'v2/es_speaker_3') -> str:
         """
@@ -336,20 +416,11 @@ class TTSBark:
             print(Fore.CYAN + f"Text split into {len(segments)} segments.")
             audio_segments = []
             for i, segment in enumerate(segments):
-                audio_array = generate_audio(segment, history_prompt=voice)
-                # Convert the audio array to an AudioSegment object without writing to disk.
-                audio_segment = AudioSegment(
-                    data=audio_array.tobytes(),
-                    sample_width=audio_array.dtype.itemsize,
-                    frame_rate=SAMPLE_RATE,
-                    channels=1
-                )
-                audio_segments.append(audio_segment)
+                audio_segments.append(generate_audio(segment, history_prompt=voice))
                 print(Fore.GREEN + f"Generated audio for segment {i+1}/{len(segments)}.")
-            combined_audio = self._combine_audio_segments(audio_segments)
             output_file_name = f"{uuid4()}.wav"
             output_path = Path(self.output_dir) / output_file_name
-            combined_audio.export(output_path, format="wav")
+            self._combine_audio_segments(audio_segments, str(output_path))
             print(Fore.GREEN + f"A new combined audio file was saved successfully at {output_path}")
             return str(output_path)
         except Exception as e:
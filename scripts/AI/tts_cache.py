@@ -0,0 +1,152 @@
+"""
+Persistent cache for Edge TTS.
+
+Two things are worth keeping between processes:
+
+* the voice catalog returned by ``edge_tts.list_voices()`` (a network round trip
+  before the first synthesis of every fresh process), stored with a TTL;
+* synthesized narrations, stored as MP3 + SRT pairs keyed by a hash of the text,
+  voice, rate, pitch and boundary type, so a retry after a failed render or
+  upload skips synthesis entirely.
+
+The cache lives outside the processor's temp_dir, which is wiped at the start of
+every run.
+"""
+import hashlib
+import os
+import shutil
+import threading
+import time
+import uuid
+import logging
+from pathlib import Path
+from typing import Dict, Optional
+
+from scripts.utils.file_cache import FileCache
+
+DEFAULT_TTS_CACHE_DIR = ".cache/tts"
+DEFAULT_VOICES_TTL = 7 * 86400
+DEFAULT_AUDIO_TTL = 7 * 86400
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+
+_VOICES_KEY = "edge_tts_voices"
+
+
+class TTSCache:
+    """
+    Disk cache for the voice catalog and synthesized audio/subtitle pairs.
+
+    Args:
+        cache_dir: Root directory of the cache.
+        voices_ttl: Seconds the voice catalog stays valid.
+        audio_ttl: Seconds a synthesized narration stays valid.
+        max_bytes: Size limit of the audio store; oldest entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_TTS_CACHE_DIR,
+        voices_ttl: int = DEFAULT_VOICES_TTL,
+        audio_ttl: int = DEFAULT_AUDIO_TTL,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.root = Path(cache_dir)
+        self.audio_dir = self.root / "audio"
+        self.audio_dir.mkdir(parents=True, exist_ok=True)
+        self.audio_ttl = audio_ttl
+        self.max_bytes = max_bytes
+        self._voices = FileCache(cache_dir=str(self.root / "voices"), ttl=voices_ttl)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(text: str, voice: str, rate: int = 0, pitch: int = 0, boundary_type: str = "WordBoundary") -> str:
+        payload = "\x1f".join((voice, f"{rate:+d}", f"{pitch:+d}", boundary_type, text.strip()))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get_voices(self) -> Optional[Dict[str, str]]:
+        return self._voices.get(_VOICES_KEY)
+
+    def set_voices(self, voices: Dict[str, str]) -> None:
+        self._voices.set(_VOICES_KEY, voices)
+
+    def _paths(self, key: str):
+        return self.audio_dir / f"{key}.mp3", self.audio_dir / f"{key}.srt"
+
+    def _fresh(self, path: Path) -> bool:
+        try:
+            return time.time() - path.stat().st_mtime <= self.audio_ttl
+        except OSError:
+            return False
+
+    def contains(self, key: str, with_srt: bool = False) -> bool:
+        audio, srt = self._paths(key)
+        return self._fresh(audio) and (not with_srt or srt.exists())
+
+    def fetch(self, key: str, output_path: str, srt_path: Optional[str] = None) -> Optional[str]:
+        """
+        Copy a cached narration to `output_path` (and its SRT to `srt_path`).
+
+        Returns the output path on a hit, None on a miss. An entry without SRT
+        is a miss when subtitles are requested.
+        """
+        if not self.contains(key, with_srt=bool(srt_path)):
+            return None
+        audio, srt = self._paths(key)
+        try:
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            shutil.copyfile(audio, output_path)
+            if srt_path:
+                os.makedirs(os.path.dirname(srt_path) or ".", exist_ok=True)
+                shutil.copyfile(srt, srt_path)
+        except OSError as e:
+            self.logger.warning(f"TTS cache read failed for {key[:12]}: {e}")
+            return None
+        self.logger.info(f"TTS cache hit {key[:12]} -> {output_path}")
+        return output_path
+
+    def store(self, key: str, audio_path: str, srt_path: Optional[str] = None) -> None:
+        """Copy a fresh synthesis into the cache (atomic per file)."""
+        audio, srt = self._paths(key)
+        try:
+            if srt_path and os.path.isfile(srt_path):
+                self._copy_atomic(srt_path, srt)
+            self._copy_atomic(audio_path, audio)
+        except OSError as e:
+            self.logger.warning(f"TTS cache write failed for {key[:12]}: {e}")
+            return
+        self._evict()
+
+    @staticmethod
+    def _copy_atomic(src: str, dst: Path) -> None:
+        tmp = dst.with_name(f"{dst.name}.{uuid.uuid4().hex[:8]}.tmp")
+        try:
+            shutil.copyfile(src, tmp)
+            tmp.replace(dst)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        """Drop expired entries, then the oldest ones until under max_bytes."""
+        with self._lock:
+            entries = []
+            for path in self.audio_dir.glob("*.mp3"):
+                try:
+                    entries.append((path.stat().st_mtime, path.stat().st_size, path))
+                except OSError:
+                    continue
+            entries.sort()
+            total = sum(size for _, size, _ in entries)
+            now = time.time()
+            for mtime, size, path in entries:
+                if now - mtime <= self.audio_ttl and total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                path.with_suffix(".srt").unlink(missing_ok=True)
+                total -= size
+
+    def clear(self) -> None:
+        with self._lock:
+            shutil.rmtree(self.audio_dir, ignore_errors=True)
+            self.audio_dir.mkdir(parents=True, exist_ok=True)
+        self._voices.clear()
@@ -0,0 +1,101 @@
+"""
+Dedicated event loop for edge-tts.
+
+edge-tts is asyncio-only, while its callers are a mix of plain threads (the
+video processors run in ``asyncio.to_thread`` workers) and coroutines on the
+bot's loop. Rather than creating a loop per call or re-entering a running loop
+with nest_asyncio, every synthesis is scheduled on one long-lived loop running
+on its own daemon thread. Many syntheses share that loop concurrently, and the
+caller's loop is never blocked or re-entered.
+
+    worker = get_tts_worker()
+    path = worker.run(engine.synthesize(...))          # from sync code
+    path = await worker.run_async(engine.synthesize(...))  # from any event loop
+"""
+import asyncio
+import threading
+import logging
+from concurrent.futures import Future
+from typing import Any, Awaitable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncWorker:
+    """An event loop on a background thread accepting coroutines from any thread."""
+
+    def __init__(self, name: str = "tts-worker"):
+        self.name = name
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+
+    def _run_loop(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        self._loop = loop
+        self._ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            pending = asyncio.all_tasks(loop)
+            for task in pending:
+                task.cancel()
+            if pending:
+                loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+            loop.close()
+
+    def start(self) -> "AsyncWorker":
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._ready.clear()
+                self._thread = threading.Thread(target=self._run_loop, name=self.name, daemon=True)
+                self._thread.start()
+                self._ready.wait()
+                logger.debug("Started %s event loop thread", self.name)
+        return self
+
+    def submit(self, coro: Awaitable) -> Future:
+        """Schedule `coro` on the worker loop; returns a concurrent.futures.Future."""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Block the calling thread until `coro` finishes on the worker loop."""
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError(f"{self.name}.run() called from its own loop; await the coroutine instead")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    async def run_async(self, coro: Awaitable) -> Any:
+        """Await `coro` on the worker loop from another event loop without blocking it."""
+        if threading.current_thread() is self._thread:
+            return await coro
+        return await asyncio.wrap_future(self.submit(coro))
+
+    def stop(self, timeout: Optional[float] = 5.0) -> None:
+        with self._lock:
+            if self._loop is not None and self._thread is not None and self._thread.is_alive():
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join(timeout)
+            self._thread = None
+            self._loop = None
+
+
+_worker: Optional[AsyncWorker] = None
+_worker_lock = threading.Lock()
+
+
+def get_tts_worker() -> AsyncWorker:
+    """Process-wide TTS worker, started on first use."""
+    global _worker
+    with _worker_lock:
+        if _worker is None:
+            _worker = AsyncWorker()
+        return _worker.start()
@@ -0,0 +1,244 @@
+"""
+Article fetch/extract service.
+
+Scoring, the aggregator and the article pipeline all need the same pages.
+They now go through one ``ArticleService``:
+
+- one download per URL at a time: concurrent requests for the same
+  (normalized) URL wait on the same in-flight fetch;
+- downloads go through the shared HTTP client (pooling, retries, metrics);
+- the raw HTML and the extracted article are kept gzip-compressed on disk
+  for ``ttl`` seconds. A text hit skips both download and parsing, and an
+  HTML hit skips the download.
+
+Callers bring their own concurrency (the ingestion pool calls ``fetch`` per
+article as items arrive).
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import logging
+from concurrent.futures import Future
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from colorama import Fore
+
+from scripts.dbControllers.article_score_store import normalize_url
+from scripts.utils.http_client import get_http_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ARTICLE_CACHE_DIR = ".cache/articles"
+DEFAULT_ARTICLE_TTL = 24 * 3600
+DEFAULT_ARTICLE_TIMEOUT = 10
+PRUNE_INTERVAL = 3600
+# Many publishers reject library user agents
+DEFAULT_USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                      "(KHTML, like Gecko) Chrome/124.0 Safari/537.36")
+
+
+@dataclass
+class ArticleContent:
+    url: str
+    title: str = ""
+    text: str = ""
+    summary: str = ""
+    authors: List[str] = field(default_factory=list)
+    images: List[str] = field(default_factory=list)
+    top_image: str = ""
+    publish_date: Optional[str] = None
+
+    @property
+    def published(self) -> Optional[datetime]:
+        if not self.publish_date:
+            return None
+        try:
+            return datetime.fromisoformat(self.publish_date)
+        except ValueError:
+            return None
+
+
+class ArticleService:
+    """
+    Downloads and extracts articles once, with a compressed on-disk cache.
+
+    Args:
+        cache_dir: Directory for the cache (html/ and text/ subdirectories); None disables it.
+        ttl: Seconds a cached page or extraction stays valid.
+        timeout: Download timeout in seconds.
+        user_agent: Called for the User-Agent header of each download (a fixed browser UA otherwise).
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = DEFAULT_ARTICLE_CACHE_DIR,
+        ttl: float = DEFAULT_ARTICLE_TTL,
+        timeout: float = DEFAULT_ARTICLE_TIMEOUT,
+        user_agent: Optional[Callable[[], str]] = None,
+    ):
+        self.root = Path(cache_dir) if cache_dir else None
+        if self.root:
+            (self.root / "html").mkdir(parents=True, exist_ok=True)
+            (self.root / "text").mkdir(parents=True, exist_ok=True)
+        self.ttl = ttl
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._last_prune = 0.0
+
+    # -- public API ------------------------------------------------------------
+
+    def fetch(self, url: str) -> Optional[ArticleContent]:
+        """Extracted article for `url`, or None when no text could be extracted."""
+        key = self._key(url)
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if not owner:
+            return future.result()
+        try:
+            content = self._fetch_uncached(url, key)
+            future.set_result(content)
+            return content
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            self._maybe_prune()
+
+    def fetch_html(self, url: str) -> Optional[str]:
+        key = self._key(url)
+        return self._read(self._path("html", key)) or self._download(url, key)
+
+    # -- internals ---------------------------------------------------------------
+
+    def _fetch_uncached(self, url: str, key: str) -> Optional[ArticleContent]:
+        cached = self._read(self._path("text", key))
+        if cached is not None:
+            return ArticleContent(**{**json.loads(cached), 'url': url})
+
+        html = self._read(self._path("html", key)) or self._download(url, key)
+        if not html:
+            return None
+        content = self._extract(url, html)
+        if content is None or not content.text:
+            print(Fore.YELLOW + f"Could not extract text from {url}")
+            return None
+        self._write(self._path("text", key), json.dumps(asdict(content), ensure_ascii=False))
+        return content
+
+    def _download(self, url: str, key: str) -> Optional[str]:
+        headers = {'User-Agent': self.user_agent() if self.user_agent else DEFAULT_USER_AGENT}
+        response = get_http_client().get(url, headers=headers, timeout=self.timeout)
+        response.raise_for_status()
+        html = response.text
+        if html:
+            self._write(self._path("html", key), html)
+        return html
+
+    @staticmethod
+    def _extract(url: str, html: str) -> Optional[ArticleContent]:
+        from newspaper import Article
+
+        article = Article(url)
+        article.download(input_html=html)
+        article.parse()
+        published = article.publish_date
+        return ArticleContent(
+            url=url,
+            title=article.title or "",
+            text=article.text or "",
+            summary=article.summary or "",
+            authors=list(article.authors),
+            images=sorted(article.images),
+            top_image=article.top_image or "",
+            publish_date=published.isoformat() if isinstance(published, datetime) else None,
+        )
+
+    # -- disk cache --------------------------------------------------------------
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(normalize_url(url).encode('utf-8')).hexdigest()[:32]
+
+    def _path(self, kind: str, key: str) -> Optional[Path]:
+        return self.root / kind / f"{key}.gz" if self.root else None
+
+    def _read(self, path: Optional[Path]) -> Optional[str]:
+        if path is None:
+            return None
+        try:
+            if time.time() - path.stat().st_mtime > self.ttl:
+                path.unlink(missing_ok=True)
+                return None
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, UnicodeDecodeError):
+            path.unlink(missing_ok=True)
+            return None
+
+    @staticmethod
+    def _write(path: Optional[Path], data: str) -> None:
+        if path is None:
+            return
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        try:
+            with gzip.open(tmp, 'wt', encoding='utf-8', compresslevel=6) as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            tmp.unlink(missing_ok=True)
+
+    def _maybe_prune(self) -> None:
+        now = time.time()
+        with self._lock:
+            if now - self._last_prune < PRUNE_INTERVAL:
+                return
+            self._last_prune = now
+        self.prune()
+
+    def prune(self) -> int:
+        """Deletes expired cache files; returns how many."""
+        if not self.root:
+            return 0
+        cutoff = time.time() - self.ttl
+        removed = 0
+        for path in list(self.root.glob("*/*.gz")):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except OSError:
+                continue
+        return removed
+
+    def clear(self) -> None:
+        if self.root:
+            for path in self.root.glob("*/*.gz"):
+                path.unlink(missing_ok=True)
+
+
+_default: Optional[ArticleService] = None
+_default_lock = threading.Lock()
+
+
+def get_article_service() -> ArticleService:
+    """Process-wide ArticleService with the default cache location."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = ArticleService()
+        return _default
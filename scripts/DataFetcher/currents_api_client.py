@@ -3,6 +3,7 @@ from colorama import Fore, init
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from .interfaces import NewsProvider
+from scripts.utils.http_client import get_http_client
 
 # Inicializar Colorama
 init(autoreset=True)
@@ -15,6 +16,7 @@ class CurrentsAPIProvider(NewsProvider):
         self.latest_news_url = "https://api.currentsapi.services/v1/latest-news"
         self.search_url = "https://api.currentsapi.services/v1/search"
         self.languages = ['es', 'en', 'fr', 'ru']  # Idiomas soportados por defecto
+        self.http = get_http_client().for_api('currents')
     
     def get_latest_news(self, 
                        category: Optional[str] = None,
@@ -38,7 +40,7 @@ class CurrentsAPIProvider(NewsProvider):
                 if category:
                     params['category'] = category
                 
-                response = requests.get(
+                response = self.http.get(
                     self.latest_news_url,
                     headers=headers,
                     params=params,
@@ -82,7 +84,7 @@ class CurrentsAPIProvider(NewsProvider):
                 params['end_date'] = end_date.strftime('%Y-%m-%d')
             
             print(Fore.CYAN + f"Searching news in Currents API: {query}")
-            response = requests.get(
+            response = self.http.get(
                 self.search_url,
                 headers=headers,
                 params=params,
@@ -0,0 +1,210 @@
+"""
+Concurrent news ingestion.
+
+RSS feeds are fetched on one pooled keep-alive ``httpx.AsyncClient`` with a
+per-host connection limit, so many feeds from the same publisher don't hammer
+it while feeds from different hosts proceed in parallel. Blocking API clients
+(SerpAPI, CurrentsAPI) run on worker threads alongside them, one task per
+language.
+
+With a ``FeedStateStore`` feed requests are conditional (ETag/Last-Modified);
+a 304 or a body whose hash hasn't changed reuses the stored items without
+parsing. ``last_stats`` reports what that saved in the latest cycle.
+
+``FeedIngestor.stream`` yields one ``SourceResult`` per source as soon as it
+completes, so callers can start scoring while slower feeds are still in flight.
+"""
+import asyncio
+import queue
+import threading
+import time
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from .feed_state import FeedCycleStats, FeedState, FeedStateStore, content_hash
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FEED_TIMEOUT = 10
+DEFAULT_PER_HOST = 2
+DEFAULT_MAX_CONNECTIONS = 20
+
+_DONE = object()
+
+
+@dataclass
+class SourceResult:
+    source: str
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+    elapsed: float = 0.0
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class FeedIngestor:
+    """
+    Fetches feeds and API sources concurrently.
+
+    Args:
+        timeout: Per-request timeout in seconds.
+        per_host: Concurrent requests allowed to one host.
+        max_connections: Size of the shared connection pool.
+        user_agent: Called for the User-Agent header of feeds without stored state.
+        state_store: Conditional-GET state; None fetches every feed in full.
+    """
+
+    def __init__(
+        self,
+        timeout: float = DEFAULT_FEED_TIMEOUT,
+        per_host: int = DEFAULT_PER_HOST,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        user_agent: Optional[Callable[[], str]] = None,
+        state_store: Optional[FeedStateStore] = None,
+    ):
+        self.timeout = timeout
+        self.per_host = max(1, per_host)
+        self.max_connections = max(1, max_connections)
+        self.user_agent = user_agent
+        self.state_store = state_store
+        self.last_stats = FeedCycleStats()
+        self._host_slots: Dict[str, asyncio.Semaphore] = {}
+
+    def _slot(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).netloc.lower()
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.per_host)
+        return slot
+
+    async def fetch(self, client: httpx.AsyncClient, url: str, headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """GET `url` within its host's slot; a 304 is returned, other non-2xx raise."""
+        async with self._slot(url):
+            response = await client.get(url, headers=headers or {})
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+
+    async def _feed(self, client, url: str, parse, select, emit) -> None:
+        start = time.perf_counter()
+        try:
+            items, cached = await self._feed_items(client, url, parse)
+            emit(SourceResult(url, select(items) if select else items,
+                              elapsed=time.perf_counter() - start, cached=cached))
+        except Exception as e:
+            emit(SourceResult(url, error=str(e) or type(e).__name__, elapsed=time.perf_counter() - start))
+
+    async def _feed_items(self, client, url: str, parse) -> Tuple[List[Dict[str, Any]], bool]:
+        stats = self.last_stats
+        state = self.state_store.get(url) if self.state_store else None
+        user_agent = (state.user_agent if state else None) or (self.user_agent() if self.user_agent else None)
+        headers = {'User-Agent': user_agent} if user_agent else {}
+        if state:
+            # Same client identity as the stored validators, or some servers ignore them
+            headers.update(state.conditional_headers())
+
+        response = await self.fetch(client, url, headers)
+        if response.status_code == 304 and state:
+            stats.not_modified += 1
+            stats.bytes_saved += state.size
+            self.state_store.touch(url)
+            return state.items, True
+
+        content = response.content
+        stats.fetched += 1
+        stats.bytes_downloaded += len(content)
+        digest = content_hash(content)
+        if state and digest == state.content_hash:
+            stats.unchanged += 1
+            state.etag = response.headers.get('ETag') or state.etag
+            state.last_modified = response.headers.get('Last-Modified') or state.last_modified
+            self.state_store.update(url, state)
+            return state.items, True
+
+        items = await asyncio.to_thread(parse, content) if content else []
+        if self.state_store:
+            self.state_store.update(url, FeedState(
+                etag=response.headers.get('ETag'),
+                last_modified=response.headers.get('Last-Modified'),
+                content_hash=digest,
+                size=len(content),
+                user_agent=user_agent,
+                items=items,
+            ))
+        return items, False
+
+    @staticmethod
+    async def _blocking(name: str, fn: Callable[[], List[Dict[str, Any]]], emit) -> None:
+        start = time.perf_counter()
+        try:
+            items = await asyncio.to_thread(fn)
+            emit(SourceResult(name, items or [], elapsed=time.perf_counter() - start))
+        except Exception as e:
+            emit(SourceResult(name, error=str(e) or type(e).__name__, elapsed=time.perf_counter() - start))
+
+    async def run(
+        self,
+        feed_urls: Sequence[str],
+        parse: Callable[[bytes], List[Dict[str, Any]]],
+        emit: Callable[[SourceResult], None],
+        blocking_sources: Optional[Dict[str, Callable[[], List[Dict[str, Any]]]]] = None,
+        select: Optional[Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]] = None,
+    ) -> None:
+        """
+        Fetch everything concurrently, calling `emit` once per source as it completes.
+
+        `parse` turns a feed body into JSON-serializable items (they are stored
+        for conditional reuse); `select` filters them on every cycle, cached or not.
+        """
+        self._host_slots = {}
+        self.last_stats = FeedCycleStats()
+        limits = httpx.Limits(max_connections=self.max_connections,
+                              max_keepalive_connections=self.max_connections)
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits, follow_redirects=True) as client:
+            tasks = [self._feed(client, url, parse, select, emit) for url in dict.fromkeys(feed_urls)]
+            tasks.extend(self._blocking(name, fn, emit) for name, fn in (blocking_sources or {}).items())
+            try:
+                await asyncio.gather(*tasks)
+            finally:
+                if self.state_store:
+                    self.state_store.save()
+
+    def stream(
+        self,
+        feed_urls: Sequence[str],
+        parse: Callable[[bytes], List[Dict[str, Any]]],
+        blocking_sources: Optional[Dict[str, Callable[[], List[Dict[str, Any]]]]] = None,
+        select: Optional[Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]] = None,
+    ) -> Iterator[SourceResult]:
+        """
+        Synchronous view of `run`: the event loop runs on its own thread and
+        results are yielded in completion order.
+        """
+        results: "queue.Queue" = queue.Queue()
+        failure: List[BaseException] = []
+
+        def runner():
+            try:
+                asyncio.run(self.run(feed_urls, parse, results.put, blocking_sources, select))
+            except BaseException as e:
+                failure.append(e)
+            finally:
+                results.put(_DONE)
+
+        thread = threading.Thread(target=runner, name="feed-ingestion", daemon=True)
+        thread.start()
+        while True:
+            result = results.get()
+            if result is _DONE:
+                break
+            yield result
+        thread.join()
+        if failure:
+            raise failure[0]
@@ -0,0 +1,122 @@
+"""
+Persistent per-feed validators for conditional GETs.
+
+For every feed URL we keep the ETag and Last-Modified returned by the server,
+a hash of the last body, its size, the User-Agent that fetched it and the
+parsed items. A 304 (or an identical body from a server that ignores the
+validators) reuses the stored items, so the feed is neither downloaded again
+nor re-parsed.
+
+The store lives under ``.cache/feeds``, outside the processor's temp_dir.
+"""
+import hashlib
+import json
+import threading
+import time
+import logging
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FEED_STATE_PATH = ".cache/feeds/state.json"
+DEFAULT_FEED_STATE_TTL = 7 * 86400  # feeds unseen for a week are dropped
+
+
+@dataclass
+class FeedState:
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    content_hash: Optional[str] = None
+    size: int = 0
+    user_agent: Optional[str] = None
+    items: List[Dict[str, Any]] = field(default_factory=list)
+    checked_at: float = 0.0
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+def content_hash(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+@dataclass
+class FeedCycleStats:
+    fetched: int = 0
+    not_modified: int = 0
+    unchanged: int = 0
+    bytes_downloaded: int = 0
+    bytes_saved: int = 0
+
+    def summary(self) -> str:
+        return (f"{self.fetched} feeds fetched, {self.not_modified} not modified (304), "
+                f"{self.unchanged} unchanged bodies, {self.bytes_downloaded / 1024:.0f} KiB downloaded, "
+                f"{self.bytes_saved / 1024:.0f} KiB saved")
+
+
+class FeedStateStore:
+    """
+    JSON-backed map of feed URL -> FeedState.
+
+    Args:
+        path: Where the state is persisted (None keeps it in memory only).
+        ttl: Seconds after which an unseen feed's state is discarded on save.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_FEED_STATE_PATH, ttl: int = DEFAULT_FEED_STATE_TTL):
+        self.path = Path(path) if path else None
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._states: Dict[str, FeedState] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            saved = json.loads(self.path.read_text(encoding='utf-8'))
+            self._states = {url: FeedState(**entry) for url, entry in saved.items()}
+        except (json.JSONDecodeError, OSError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable feed state {self.path}: {e}")
+            self._states = {}
+
+    def save(self) -> None:
+        if self.path is None:
+            return
+        now = time.time()
+        with self._lock:
+            data = {url: asdict(state) for url, state in self._states.items() if now - state.checked_at <= self.ttl}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix('.tmp')
+            tmp.write_text(json.dumps(data, ensure_ascii=False), encoding='utf-8')
+            tmp.replace(self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist feed state: {e}")
+
+    def get(self, url: str) -> Optional[FeedState]:
+        with self._lock:
+            return self._states.get(url)
+
+    def touch(self, url: str) -> None:
+        with self._lock:
+            state = self._states.get(url)
+            if state:
+                state.checked_at = time.time()
+
+    def update(self, url: str, state: FeedState) -> None:
+        state.checked_at = time.time()
+        with self._lock:
+            self._states[url] = state
+
+    def clear(self) -> None:
+        with self._lock:
+            self._states = {}
+        self.save()
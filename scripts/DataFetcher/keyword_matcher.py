@@ -0,0 +1,174 @@
+"""
+Keyword matching without an NLP pipeline.
+
+Counting keywords used to run the full spaCy pipeline (tagger, parser, NER)
+over every article just to lowercase tokens, then test each token against a
+Python list (O(tokens x keywords)). ``KeywordMatcher`` compiles the keyword
+list once into a frozenset for single words plus a first-token index for
+multi-word phrases, and scans the text with one regex tokenizer pass.
+Phrases such as "inteligencia artificial" now match too; they never did
+token by token.
+
+Run this module to benchmark it against the spaCy approach on a corpus of
+scraped articles (a directory of .txt files or a JSON list of articles).
+"""
+import re
+import time
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+(?:[-'’]\w+)*", re.UNICODE)
+
+
+def tokenize(text: str) -> Iterator[Tuple[str, int, int]]:
+    """Lowercased word tokens with their character offsets."""
+    for match in _TOKEN_RE.finditer(text):
+        yield match.group().lower(), match.start(), match.end()
+
+
+@dataclass
+class KeywordMatches:
+    total: int = 0
+    counts: Counter = field(default_factory=Counter)
+    positions: Dict[str, List[Tuple[int, int]]] = field(default_factory=dict)
+
+
+class KeywordMatcher:
+    """
+    Matches a fixed keyword list in free text.
+
+    Multi-word keywords are matched on whole tokens, longest phrase first, and
+    the tokens they cover are not counted again as single words.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords: List[str] = []
+        single = set()
+        phrases: Dict[str, List[Tuple[str, ...]]] = {}
+        for keyword in keywords:
+            tokens = tuple(token for token, _, _ in tokenize(keyword))
+            if not tokens:
+                continue
+            self.keywords.append(" ".join(tokens))
+            if len(tokens) == 1:
+                single.add(tokens[0])
+            else:
+                phrases.setdefault(tokens[0], []).append(tokens)
+        self._single = frozenset(single)
+        self._phrases = {first: sorted(set(options), key=len, reverse=True) for first, options in phrases.items()}
+
+    def __len__(self) -> int:
+        return len(self.keywords)
+
+    def finditer(self, text: str) -> Iterator[Tuple[str, int, int]]:
+        """Yields (keyword, start, end) for every match, in text order."""
+        if not self._phrases:
+            for token, start, end in tokenize(text):
+                if token in self._single:
+                    yield token, start, end
+            return
+        tokens = list(tokenize(text))
+        words = [token for token, _, _ in tokens]
+        i, n = 0, len(tokens)
+        while i < n:
+            word = words[i]
+            for phrase in self._phrases.get(word, ()):
+                if tuple(words[i:i + len(phrase)]) == phrase:
+                    yield " ".join(phrase), tokens[i][1], tokens[i + len(phrase) - 1][2]
+                    i += len(phrase)
+                    break
+            else:
+                if word in self._single:
+                    yield word, tokens[i][1], tokens[i][2]
+                i += 1
+
+    def count(self, text: str) -> int:
+        return sum(1 for _ in self.finditer(text))
+
+    def match(self, text: str) -> KeywordMatches:
+        result = KeywordMatches()
+        for keyword, start, end in self.finditer(text):
+            result.total += 1
+            result.counts[keyword] += 1
+            result.positions.setdefault(keyword, []).append((start, end))
+        return result
+
+
+@lru_cache(maxsize=16)
+def _compiled(keywords: Tuple[str, ...]) -> KeywordMatcher:
+    return KeywordMatcher(keywords)
+
+
+def compile_keywords(keywords: Iterable[str]) -> KeywordMatcher:
+    """Shared matcher for a keyword list, compiled once per process."""
+    return _compiled(tuple(keywords))
+
+
+# -- Benchmark -------------------------------------------------------------
+
+def load_corpus(path: str) -> List[str]:
+    """Article texts from a directory of .txt files or a JSON list (strings or dicts with 'text')."""
+    import json
+    from pathlib import Path
+
+    source = Path(path)
+    if source.is_dir():
+        return [p.read_text(encoding='utf-8', errors='ignore') for p in sorted(source.glob('*.txt'))]
+    data = json.loads(source.read_text(encoding='utf-8'))
+    return [item if isinstance(item, str) else item.get('text') or item.get('summary') or '' for item in data]
+
+
+def _synthetic_corpus(n_articles: int = 200, words: int = 800) -> List[str]:
+    import random
+    rng = random.Random(0)
+    vocabulary = ("el la de que y en un una los las por con para se del al es inteligencia artificial "
+                  "gobierno mercado tecnología empresa datos red modelo crisis elecciones España "
+                  "millones usuarios nuevo ataque seguridad clima energía precio").split()
+    return [" ".join(rng.choice(vocabulary) for _ in range(words)) + "." for _ in range(n_articles)]
+
+
+def benchmark(texts: Sequence[str], keywords: Sequence[str], model_name: str = "es_core_news_sm") -> dict:
+    """Time the spaCy full-pipeline count against KeywordMatcher on `texts`."""
+    results = {"articles": len(texts), "characters": sum(len(t) for t in texts), "keywords": len(keywords)}
+
+    start = time.perf_counter()
+    matcher = KeywordMatcher(keywords)
+    fast_counts = [matcher.count(t) for t in texts]
+    results["matcher_s"] = round(time.perf_counter() - start, 4)
+
+    try:
+        import spacy
+        nlp = spacy.load(model_name)
+    except (ImportError, OSError) as e:
+        logger.warning(f"spaCy baseline skipped: {e}")
+        return results
+    keyword_list = list(keywords)
+    start = time.perf_counter()
+    spacy_counts = [sum(1 for token in nlp(t) if token.text.lower() in keyword_list) for t in texts]
+    results["spacy_full_s"] = round(time.perf_counter() - start, 4)
+    results["speedup"] = round(results["spacy_full_s"] / max(results["matcher_s"], 1e-9), 1)
+    results["count_agreement"] = round(
+        sum(a == b for a, b in zip(fast_counts, spacy_counts)) / max(len(texts), 1), 3
+    )
+    return results
+
+
+if __name__ == '__main__':
+    import json
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    # python -m scripts.DataFetcher.keyword_matcher [corpus_dir_or_json] [config.json]
+    corpus = load_corpus(sys.argv[1]) if len(sys.argv) > 1 else _synthetic_corpus()
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], encoding='utf-8') as f:
+            keyword_list = json.load(f)['keywords']['es']
+    else:
+        keyword_list = ["inteligencia artificial", "gobierno", "crisis", "elecciones", "ataque", "seguridad",
+                        "energía", "precio", "usuarios", "datos"]
+    print(json.dumps(benchmark(corpus, keyword_list), indent=2))
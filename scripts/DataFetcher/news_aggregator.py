@@ -1,30 +1,23 @@
 from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 import logging
-from colorama import Fore, init
+from colorama import init
 from concurrent.futures import ThreadPoolExecutor
 from newspaper import Article
 from textblob import TextBlob
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-import spacy
 import textstat
 
 from .interfaces import NewsProvider
+from .keyword_matcher import compile_keywords
 from .news_extractor import NewsExtractor, ArticleData
+from .story_clustering import clusterer_from_config
+from .virality_scoring import with_cluster_signal
 from scripts.utils.app_logger import trace
 
 # Initialize colorama
 init(autoreset=True)
 
-# Load spaCy model
-try:
-    nlp = spacy.load("es_core_news_sm")
-except OSError:
-    print(Fore.RED + "Modelo es_core_news_sm not found. Downloading...")
-    import spacy.cli
-    spacy.cli.download("es_core_news_sm")
-    nlp = spacy.load("es_core_news_sm")
-
 class NewsAggregator:
     """Clase que maneja la agregación y scoring de noticias de múltiples fuentes"""
     
@@ -38,6 +31,7 @@ class NewsAggregator:
         self.logger = logger or logging.getLogger(__name__)
         self.extractor = NewsExtractor()
         self.vader_analyzer = SentimentIntensityAnalyzer()
+        self.keyword_matcher = compile_keywords(config['keywords']['es'])
         
     @trace()
     def get_viral_news(self,
@@ -75,18 +69,27 @@ class NewsAggregator:
             if self._is_recent(news.get('publishedAt'))
         ]
         
+        # Agrupar la misma historia llegada de varios proveedores; se evalúa solo una copia
+        clusterer = clusterer_from_config(self.config)
+        representatives = [news for news in recent_news if clusterer.add(news)[1]]
+        
         # Evaluar viralidad en paralelo
         viral_news = []
         with ThreadPoolExecutor(max_workers=5) as executor:
             future_to_article = {
                 executor.submit(self._evaluate_virality, article['url']): article 
-                for article in recent_news
+                for article in representatives
             }
             
             for future in future_to_article:
                 try:
                     result = future.result()
-                    if result and result['virality_score'] >= min_virality_score:
+                    if not result:
+                        continue
+                    cluster = clusterer.cluster_for(result['url'])
+                    if cluster:
+                        result = with_cluster_signal(result, cluster.size, cluster.urls)
+                    if result['virality_score'] >= min_virality_score:
                         viral_news.append(result)
                 except Exception as e:
                     article = future_to_article[future]
@@ -157,7 +160,7 @@ class NewsAggregator:
         return {
             'sentiment_polarity_textblob': TextBlob(text).sentiment.polarity,
             'sentiment_compound_vader': self.vader_analyzer.polarity_scores(text)['compound'],
-            'keyword_count': sum(1 for token in nlp(text) if token.text.lower() in self.config['keywords']['es']),
+            'keyword_count': self.keyword_matcher.count(text),
             'readability_score': textstat.flesch_kincaid_grade(text)
         }
         
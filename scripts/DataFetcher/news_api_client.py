@@ -4,6 +4,7 @@ from typing import List, Dict, Any, Optional
 from datetime import datetime, timedelta
 from .interfaces import NewsProvider
 from scripts.utils.app_logger import trace
+from scripts.utils.http_client import get_http_client
 
 # Inicializar Colorama
 init(autoreset=True)
@@ -14,7 +15,8 @@ class NewsAPIProvider(NewsProvider):
     @trace()
     def __init__(self, api_key: str):
         self.api_key = api_key
-        self.client = NewsApiClient(api_key=self.api_key)
+        # Pooled session with the shared retry policy and the 'newsapi' rate limit
+        self.client = NewsApiClient(api_key=self.api_key, session=get_http_client().for_api('newsapi'))
         self.countries = ['es', 'us', 'gb', 'fr', 'ru']  # Países por defecto
         self.default_days_back = 7  # Ventana por defecto para noticias recientes
     
@@ -1,5 +1,6 @@
-from newspaper import Article
-from newspaper.article import ArticleException
+from typing import Optional
+
+from .article_service import ArticleContent, ArticleService, get_article_service
 
 class ArticleData:
     def __init__(self, title, authors, text, images, publish_date):
@@ -12,24 +13,28 @@ class ArticleData:
     def __str__(self):
         return f"Title: {self.title}\nAuthors: {', '.join(self.authors)}\nDate: {self.publish_date}\nText: {self.text[:500]}...\nImages: {self.images}"
 
+    @classmethod
+    def from_content(cls, content: ArticleContent) -> "ArticleData":
+        return cls(
+            title=content.title,
+            authors=content.authors,
+            text=content.text,
+            images=content.images,
+            publish_date=content.published
+        )
+
 class NewsExtractor:
-    def __init__(self):
-        pass
+    """Article extraction through the shared ArticleService (deduped downloads, disk cache)."""
 
-    def extract_article(self, url):
+    def __init__(self, service: Optional[ArticleService] = None):
+        self.service = service or get_article_service()
+
+    def extract_article(self, url) -> Optional[ArticleData]:
         try:
             print(f"Extracting article from: {url}")
-            article = Article(url)
-            article.download()
-            article.parse()
-            
-            return ArticleData(
-                title=article.title,
-                authors=article.authors,
-                text=article.text,
-                images=list(article.images),
-                publish_date=article.publish_date
-            )
-        except ArticleException as e:
+            content = self.service.fetch(url)
+            return ArticleData.from_content(content) if content else None
+        except Exception as e:
             print(f"Error extracting article: {e}")
             return None
+
@@ -1,7 +1,8 @@
 import xml.etree.ElementTree as ET
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 from dateutil import parser as date_parser
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional, Union
 import logging
 
 # Configuración básica de logging
@@ -43,91 +44,196 @@ class FeedItem:
         )
 
 
-def _find_first_text(element: ET.Element, variants: List[str]) -> Optional[str]:
-    """
-    Busca el primer texto disponible en el elemento para las variantes dadas.
-    """
-    for variant in variants:
-        text = element.findtext(variant)
-        if text:
-            return text
-    return None
+# Prefijos con los que se nombran los espacios de nombres habituales en feeds
+NAMESPACE_PREFIXES = {
+    'http://purl.org/dc/elements/1.1/': 'dc',
+    'http://purl.org/rss/1.0/modules/content/': 'content',
+    'http://search.yahoo.com/mrss/': 'media',
+    # Atom y RSS 1.0 usan los nombres sin prefijo (entry, title, link...)
+    'http://www.w3.org/2005/Atom': '',
+    'http://purl.org/rss/1.0/': '',
+}
+
+# Ítems antiguos seguidos tras los que se deja de leer un feed (suelen ir del más nuevo al más viejo)
+DEFAULT_OLD_STREAK = 5
+CHUNK_SIZE = 64 * 1024
+
+_ITEM_TAGS = frozenset(ITEM_VARIANTS)
+_TEXT_FIELDS = {
+    'title': {tag: rank for rank, tag in enumerate(TITLE_VARIANTS)},
+    'link': {tag: rank for rank, tag in enumerate(LINK_VARIANTS)},
+    'description': {tag: rank for rank, tag in enumerate(DESCRIPTION_VARIANTS)},
+}
+_DATE_RANKS = {tag: rank for rank, tag in enumerate(PUB_DATE_VARIANTS)}
+
+
+def _local_name(tag: str) -> str:
+    """'{http://purl.org/dc/elements/1.1/}date' -> 'dc:date'; '{atom}entry' -> 'entry'."""
+    if tag[:1] != '{':
+        return tag
+    uri, _, name = tag[1:].partition('}')
+    prefix = NAMESPACE_PREFIXES.get(uri, '')
+    return f"{prefix}:{name}" if prefix else name
+
+
+def _parse_date_text(date_text: str) -> Optional[datetime]:
+    date_text = date_text.strip()
+    # RFC 822 (RSS) e ISO 8601 (Atom) por la vía rápida; dateutil para el resto
+    try:
+        return parsedate_to_datetime(date_text)
+    except (TypeError, ValueError, IndexError):
+        pass
+    try:
+        return datetime.fromisoformat(date_text)
+    except ValueError:
+        pass
+    try:
+        return date_parser.parse(date_text)
+    except (ValueError, TypeError, OverflowError) as e:
+        logging.warning(f"Error parsing date '{date_text}': {e}")
+        return None
 
 
-def _find_link(element: ET.Element) -> Optional[str]:
-    """
-    Busca el enlace en el elemento, considerando variantes y atributos.
-    """
-    for variant in LINK_VARIANTS:
-        link_text = element.findtext(variant)
-        if link_text:
-            return link_text
-        link_elem = element.find(f'.//{variant}')
-        if link_elem is not None and 'href' in link_elem.attrib:
-            return link_elem.attrib['href']
-    return None
+def _is_older(pub_date: datetime, since: datetime) -> bool:
+    # Las fechas sin zona se interpretan en hora local para poder comparar
+    pub = pub_date if pub_date.tzinfo else pub_date.astimezone()
+    ref = since if since.tzinfo else since.astimezone()
+    return pub < ref
 
 
-def _parse_pub_date(element: ET.Element) -> Optional[datetime]:
+class _ItemBuilder:
     """
-    Busca y parsea la fecha de publicación usando variantes y dateutil.
+    Acumula los campos de un ítem a partir de sus hijos directos, respetando
+    el orden de preferencia de cada lista de variantes.
     """
-    for variant in PUB_DATE_VARIANTS:
-        date_text = element.findtext(variant)
-        if date_text:
-            try:
-                return date_parser.parse(date_text.strip())
-            except (ValueError, TypeError) as e:
-                logging.warning(f"Error parsing date '{date_text}': {e}")
-                continue
-    return None
-
-
-def _find_item_elements(root: ET.Element) -> List[ET.Element]:
+    __slots__ = ('texts', 'ranks', 'href', 'dates')
+
+    def __init__(self):
+        self.texts = {}
+        self.ranks = {}
+        self.href: Optional[str] = None
+        self.dates: List[tuple] = []
+
+    def child(self, name: str, text: Optional[str]) -> None:
+        if not text or not text.strip():
+            return
+        for field, ranks in _TEXT_FIELDS.items():
+            rank = ranks.get(name)
+            if rank is not None and rank < self.ranks.get(field, len(ranks)):
+                self.texts[field] = text
+                self.ranks[field] = rank
+        date_rank = _DATE_RANKS.get(name)
+        if date_rank is not None:
+            self.dates.append((date_rank, text))
+
+    def link_href(self, name: str, attrib: dict) -> None:
+        """<link href="..."/> (Atom); se prefiere rel="alternate" o sin rel."""
+        href = attrib.get('href')
+        if not href or name not in _TEXT_FIELDS['link']:
+            return
+        if self.href is None or attrib.get('rel', 'alternate') == 'alternate':
+            self.href = href
+
+    def build(self) -> FeedItem:
+        pub_date = None
+        for _, date_text in sorted(self.dates, key=lambda d: d[0]):
+            pub_date = _parse_date_text(date_text)
+            if pub_date:
+                break
+        return FeedItem(
+            title=self.texts.get('title'),
+            link=self.texts.get('link') or self.href,
+            description=self.texts.get('description'),
+            pub_date=pub_date,
+        )
+
+
+def _chunks(source: Union[str, bytes, Iterable[bytes]]) -> Iterator[Union[str, bytes]]:
+    if isinstance(source, (str, bytes, bytearray)):
+        for start in range(0, len(source), CHUNK_SIZE):
+            yield source[start:start + CHUNK_SIZE]
+    else:
+        yield from source
+
+
+def iter_feed_items(
+    source: Union[str, bytes, Iterable[bytes]],
+    since: Optional[datetime] = None,
+    old_streak: int = DEFAULT_OLD_STREAK,
+) -> Iterator[FeedItem]:
     """
-    Busca los elementos que representan ítems en el feed.
+    Recorre un feed RSS/Atom en streaming y va devolviendo sus ítems.
+
+    El XML se lee por bloques con un parser incremental: los espacios de
+    nombres se resuelven en la misma pasada, y cada ítem se descarta del árbol
+    en cuanto se ha emitido, así que la memoria no crece con el tamaño del feed.
+    Con `since`, la lectura se detiene tras `old_streak` ítems seguidos
+    publicados antes de esa fecha.
+
+    Args:
+        source: Contenido del feed (str/bytes) o iterable de bloques de bytes.
+        since: Inicio de la ventana de recencia; None lee el feed completo.
+        old_streak: Ítems antiguos consecutivos que cortan la lectura.
     """
-    for variant in ITEM_VARIANTS:
-        items = root.findall(f'.//{variant}')
-        if items:
-            return items
-    return []
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    stack: List[ET.Element] = []
+    builder: Optional[_ItemBuilder] = None
+    item_depth = 0
+    old_in_a_row = 0
+    try:
+        for chunk in _chunks(source):
+            parser.feed(chunk)
+            for event, elem in parser.read_events():
+                if event == 'start':
+                    stack.append(elem)
+                    if builder is None and _local_name(elem.tag) in _ITEM_TAGS:
+                        builder, item_depth = _ItemBuilder(), len(stack)
+                    continue
+
+                stack.pop()
+                if builder is None:
+                    continue
+                depth = len(stack) + 1
+                if depth > item_depth:
+                    name = _local_name(elem.tag)
+                    if depth == item_depth + 1:
+                        builder.child(name, elem.text)
+                    builder.link_href(name, elem.attrib)
+                    continue
+
+                item = builder.build()
+                builder = None
+                # Suelta el ítem ya procesado para no acumular el árbol completo
+                elem.clear()
+                if stack:
+                    stack[-1].remove(elem)
+
+                if since is not None and item.pub_date is not None:
+                    if _is_older(item.pub_date, since):
+                        old_in_a_row += 1
+                        if old_in_a_row >= old_streak:
+                            return
+                        continue
+                    old_in_a_row = 0
+                yield item
+        parser.close()
+    except ET.ParseError as e:
+        logging.error(f"Error parsing XML: {e}")
 
 
-def parse_rss_to_standard_object(rss_content: str) -> List[FeedItem]:
+def parse_rss_to_standard_object(rss_content: Union[str, bytes], since: Optional[datetime] = None) -> List[FeedItem]:
     """
     Parsea el contenido RSS/XML y devuelve una lista de objetos FeedItem estandarizados.
 
     Args:
-        rss_content (str): Contenido XML del feed RSS.
+        rss_content (str | bytes): Contenido XML del feed RSS.
+        since (datetime, opcional): Descarta los ítems anteriores y corta la lectura
+            cuando el feed ya solo los contiene (ver iter_feed_items).
 
     Returns:
         List[FeedItem]: Lista de ítems estandarizados.
     """
-    try:
-        root = ET.fromstring(rss_content)
-    except ET.ParseError as e:
-        logging.error(f"Error parsing XML: {e}")
-        return []
-
-    item_elements = _find_item_elements(root)
-    if not item_elements:
+    items = list(iter_feed_items(rss_content, since=since))
+    if not items:
         logging.info("No items found in the feed.")
-        return []
-
-    items: List[FeedItem] = []
-    for item in item_elements:
-        title = _find_first_text(item, TITLE_VARIANTS)
-        link = _find_link(item)
-        description = _find_first_text(item, DESCRIPTION_VARIANTS)
-        pub_date = _parse_pub_date(item)
-
-        feed_item = FeedItem(
-            title=title,
-            link=link,
-            description=description,
-            pub_date=pub_date
-        )
-        items.append(feed_item)
-
-    return items
\ No newline at end of file
+    return items
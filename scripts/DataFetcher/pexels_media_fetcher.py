@@ -3,6 +3,8 @@ import os
 import uuid
 from colorama import Fore, Style, init
 
+from scripts.utils.http_client import get_http_client
+
 # Inicializar Colorama
 init(autoreset=True)
 
@@ -17,6 +19,7 @@ class PexelsMediaFetcher:
         """
         self.api_key = api_key
         self.headers = {"Authorization": self.api_key}
+        self.http = get_http_client()
         self.temp_dir = temp_dir
         os.makedirs(self.temp_dir, exist_ok=True)
         self.downloaded_video_ids = set()  # To keep track of downloaded video IDs
@@ -34,15 +37,15 @@ class PexelsMediaFetcher:
         """
         try:
             if media_type == "video":
-                url = f"https://api.pexels.com/videos/search?query={query}&per_page=10"
+                url, params = "https://api.pexels.com/videos/search", {"query": query, "per_page": 10}
             elif media_type == "photo":
-                url = f"https://api.pexels.com/v1/search?query={query}&per_page=1"
+                url, params = "https://api.pexels.com/v1/search", {"query": query, "per_page": 1}
             else:
                 print(Fore.RED + f"Unsupported media type '{media_type}'.")
                 return None
 
             try:
-                response = requests.get(url, headers=self.headers)
+                response = self.http.get(url, api='pexels', headers=self.headers, params=params)
                 response.raise_for_status()  # Raise an exception for HTTP errors
             except requests.exceptions.RequestException as e:
                 print(Fore.RED + f"Failed to fetch {media_type} for query '{query}'. Error: {str(e)}")
@@ -68,11 +71,7 @@ class PexelsMediaFetcher:
                             file_path = os.path.join(self.temp_dir, file_name)
                             
                             try:
-                                with requests.get(file_url, stream=True) as r:
-                                    r.raise_for_status()  # Raise an exception for HTTP errors
-                                    with open(file_path, 'wb') as f:
-                                        for chunk in r.iter_content(chunk_size=8192):
-                                            f.write(chunk)
+                                self.http.download(file_url, file_path)
                                 
                                 # Mark this video as downloaded
                                 self.downloaded_video_ids.add(video_id)
@@ -99,11 +98,7 @@ class PexelsMediaFetcher:
                     file_path = os.path.join(self.temp_dir, file_name)
 
                     try:
-                        with requests.get(file_url, stream=True) as r:
-                            r.raise_for_status()  # Raise an exception for HTTP errors
-                            with open(file_path, 'wb') as f:
-                                for chunk in r.iter_content(chunk_size=8192):
-                                    f.write(chunk)
+                        self.http.download(file_url, file_path)
                         
                         print(Fore.GREEN + f"Photo saved to {file_path}")
                         return file_path
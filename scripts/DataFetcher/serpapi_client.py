@@ -1,15 +1,21 @@
 import requests
 from colorama import Fore, init
+from functools import partial
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 from dateutil import parser as dateparser
 from .interfaces import NewsProvider
-from scripts.utils.file_cache import FileCache
+from scripts.utils.http_client import get_http_client
+from scripts.utils.query_cache import get_query_cache
 
 init(autoreset=True)
 
 ENGINE = "google_news"
 BASE_URL = "https://serpapi.com/search"
+NAMESPACE = "serpapi"
+DEFAULT_CACHE_DIR = ".cache/serpapi"
+# Page size doesn't change the price of a search: fetch the maximum once, slice per caller
+MAX_RESULTS = 100
 
 CATEGORY_QUERIES = {
     'business': 'business news',
@@ -27,18 +33,31 @@ GL_MAP = {
 }
 
 class SerpAPIProvider(NewsProvider):
+    """
+    Google News through SerpAPI, backed by the shared query cache.
+
+    Results are cached per (query, gl, hl) for all callers of the same
+    cache_dir and served without a request for `cache_ttl_hours`. Searches
+    are billed, so background refresh is opt-in: with `fresh_ttl_minutes`
+    set, entries older than that are still served, but a refresh starts.
+    """
+
     def __init__(self, api_key: str, use_cache: bool = True,
-                 cache_ttl_hours: int = 24, cache_dir: str = ".temp/cache/serpapi"):
+                 cache_ttl_hours: int = 24, cache_dir: str = DEFAULT_CACHE_DIR,
+                 fresh_ttl_minutes: Optional[int] = None):
         self.api_key = api_key
         self.use_cache = use_cache
-        self.cache = FileCache(cache_dir, ttl=cache_ttl_hours * 3600)
+        self.stale_ttl = cache_ttl_hours * 3600
+        self.fresh_ttl = min(fresh_ttl_minutes * 60, self.stale_ttl) if fresh_ttl_minutes else self.stale_ttl
+        self.cache = get_query_cache(cache_dir)
+        self.http = get_http_client().for_api('serpapi')
 
     def get_latest_news(self,
                        category: Optional[str] = None,
                        language: Optional[str] = None,
                        limit: int = 20) -> List[Dict[str, Any]]:
         query = CATEGORY_QUERIES.get(category, "latest news") if category else "latest news"
-        return self._search(query, language, limit)
+        return self._search(query, language, limit, tag=category)
 
     def search_news(self,
                    query: str,
@@ -53,55 +72,63 @@ class SerpAPIProvider(NewsProvider):
                    limit: int = 20, use_cache: Optional[bool] = None) -> List[Dict[str, Any]]:
         return self._search(query, language, limit, use_cache)
 
+    def warm_categories(self, categories: List[str], language: Optional[str] = None) -> int:
+        """
+        Starts background fetches for categories with no cached entry at all; returns how many.
+
+        Stale entries are left alone: they refresh when a caller actually reads them.
+        """
+        if not self.use_cache:
+            return 0
+        started = 0
+        for category in categories:
+            params = self._params(CATEGORY_QUERIES.get(category, "latest news"), language)
+            if self.cache.lookup(NAMESPACE, params) is None:
+                self.cache.refresh(NAMESPACE, params, partial(self._fetch, params), self.stale_ttl, tag=category)
+                started += 1
+        return started
+
     @staticmethod
     def _normalize_lang(language: Optional[str]) -> str:
         lang = (language or 'es').strip()
         return lang.split('-')[0].split('_')[0].lower()
 
-    def _search(self, query: str, language: Optional[str] = None,
-                limit: int = 20, use_cache: Optional[bool] = None) -> List[Dict[str, Any]]:
-        params = {
-            'engine': ENGINE,
-            'q': query,
-            'api_key': self.api_key,
-            'num': min(limit, 100),
-        }
-
+    def _params(self, query: str, language: Optional[str]) -> Dict[str, Any]:
+        """Query identity: what the cache key is built from (no api_key, no page size)."""
         lang = self._normalize_lang(language)
+        params = {'engine': ENGINE, 'q': query, 'hl': lang}
         gl = GL_MAP.get(lang)
         if gl:
             params['gl'] = gl
-        params['hl'] = lang
+        return params
 
+    def _search(self, query: str, language: Optional[str] = None,
+                limit: int = 20, use_cache: Optional[bool] = None,
+                tag: Optional[str] = None) -> List[Dict[str, Any]]:
+        params = self._params(query, language)
         use_cache = use_cache if use_cache is not None else self.use_cache
-        cache_key = self._cache_key(params)
-
-        if use_cache:
-            cached = self.cache.get(cache_key)
-            if cached is not None:
-                print(Fore.GREEN + f"SerpAPI cache hit for: {query}")
-                return cached[:limit]
+        try:
+            if use_cache:
+                articles = self.cache.get_or_fetch(NAMESPACE, params, partial(self._fetch, params),
+                                                   self.fresh_ttl, self.stale_ttl, tag=tag or query)
+            else:
+                articles = self._fetch(params)
+        except Exception:
+            # Already reported by _fetch
+            return []
+        return (articles or [])[:limit]
 
-        print(Fore.CYAN + f"Fetching from SerpAPI: {query} (gl={gl}, hl={lang})")
+    def _fetch(self, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """One SerpAPI request; raises on failure so stale cache entries are kept."""
+        print(Fore.CYAN + f"Fetching from SerpAPI: {params['q']} (gl={params.get('gl')}, hl={params['hl']})")
         try:
-            resp = requests.get(BASE_URL, params=params, timeout=30)
+            resp = self.http.get(BASE_URL, params={**params, 'api_key': self.api_key, 'num': MAX_RESULTS},
+                                 timeout=30)
             resp.raise_for_status()
             data = resp.json()
-
-            if 'news_results' not in data:
-                print(Fore.YELLOW + f"SerpAPI returned no news_results: {data.get('error', 'unknown')}")
-                return []
-
-            articles = self._standardize_articles(data['news_results'])
-
-            if use_cache and articles:
-                self.cache.set(cache_key, articles)
-
-            return articles[:limit]
-
         except requests.exceptions.Timeout:
             print(Fore.RED + "SerpAPI request timed out")
-            return []
+            raise
         except requests.exceptions.RequestException as e:
             error_data = getattr(e, 'response', None)
             if error_data is not None:
@@ -112,10 +139,15 @@ class SerpAPIProvider(NewsProvider):
                     print(Fore.RED + f"SerpAPI error: {error_data.status_code} {error_data.reason}")
             else:
                 print(Fore.RED + f"SerpAPI request failed: {e}")
-            return []
+            raise
         except Exception as e:
             print(Fore.RED + f"Unexpected SerpAPI error: {e}")
+            raise
+
+        if 'news_results' not in data:
+            print(Fore.YELLOW + f"SerpAPI returned no news_results: {data.get('error', 'unknown')}")
             return []
+        return self._standardize_articles(data['news_results'])
 
     def _standardize_articles(self, results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         standardized = []
@@ -141,8 +173,3 @@ class SerpAPIProvider(NewsProvider):
             return dt.isoformat()
         except Exception:
             return date_str
-
-    @staticmethod
-    def _cache_key(params: dict) -> str:
-        relevant = {k: v for k, v in sorted(params.items()) if k != 'api_key'}
-        return str(relevant)
@@ -0,0 +1,175 @@
+"""
+Near-duplicate story clustering.
+
+The same story arrives from RSS, NewsAPI, Currents and SerpAPI under different
+URLs and slightly different headlines. Each item gets a MinHash signature over
+the word shingles of its normalized title and snippet. Signatures are split
+into LSH bands, and items that share a band bucket become candidates. A
+candidate joins a cluster only when its estimated Jaccard similarity to the
+cluster's representative reaches the threshold. Each item is compared only
+with its bucket-mates, so grouping stays sub-quadratic.
+
+Only the representative (the first item seen) is scored. The cluster size is
+added to the score as a signal of how widely the story is being covered.
+"""
+import hashlib
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from scripts.dbControllers.article_score_store import normalize_url
+
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+DEFAULT_SIMILARITY_THRESHOLD = 0.5
+SHINGLE_SIZE = 2
+
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+# "Headline - Reuters", "Headline | El País": the publisher suffix is noise
+_SOURCE_SUFFIX_RE = re.compile(r"\s+[-|–—]\s+[^-|–—]{1,40}$")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase, accents stripped, punctuation dropped, whitespace collapsed."""
+    text = unicodedata.normalize('NFKD', text or '')
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return ' '.join(_WORD_RE.findall(text.lower()))
+
+
+def story_text(news: Dict[str, Any]) -> str:
+    title = _SOURCE_SUFFIX_RE.sub('', (news.get('title') or '').strip())
+    snippet = news.get('description') or news.get('snippet') or news.get('summary') or ''
+    return normalize_text(f"{title} {snippet}")
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> List[str]:
+    words = text.split()
+    if len(words) <= size:
+        return [' '.join(words)] if words else []
+    return [' '.join(words[i:i + size]) for i in range(len(words) - size + 1)]
+
+
+class MinHasher:
+    """MinHash signatures from multiply-shift hashes of 32-bit shingle hashes."""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        # Odd multipliers; uint64 arithmetic wraps mod 2**64 by design
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+    def signature(self, tokens: List[str]) -> Optional[np.ndarray]:
+        if not tokens:
+            return None
+        hashes = np.fromiter(
+            (int.from_bytes(hashlib.blake2b(t.encode('utf-8'), digest_size=4).digest(), 'little')
+             for t in set(tokens)),
+            dtype=np.uint64,
+        )
+        permuted = (hashes[:, None] * self._a[None, :] + self._b[None, :]) >> np.uint64(32)
+        return (permuted & _MAX_HASH).min(axis=0)
+
+
+@dataclass
+class StoryCluster:
+    cluster_id: int
+    representative: Dict[str, Any]
+    signature: Optional[np.ndarray]
+    members: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def size(self) -> int:
+        return len(self.members)
+
+    @property
+    def urls(self) -> List[str]:
+        return [m.get('link') or m.get('url') for m in self.members]
+
+
+class StoryClusterer:
+    """
+    Incremental LSH clustering: call `add` as items arrive.
+
+    Args:
+        threshold: Minimum estimated Jaccard similarity to the representative.
+        num_perm: MinHash signature length.
+        bands: LSH bands (num_perm must be divisible by it). More bands catch
+            less similar pairs as candidates.
+    """
+
+    def __init__(
+        self,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        num_perm: int = DEFAULT_NUM_PERM,
+        bands: int = DEFAULT_BANDS,
+    ):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self._hasher = MinHasher(num_perm)
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        self._clusters: List[StoryCluster] = []
+        self._by_url: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._clusters)
+
+    @property
+    def clusters(self) -> List[StoryCluster]:
+        return list(self._clusters)
+
+    def _band_keys(self, signature: np.ndarray):
+        for band in range(self.bands):
+            yield band, signature[band * self.rows:(band + 1) * self.rows].tobytes()
+
+    def add(self, news: Dict[str, Any]) -> Tuple[StoryCluster, bool]:
+        """Places an item in a cluster; returns (cluster, True) when it starts a new one."""
+        signature = self._hasher.signature(shingles(story_text(news)))
+        cluster = self._find(signature) if signature is not None else None
+        is_new = cluster is None
+        if is_new:
+            cluster = StoryCluster(len(self._clusters), news, signature)
+            self._clusters.append(cluster)
+            if signature is not None:
+                for key in self._band_keys(signature):
+                    self._buckets.setdefault(key, []).append(cluster.cluster_id)
+        cluster.members.append(news)
+        url = news.get('link') or news.get('url')
+        if url:
+            self._by_url[normalize_url(url)] = cluster.cluster_id
+        return cluster, is_new
+
+    def _find(self, signature: np.ndarray) -> Optional[StoryCluster]:
+        best, best_similarity = None, self.threshold
+        checked = set()
+        for key in self._band_keys(signature):
+            for cluster_id in self._buckets.get(key, ()):
+                if cluster_id in checked:
+                    continue
+                checked.add(cluster_id)
+                cluster = self._clusters[cluster_id]
+                similarity = float(np.mean(cluster.signature == signature))
+                if similarity >= best_similarity:
+                    best, best_similarity = cluster, similarity
+        return best
+
+    def cluster_for(self, url: str) -> Optional[StoryCluster]:
+        cluster_id = self._by_url.get(normalize_url(url))
+        return self._clusters[cluster_id] if cluster_id is not None else None
+
+
+def clusterer_from_config(config: Dict[str, Any]) -> StoryClusterer:
+    """StoryClusterer built from the ``clustering`` section of the news config."""
+    clustering_cfg = config.get('clustering', {})
+    return StoryClusterer(
+        threshold=clustering_cfg.get('threshold', DEFAULT_SIMILARITY_THRESHOLD),
+        num_perm=clustering_cfg.get('num_perm', DEFAULT_NUM_PERM),
+        bands=clustering_cfg.get('bands', DEFAULT_BANDS),
+    )
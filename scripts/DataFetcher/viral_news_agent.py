@@ -1,28 +1,44 @@
 import json
 import logging
-import spacy
+import threading
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional, Union
+from functools import partial
+from itertools import chain
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import requests
 from bs4 import BeautifulSoup
 from colorama import Fore, Style, init
-from concurrent.futures import ThreadPoolExecutor, Future
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from dateutil import parser
 from fake_useragent import UserAgent
-from newspaper import Article
-from requests.adapters import HTTPAdapter
-from tenacity import retry, stop_after_attempt, wait_exponential
-from textblob import TextBlob
-from urllib3.util.retry import Retry
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-import textstat
-
-from scripts.DataFetcher.news_mapper import parse_rss_to_standard_object
+
+from scripts.DataFetcher.news_mapper import iter_feed_items
+from .article_service import ArticleContent, get_article_service
+from .feed_ingestion import DEFAULT_MAX_CONNECTIONS, DEFAULT_PER_HOST, FeedIngestor
+from .feed_state import DEFAULT_FEED_STATE_PATH, FeedStateStore
+from .story_clustering import clusterer_from_config
+from .virality_scoring import (
+    DEFAULT_SCORING_PROCESSES,
+    SCORE_BATCH_SIZE,
+    ArticleText,
+    ScoringPool,
+    create_scoring_executor,
+    with_cluster_signal,
+)
 from .serpapi_client import SerpAPIProvider
 from .currents_api_client import CurrentsAPIProvider
 from .news_aggregator import NewsAggregator
+from scripts.dbControllers.article_score_store import (
+    DEFAULT_HALF_LIFE_HOURS,
+    DEFAULT_RETENTION_DAYS,
+    DEFAULT_SCORE_DB,
+    ArticleScoreStore,
+    normalize_url,
+    text_hash,
+)
 from scripts.utils.app_logger import trace
+from scripts.utils.http_client import get_http_client
 
 # --- Constants ---
 DEFAULT_VIRAL_NEWS_FILE = 'viral_news.json'
@@ -30,7 +46,6 @@ DEFAULT_TIME_WINDOW_DAYS = 2
 DEFAULT_VIRALITY_THRESHOLD = 0.5
 DEFAULT_MAX_WORKERS = 5
 DEFAULT_RSS_TIMEOUT = 10
-DEFAULT_ARTICLE_TIMEOUT = 10
 DEFAULT_NEWSAPI_COUNTRIES = ['es', 'us', 'gb', 'fr', 'ru']
 DEFAULT_CURRENTS_LANGUAGES = ['es', 'en', 'fr', 'ru']
 PUB_DATE_FIELDS = ['pub_date', 'pubDate', 'published', 'updated', 'dc:date', 'lastBuildDate']
@@ -38,19 +53,6 @@ PUB_DATE_FIELDS = ['pub_date', 'pubDate', 'published', 'updated', 'dc:date', 'la
 # --- Initialize colorama ---
 init(autoreset=True)
 
-# --- Load spaCy model ---
-def load_spacy_model(model_name: str = "es_core_news_sm"):
-    """Load or download the specified spaCy model."""
-    try:
-        return spacy.load(model_name)
-    except OSError:
-        print(Fore.RED + f"Model {model_name} not found. Downloading...")
-        from spacy.cli import download as _spacy_download
-        _spacy_download(model_name)
-        return spacy.load(model_name)
-
-nlp = load_spacy_model()
-
 class NewsProcessor:
     """
     Processes news articles from various sources, evaluates their virality,
@@ -63,8 +65,23 @@ class NewsProcessor:
         self._processed_news: List[Dict[str, Any]] = []
         self._news_index = 0
         self._ua = UserAgent()
-        self._vader_analyzer = SentimentIntensityAnalyzer()
         self.logger = logging.getLogger(__name__)
+        # {"http": {"rate_limits": {"serpapi": [calls, period_seconds], ...}}}
+        get_http_client().configure_rate_limits(config.get('http', {}).get('rate_limits', {}))
+        ingestion_cfg = config.get('ingestion', {})
+        self._ingestor = FeedIngestor(
+            timeout=DEFAULT_RSS_TIMEOUT,
+            per_host=ingestion_cfg.get('per_host', DEFAULT_PER_HOST),
+            max_connections=ingestion_cfg.get('max_connections', DEFAULT_MAX_CONNECTIONS),
+            user_agent=lambda: self._ua.random,
+            state_store=FeedStateStore(ingestion_cfg.get('feed_state_path', DEFAULT_FEED_STATE_PATH)),
+        )
+        self._score_cfg = config.get('score_store', {})
+        self._scoring_cfg = config.get('scoring', {})
+        self._scoring_executor: Optional[ProcessPoolExecutor] = None
+        self._last_scoring_pool: Optional[ScoringPool] = None
+        self._scoring_executor_lock = threading.Lock()
+        self._store = ArticleScoreStore(self._score_cfg.get('path', DEFAULT_SCORE_DB))
         self._load_viral_news()
 
     @trace()
@@ -72,44 +89,75 @@ class NewsProcessor:
         """
         Processes all news from configured sources, evaluates virality,
         and stores the results.
+
+        Sources are fetched concurrently and each article is queued for scoring
+        as soon as its source arrives, so slow feeds no longer delay the rest.
+        Near-duplicates of a story already seen this cycle (other providers,
+        other URLs) are clustered and only the first copy is scored; the
+        cluster size is added to its score. Articles already in the score store
+        with the same listing are skipped; the ranking is then read back from
+        the store with time decay.
         """
-        all_news = []
         successful_sources = 0
         total_sources = 0
-
-        # Process RSS feeds
-        for feed_url in self._config.get('rss_feeds', []):
-            total_sources += 1
-            news_items = self._process_rss_feed(feed_url)
-            if news_items:
-                all_news.extend(news_items)
-                successful_sources += 1
-
-        # Process NewsAPI
-        total_sources += 1
-        newsapi_news = self._process_newsapi()
-        if newsapi_news:
-            all_news.extend(newsapi_news)
-            successful_sources += 1
-
-        # Process CurrentsAPI
-        total_sources += 1
-        currents_news = self._process_currentsapi()
-        if currents_news:
-            all_news.extend(currents_news)
-            successful_sources += 1
-
-        # Evaluate virality in parallel
-        print(Fore.CYAN + f"Processing {len(all_news)} articles for virality...")
-        self._processed_news = self._evaluate_news_virality_parallel(all_news)
-        self._news_index = 0
-        self._save_viral_news()
+        articles = 0
+        already_scored = 0
+        duplicates = 0
+        seen_urls = set()
+        clusterer = clusterer_from_config(self._config)
+
+        blocking_sources = {**self._serpapi_sources(), **self._currents_sources()}
+        print(Fore.CYAN + f"Fetching {len(self._config.get('rss_feeds', []))} feeds and "
+                          f"{len(blocking_sources)} API sources concurrently...")
+        with ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS) as executor, self._scoring_pool() as scoring:
+            future_to_news: Dict[Future, Dict[str, Any]] = {}
+            for result in self._ingestor.stream(self._config.get('rss_feeds', []), self._parse_rss_items,
+                                                blocking_sources, select=self._select_recent):
+                total_sources += 1
+                if not result.ok:
+                    print(Fore.RED + f"Error processing source {result.source}: {result.error}")
+                    continue
+                if result.items:
+                    successful_sources += 1
+                print(Fore.CYAN + f"{result.source}: {len(result.items)} recent items ({result.elapsed:.1f}s"
+                                  f"{', unchanged' if result.cached else ''})")
+                for news in result.items:
+                    url = news.get('link') or news.get('url')
+                    if not url or normalize_url(url) in seen_urls:
+                        continue
+                    seen_urls.add(normalize_url(url))
+                    _, is_new_story = clusterer.add(news)
+                    if not is_new_story:
+                        duplicates += 1
+                        continue
+                    feed_hash = text_hash(news.get('title'), news.get('description'))
+                    if self._store.is_current(url, feed_hash):
+                        already_scored += 1
+                        continue
+                    articles += 1
+                    future_to_news[executor.submit(self._prepare_for_scoring, news, feed_hash, scoring)] = news
+            print(Fore.CYAN + f"Processing {articles} new or changed articles for virality "
+                              f"({already_scored} already scored, {duplicates} near-duplicates in "
+                              f"{len(clusterer)} stories)...")
+            # Downloads hand articles to the scoring pool as they finish; wait for them, then for the scores.
+            # Cluster sizes are final once ingestion is done, so the signal is applied at store time.
+            reused = self._collect_prepared(future_to_news)
+            for doc, result in chain(reused, scoring.results()):
+                cluster = clusterer.cluster_for(doc.url)
+                if cluster:
+                    result = with_cluster_signal(result, cluster.size, cluster.urls)
+                print(Fore.GREEN + f"News processed: {result['title']} - Virality Score: {result['virality_score']:.2f}")
+                self._store.upsert(result, doc.meta['feed_hash'], doc.meta['content_hash'], doc.meta['published_at'])
+        self._store.prune(self._score_cfg.get('retention_days', DEFAULT_RETENTION_DAYS))
+        self._load_viral_news()
 
         # Report statistics
         print(Fore.GREEN + f"\nProceso completado:")
         print(f"- Fuentes exitosas: {successful_sources}/{total_sources}")
-        print(f"- Artículos procesados: {len(all_news)}")
+        print(f"- Artículos procesados: {articles} (ya puntuados: {already_scored}, duplicados: {duplicates})")
         print(f"- Artículos virales encontrados: {len(self._processed_news)}")
+        print(f"- Feeds: {self._ingestor.last_stats.summary()}")
+        print(f"- HTTP: {get_http_client().summary()}")
 
     @trace()
     def get_next_viral_news(self) -> Optional[Dict[str, Any]]:
@@ -123,139 +171,127 @@ class NewsProcessor:
         return None
 
     def _load_viral_news(self) -> None:
-        """Loads viral news from file if it exists."""
-        try:
-            with open(self._viral_news_file, 'r', encoding='utf-8') as f:
-                self._processed_news = json.load(f)
-            print(Fore.GREEN + f"Loaded {len(self._processed_news)} viral news from {self._viral_news_file}")
-        except FileNotFoundError:
-            print(Fore.YELLOW + f"File {self._viral_news_file} not found. Starting fresh.")
-        except json.JSONDecodeError:
-            print(Fore.RED + f"Error decoding {self._viral_news_file}. Starting fresh.")
-            self._processed_news = []
-
-    def _save_viral_news(self) -> None:
-        """Saves processed viral news to file."""
-        try:
-            with open(self._viral_news_file, 'w', encoding='utf-8') as f:
-                json.dump(self._processed_news, f, ensure_ascii=False, indent=4)
-            print(Fore.GREEN + f"Saved {len(self._processed_news)} viral news to {self._viral_news_file}")
-        except Exception as e:
-            print(Fore.RED + f"Error saving viral news to {self._viral_news_file}: {e}")
-
-    def _fetch_rss_feed(self, url: str) -> Optional[bytes]:
-        """Fetches RSS feed content from a URL."""
-        headers = {'User-Agent': self._ua.random}
-        try:
-            response = requests.get(url, headers=headers, timeout=DEFAULT_RSS_TIMEOUT)
-            response.raise_for_status()
-            return response.content
-        except requests.RequestException as e:
-            print(Fore.RED + f"Error obtaining feed {url}: {e}")
-            return None
-
-    def _process_rss_feed(self, feed_url: str) -> List[Dict[str, Any]]:
-        """Processes a single RSS feed and returns recent news items."""
-        try:
-            print(Fore.CYAN + f"Processing feed: {feed_url}")
-            content = self._fetch_rss_feed(feed_url)
-            if not content:
-                return []
-            news_items = parse_rss_to_standard_object(content)
-            return [
-                {
-                    'title': item.title,
-                    'link': item.link,
-                    'description': item.description,
-                    'publishedAt': item.pub_date
-                }
-                for item in news_items
-                if item.pub_date and self._is_recent(item.pub_date)
-            ]
-        except Exception as e:
-            print(Fore.RED + f"Error processing RSS feed {feed_url}: {e}")
-            return []
-
-    def _process_newsapi(self) -> List[Dict[str, Any]]:
-        """Fetches and filters recent news from SerpAPI (replaced NewsAPI)."""
-        try:
-            serpapi_key = self._config.get('serpapi_api_key') or self._config.get('serpapi', {}).get('api_key', '')
-            if not serpapi_key:
-                print(Fore.YELLOW + "SerpAPI key not configured, skipping.")
-                return []
-            serpapi_client = SerpAPIProvider(api_key=serpapi_key, use_cache=True)
-            print(Fore.CYAN + "Processing news from SerpAPI")
-            all_news = []
-            for lang in DEFAULT_CURRENTS_LANGUAGES:
-                try:
-                    news = serpapi_client.fetch_news(
-                        query='technology news',
-                        language=lang,
-                        limit=20,
-                        use_cache=True,
-                    )
-                    recent = [
-                        n for n in news
-                        if self._is_recent(n.get('publishedAt'))
-                    ]
-                    all_news.extend(recent)
-                except Exception as e:
-                    print(Fore.YELLOW + f"SerpAPI error for lang {lang}: {e}")
-            return all_news
-        except Exception as e:
-            print(Fore.RED + f"Error processing SerpAPI: {e}")
-            return []
+        """Ranks viral news from the score store (importing a legacy JSON file once)."""
+        if self._store.count() == 0:
+            self._import_legacy_viral_news()
+        self._processed_news = self._store.ranked(
+            threshold=self._config.get('virality_threshold', DEFAULT_VIRALITY_THRESHOLD),
+            window_days=self._config.get('time_window_days', DEFAULT_TIME_WINDOW_DAYS),
+            half_life_hours=self._score_cfg.get('half_life_hours', DEFAULT_HALF_LIFE_HOURS),
+        )
+        self._news_index = 0
+        print(Fore.GREEN + f"Loaded {len(self._processed_news)} viral news from {self._store.db_name}")
 
-    def _process_currentsapi(self) -> List[Dict[str, Any]]:
-        """Fetches and filters recent news from CurrentsAPI for multiple languages."""
+    def _import_legacy_viral_news(self) -> None:
+        """Seeds an empty score store from the viral news JSON written by earlier versions."""
         try:
-            currentsapi_key = self._config.get('currentsapi_key') or self._config.get('currentsapi', {}).get('api_key', '')
-            if not currentsapi_key:
-                print(Fore.YELLOW + "CurrentsAPI key not configured, skipping.")
-                return []
-            currents_client = CurrentsClient(currentsapi_key)
-            print(Fore.CYAN + "Processing news from CurrentsAPI")
-            all_currents_news = []
-            for language in DEFAULT_CURRENTS_LANGUAGES:
-                try:
-                    currents_news = currents_client.get_latest_headlines(
-                        country='',
-                        category='TECHNOLOGY',
-                        language=language,
-                        limit=20
-                    )
-                    recent_currents_news = [
-                        news for news in currents_news
-                        if self._is_recent(news.get('published_at'))
-                    ]
-                    all_currents_news.extend(recent_currents_news)
-                except Exception as e:
-                    print(Fore.YELLOW + f"Error fetching CurrentsAPI news for language {language}: {e}")
-            return all_currents_news
-        except Exception as e:
-            print(Fore.RED + f"Error processing CurrentsAPI: {e}")
-            return []
+            with open(self._viral_news_file, 'r', encoding='utf-8') as f:
+                legacy = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        for news in legacy:
+            if news.get('url') and 'virality_score' in news:
+                self._store.upsert(news, feed_hash=None, content_hash=None, published_at=None)
+        print(Fore.GREEN + f"Imported {len(legacy)} viral news from {self._viral_news_file}")
+
+    def _parse_rss_items(self, content: bytes) -> List[Dict[str, Any]]:
+        """
+        Streams feed content into news items (dates as ISO strings, so they can be stored).
 
-    def _evaluate_news_virality_parallel(self, all_news: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Evaluates virality of news articles in parallel."""
-        results = []
-        with ThreadPoolExecutor(max_workers=DEFAULT_MAX_WORKERS) as executor:
-            future_to_news: Dict[Future, Dict[str, Any]] = {
-                executor.submit(
-                    self._evaluate_virality,
-                    news.get('link') or news.get('url')
-                ): news for news in all_news
+        Parsing stops once the feed runs past the configured time window.
+        """
+        since = datetime.now() - timedelta(days=self._config.get('time_window_days', DEFAULT_TIME_WINDOW_DAYS))
+        return [
+            {
+                'title': item.title,
+                'link': item.link,
+                'description': item.description,
+                'publishedAt': item.pub_date.isoformat()
             }
-            for future in future_to_news:
-                try:
-                    result = future.result(timeout=60)
-                    if result and result['virality_score'] > self._config.get('virality_threshold', DEFAULT_VIRALITY_THRESHOLD):
-                        results.append(result)
-                except Exception as e:
-                    news = future_to_news[future]
-                    url = news.get('link') or news.get('url')
-                    print(Fore.RED + f"Error processing article {url}: {e}")
-        return sorted(results, key=lambda news: news['virality_score'], reverse=True)
+            for item in iter_feed_items(content, since=since)
+            if item.pub_date
+        ]
+
+    def _select_recent(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Keeps the items published within the configured time window."""
+        return [item for item in items if self._is_recent(item.get('publishedAt'))]
+
+    def _serpapi_sources(self) -> Dict[str, Callable[[], List[Dict[str, Any]]]]:
+        """One fetch per language from SerpAPI (replaced NewsAPI), keyed by source name."""
+        serpapi_key = self._config.get('serpapi_api_key') or self._config.get('serpapi', {}).get('api_key', '')
+        if not serpapi_key:
+            print(Fore.YELLOW + "SerpAPI key not configured, skipping.")
+            return {}
+        serpapi_client = SerpAPIProvider(api_key=serpapi_key, use_cache=True)
+
+        def fetch(lang: str) -> List[Dict[str, Any]]:
+            news = serpapi_client.fetch_news(
+                query='technology news',
+                language=lang,
+                limit=20,
+                use_cache=True,
+            )
+            return [n for n in news if self._is_recent(n.get('publishedAt'))]
+
+        return {f"serpapi:{lang}": partial(fetch, lang) for lang in DEFAULT_CURRENTS_LANGUAGES}
+
+    def _currents_sources(self) -> Dict[str, Callable[[], List[Dict[str, Any]]]]:
+        """One fetch per language from CurrentsAPI, keyed by source name."""
+        currentsapi_key = self._config.get('currentsapi_key') or self._config.get('currentsapi', {}).get('api_key', '')
+        if not currentsapi_key:
+            print(Fore.YELLOW + "CurrentsAPI key not configured, skipping.")
+            return {}
+        currents_client = CurrentsClient(currentsapi_key)
+
+        def fetch(language: str) -> List[Dict[str, Any]]:
+            currents_news = currents_client.get_latest_headlines(
+                country='',
+                category='TECHNOLOGY',
+                language=language,
+                limit=20
+            )
+            return [news for news in currents_news if self._is_recent(news.get('published_at'))]
+
+        return {f"currents:{language}": partial(fetch, language) for language in DEFAULT_CURRENTS_LANGUAGES}
+
+    def _scoring_pool(self) -> ScoringPool:
+        """Batching front-end over this processor's scoring workers (started on first use, kept until close)."""
+        with self._scoring_executor_lock:
+            if self._last_scoring_pool is not None and self._last_scoring_pool.broken:
+                # A worker died during the previous cycle; the executor can't take new work
+                self._scoring_executor.shutdown(wait=False, cancel_futures=True)
+                self._scoring_executor = None
+            if self._scoring_executor is None:
+                self._scoring_executor = create_scoring_executor(
+                    self._config['keywords']['es'],
+                    self._scoring_cfg.get('processes', DEFAULT_SCORING_PROCESSES),
+                )
+            self._last_scoring_pool = ScoringPool(
+                batch_size=self._scoring_cfg.get('batch_size', SCORE_BATCH_SIZE),
+                executor=self._scoring_executor,
+            )
+            return self._last_scoring_pool
+
+    def close(self) -> None:
+        """Stops the scoring worker processes."""
+        with self._scoring_executor_lock:
+            executor, self._scoring_executor = self._scoring_executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _collect_prepared(self, future_to_news: Dict[Future, Dict[str, Any]]) -> List[Tuple[ArticleText, Dict[str, Any]]]:
+        """Waits for the download stage; returns the articles that reused a stored score."""
+        reused = []
+        for future in future_to_news:
+            try:
+                prepared = future.result(timeout=60)
+                if prepared:
+                    reused.append(prepared)
+            except Exception as e:
+                news = future_to_news[future]
+                url = news.get('link') or news.get('url')
+                print(Fore.RED + f"Error processing article {url}: {e}")
+        return reused
 
     def _is_recent(self, pub_date: Union[str, datetime, None]) -> bool:
         """Checks if a publication date is within the configured time window."""
@@ -281,94 +317,48 @@ class NewsProcessor:
             except Exception:
                 return None
 
-    def _evaluate_virality(self, article_url: str) -> Optional[Dict[str, Any]]:
+    def _prepare_for_scoring(
+        self, news: Dict[str, Any], feed_hash: str, scoring: ScoringPool
+    ) -> Optional[Tuple[ArticleText, Dict[str, Any]]]:
         """
-        Evaluates the virality of a news article by analyzing its content.
-        Returns a dictionary with analysis results or None if failed.
+        I/O stage: downloads a new or changed article and queues it for scoring.
+
+        An article whose extracted text was already scored under another URL
+        reuses those scores instead of being queued; that (doc, result) pair is
+        returned for the caller to store.
         """
+        article_url = news.get('link') or news.get('url')
         try:
-            headers = {'User-Agent': self._ua.random}
-            response = requests.get(article_url, headers=headers, timeout=DEFAULT_ARTICLE_TIMEOUT)
-            response.raise_for_status()
-            article = Article(article_url)
-            article.download(input_html=response.text)
-            article.parse()
-
-            if not article.text:
-                print(Fore.YELLOW + f"Could not extract text from {article_url}")
+            doc = self._download_document(article_url)
+            if not doc:
                 return None
-
-            title = article.title
-            text = article.text
-
-            sentiment_polarity_textblob = self._analyze_sentiment_textblob(text)
-            sentiment_compound_vader = self._analyze_sentiment_vader(text)
-            sentiment_compound_title = self._analyze_title_emotion(title)
-            keyword_count = self._analyze_keywords(text, self._config['keywords']['es'])
-            title_length = self._analyze_title_length(title)
-            readability_score = self._analyze_readability(text)
-
-            virality_score = (
-                (sentiment_polarity_textblob * 0.1) +
-                (sentiment_compound_vader * 0.1) +
-                (sentiment_compound_title * 0.1) +
-                (keyword_count / len(self._config['keywords']['es']) * 0.2) +
-                (1 / (title_length + 1) * 0.1) +
-                (1 / (readability_score + 1) * 0.1) +
-                0.4
-            )
-
-            print(Fore.GREEN + f"News processed: {title} - Virality Score: {virality_score:.2f}")
-
-            return {
-                'url': article_url,
-                'title': title,
-                'summary': article.summary,
-                'sentiment_polarity_textblob': sentiment_polarity_textblob,
-                'sentiment_compound_vader': sentiment_compound_vader,
-                'sentiment_compound_title': sentiment_compound_title,
-                'keyword_count': keyword_count,
-                'title_length': title_length,
-                'readability_score': readability_score,
-                'virality_score': virality_score
-            }
+            content_hash = text_hash(doc.title, doc.text)
+            published = self._parse_date(news.get('publishedAt') or news.get('published') or '')
+            published_at = published.timestamp() if published else None
+            known = self._store.find_by_content(content_hash)
+            doc.meta.update(feed_hash=feed_hash, content_hash=content_hash, published_at=published_at)
+            if known:
+                print(Fore.GREEN + f"News already scored under another URL: {known['title']}")
+                return doc, {**known, 'url': article_url}
+            scoring.add(doc)
+            return None
         except Exception as e:
             print(Fore.RED + f"Error processing {article_url}: {e}")
             return None
 
-    @staticmethod
-    def _analyze_sentiment_textblob(text: str) -> float:
-        """Analyzes sentiment polarity using TextBlob."""
-        return TextBlob(text).sentiment.polarity
-
-    def _analyze_sentiment_vader(self, text: str) -> float:
-        """Analyzes sentiment using VADER."""
-        sentiment = self._vader_analyzer.polarity_scores(text)
-        return sentiment['compound']
-
-    def _analyze_keywords(self, text: str, keywords: List[str]) -> int:
-        """Counts the number of keywords present in the text."""
-        doc = nlp(text)
-        return sum(1 for token in doc if token.text.lower() in keywords)
-
-    def _analyze_title_emotion(self, title: str) -> float:
-        """Analyzes sentiment of the title using VADER."""
-        sentiment = self._vader_analyzer.polarity_scores(title)
-        return sentiment['compound']
+    def _download_document(self, article_url: str) -> Optional[ArticleText]:
+        """Fetches an article through the shared article service; None when no text could be extracted."""
+        try:
+            content = get_article_service().fetch(article_url)
+        except Exception as e:
+            print(Fore.RED + f"Error processing {article_url}: {e}")
+            return None
+        return self._as_article_text(content) if content else None
 
     @staticmethod
-    def _analyze_title_length(title: str) -> int:
-        """Returns the number of words in the title."""
-        return len(title.split())
+    def _as_article_text(content: ArticleContent) -> ArticleText:
+        return ArticleText(url=content.url, title=content.title, text=content.text, summary=content.summary)
 
-    @staticmethod
-    def _analyze_readability(text: str) -> float:
-        """Analyzes readability using Flesch-Kincaid grade."""
-        try:
-            return textstat.flesch_kincaid_grade(text)
-        except Exception as e:
-            print(Fore.RED + f"Error analyzing readability: {e}")
-            return 0.0
 
 class CurrentsClient:
     """
@@ -378,23 +368,9 @@ class CurrentsClient:
         self.api_key = api_key
         self.latest_news_url = "https://api.currentsapi.services/v1/latest-news"
         self.search_url = "https://api.currentsapi.services/v1/search"
-        self.session = self._init_session()
-
-    def _init_session(self) -> requests.Session:
-        """Initializes a requests session with retry logic."""
-        session = requests.Session()
-        retries = Retry(
-            total=5,
-            backoff_factor=0.5,
-            status_forcelist=[500, 502, 503, 504],
-            allowed_methods=["GET"]
-        )
-        adapter = HTTPAdapter(max_retries=retries, pool_connections=10, pool_maxsize=10)
-        session.mount('http://', adapter)
-        session.mount('https://', adapter)
-        return session
+        # Shared pooled session; retries/backoff and the 'currents' rate limit live there
+        self.session = get_http_client().for_api('currents')
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=30))
     def get_latest_headlines(
         self,
         country: str = '',
@@ -439,7 +415,6 @@ class CurrentsClient:
             print(Fore.RED + f"Unexpected error in get_latest_headlines: {e}")
             return []
 
-    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=30))
     def search_news(
         self,
         query: str,
@@ -512,7 +487,10 @@ def main():
         print(f"URL: {news['url']}\n")
 
     # Process all news (should be run periodically, e.g., once a day)
-    processor.process_all_news()
+    try:
+        processor.process_all_news()
+    finally:
+        processor.close()
 
 if __name__ == "__main__":
     main()
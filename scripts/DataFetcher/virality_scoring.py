@@ -0,0 +1,230 @@
+"""
+CPU stage of virality evaluation.
+
+Downloading articles is I/O and stays on threads; the analysis below
+(keyword matching, TextBlob, VADER, textstat) is pure Python and holds the
+GIL, so it runs in a process pool instead. Each worker compiles the keyword
+list and builds its VADER analyzer once in its initializer and scores
+articles in batches. Workers live as long as their executor; NewsProcessor
+keeps one for its own lifetime, so that setup happens once per worker, not
+once per scoring cycle.
+
+Workers are started with ``forkserver`` (``spawn`` where it is missing), never
+``fork``. The pool is created from a process that already runs the bot's
+event loop, download threads and SQLite connections, and forking a
+multi-threaded process can deadlock the child.
+"""
+import multiprocessing
+import os
+import threading
+import logging
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from colorama import Fore
+
+from .keyword_matcher import KeywordMatcher, compile_keywords
+
+logger = logging.getLogger(__name__)
+
+SCORE_BATCH_SIZE = 8
+# Weight of cross-provider coverage: a story carried by many sources is already spreading
+CLUSTER_WEIGHT = 0.1
+DEFAULT_SCORING_PROCESSES = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+@dataclass
+class ArticleText:
+    url: str
+    title: str
+    text: str
+    summary: str = ""
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+
+def virality_score(
+    polarity_textblob: float,
+    compound_vader: float,
+    compound_title: float,
+    keyword_count: int,
+    keyword_total: int,
+    title_length: int,
+    readability: float,
+) -> float:
+    return (
+        (polarity_textblob * 0.1) +
+        (compound_vader * 0.1) +
+        (compound_title * 0.1) +
+        (keyword_count / max(keyword_total, 1) * 0.2) +
+        (1 / (title_length + 1) * 0.1) +
+        (1 / (readability + 1) * 0.1) +
+        0.4
+    )
+
+
+def with_cluster_signal(result: Dict[str, Any], cluster_size: int, cluster_urls: Sequence[str] = ()) -> Dict[str, Any]:
+    """Adds the near-duplicate cluster size to a scored result (saturates towards CLUSTER_WEIGHT)."""
+    cluster_size = max(1, cluster_size)
+    base = result.get('base_virality_score', result['virality_score'])
+    return {
+        **result,
+        'cluster_size': cluster_size,
+        'cluster_urls': [u for u in cluster_urls if u and u != result['url']],
+        'base_virality_score': base,
+        'virality_score': base + CLUSTER_WEIGHT * (1 - 1 / cluster_size),
+    }
+
+
+def _readability(text: str) -> float:
+    import textstat
+    try:
+        return textstat.flesch_kincaid_grade(text)
+    except Exception as e:
+        print(Fore.RED + f"Error analyzing readability: {e}")
+        return 0.0
+
+
+def score_documents(
+    docs: Sequence[ArticleText],
+    vader,
+    matcher: KeywordMatcher,
+) -> List[Dict[str, Any]]:
+    """Scores a batch of articles."""
+    from textblob import TextBlob
+
+    results = []
+    for doc in docs:
+        polarity = TextBlob(doc.text).sentiment.polarity
+        compound = vader.polarity_scores(doc.text)['compound']
+        title_compound = vader.polarity_scores(doc.title)['compound']
+        matches = matcher.match(doc.text)
+        keyword_count = matches.total
+        title_length = len(doc.title.split())
+        readability = _readability(doc.text)
+        results.append({
+            'url': doc.url,
+            'title': doc.title,
+            'summary': doc.summary,
+            'sentiment_polarity_textblob': polarity,
+            'sentiment_compound_vader': compound,
+            'sentiment_compound_title': title_compound,
+            'keyword_count': keyword_count,
+            'keyword_matches': dict(matches.counts),
+            'title_length': title_length,
+            'readability_score': readability,
+            'virality_score': virality_score(polarity, compound, title_compound, keyword_count,
+                                             len(matcher), title_length, readability),
+        })
+    return results
+
+
+# -- process pool ------------------------------------------------------------
+
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(keywords: List[str]) -> None:
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    _worker['vader'] = SentimentIntensityAnalyzer()
+    _worker['matcher'] = compile_keywords(keywords)
+
+
+def _score_in_worker(docs: List[ArticleText]) -> List[Dict[str, Any]]:
+    return score_documents(docs, _worker['vader'], _worker['matcher'])
+
+
+def _start_method() -> str:
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def create_scoring_executor(keywords: Sequence[str], processes: int = DEFAULT_SCORING_PROCESSES) -> ProcessPoolExecutor:
+    """Process pool whose workers are initialized for scoring (see the module docstring on start methods)."""
+    return ProcessPoolExecutor(
+        max_workers=max(1, processes),
+        mp_context=multiprocessing.get_context(_start_method()),
+        initializer=_init_worker,
+        initargs=(list(keywords),),
+    )
+
+
+class ScoringPool:
+    """
+    Process pool for the CPU stage; articles are buffered and sent in batches.
+
+    ``add`` is thread-safe, so download threads can hand articles over as soon
+    as they are fetched. ``results`` flushes the buffer and yields
+    ``(ArticleText, result)`` pairs as batches complete.
+
+    Pass a long-lived ``executor`` (``create_scoring_executor``) to reuse its
+    workers across pools; it is left running on shutdown. Otherwise the pool
+    creates its own and shuts it down with itself.
+    """
+
+    def __init__(
+        self,
+        keywords: Sequence[str] = (),
+        processes: int = DEFAULT_SCORING_PROCESSES,
+        batch_size: int = SCORE_BATCH_SIZE,
+        executor: Optional[ProcessPoolExecutor] = None,
+    ):
+        self.batch_size = max(1, batch_size)
+        self._owns_executor = executor is None
+        self._executor = executor or create_scoring_executor(keywords, processes)
+        self._lock = threading.Lock()
+        self._buffer: List[ArticleText] = []
+        self._batches: Dict[Future, List[ArticleText]] = {}
+        # Set once a worker died; a shared executor is then unusable and must be replaced
+        self.broken = False
+
+    def add(self, doc: ArticleText) -> None:
+        with self._lock:
+            self._buffer.append(doc)
+            if len(self._buffer) >= self.batch_size:
+                self._submit_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._buffer:
+                self._submit_locked()
+
+    def _submit_locked(self) -> None:
+        batch, self._buffer = self._buffer, []
+        try:
+            self._batches[self._executor.submit(_score_in_worker, batch)] = batch
+        except BrokenProcessPool:
+            self.broken = True
+            raise
+
+    def results(self) -> Iterator[tuple]:
+        self.flush()
+        with self._lock:
+            batches, self._batches = self._batches, {}
+        for future in as_completed(batches):
+            docs = batches[future]
+            try:
+                scored = future.result()
+            except BrokenProcessPool as e:
+                self.broken = True
+                print(Fore.RED + f"Error scoring {len(docs)} articles: {e}")
+                continue
+            except Exception as e:
+                print(Fore.RED + f"Error scoring {len(docs)} articles: {e}")
+                continue
+            yield from zip(docs, scored)
+
+    def shutdown(self) -> None:
+        if self._owns_executor:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            return
+        with self._lock:
+            batches, self._batches, self._buffer = self._batches, {}, []
+        for future in batches:
+            future.cancel()
+
+    def __enter__(self) -> "ScoringPool":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.shutdown()
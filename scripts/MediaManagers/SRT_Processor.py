@@ -1,106 +1,258 @@
 import re
+from typing import Dict, Iterable, Iterator, List, Sequence, Tuple
+
+import numpy as np
+
+TICKS_PER_SECOND = 10_000_000  # edge-tts WordBoundary offsets/durations (100 ns)
+
+_TIMING_RE = re.compile(
+    r"(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})\s*-->\s*(\d+):(\d{1,2}):(\d{1,2})[,.](\d{1,3})"
+)
+_NATURAL_BREAKS = np.array([ord(c) for c in ".,!?"], dtype=np.uint32)
+
+
+def _timestamp_to_seconds(h: str, m: str, s: str, ms: str) -> float:
+    return int(h) * 3600 + int(m) * 60 + int(s) + int(ms.ljust(3, "0")) / 1000
+
+
+def format_timestamp(seconds: float) -> str:
+    """Segundos a marca de tiempo SRT (HH:MM:SS,mmm), redondeando al milisegundo."""
+    ms = max(0, int(round(seconds * 1000)))
+    h, ms = divmod(ms, 3_600_000)
+    m, ms = divmod(ms, 60_000)
+    s, ms = divmod(ms, 1000)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+
+def iter_cues(lines: Iterable[str]) -> Iterator[Tuple[float, float, str]]:
+    """
+    Parser en streaming: recorre las líneas una a una y produce (inicio, fin, texto).
+
+    Acepta cues de varias líneas (unidas con "\\n"), índices ausentes, BOM, CRLF,
+    "." como separador de milisegundos y ajustes de posición tras el tiempo.
+    """
+    start = end = None
+    text: List[str] = []
+    for raw in lines:
+        line = raw.strip().lstrip("﻿")
+        timing = _TIMING_RE.search(line) if "-->" in line else None
+        if timing:
+            if start is not None and text:
+                # Cue sin línea en blanco de cierre: el índice quedó como texto
+                if text[-1].isdigit():
+                    text.pop()
+                if text:
+                    yield start, end, "\n".join(text)
+            g = timing.groups()
+            start, end = _timestamp_to_seconds(*g[:4]), _timestamp_to_seconds(*g[4:])
+            text = []
+        elif not line:
+            if start is not None and text:
+                yield start, end, "\n".join(text)
+            start, end, text = None, None, []
+        elif start is not None:
+            text.append(line)
+    if start is not None and text:
+        yield start, end, "\n".join(text)
+
+
+class SubtitleTrack:
+    """
+    Subtítulos en formato columnar: arrays de inicio/fin (segundos) y offsets
+    sobre un único buffer de texto, en lugar de un dict por cue.
+
+    El texto del cue i es ``buffer[offsets[i]:offsets[i + 1]]``.
+    """
+
+    def __init__(self, starts: np.ndarray, ends: np.ndarray, offsets: np.ndarray, buffer: str):
+        self.starts = np.asarray(starts, dtype=np.float64)
+        self.ends = np.asarray(ends, dtype=np.float64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.buffer = buffer
+
+    # -- construcción ------------------------------------------------------
+
+    @classmethod
+    def from_cues(cls, starts: Sequence[float], ends: Sequence[float], texts: Sequence[str]) -> "SubtitleTrack":
+        texts = [t.strip() for t in texts]
+        offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+        np.cumsum([len(t) for t in texts], out=offsets[1:])
+        return cls(np.asarray(starts, dtype=np.float64), np.asarray(ends, dtype=np.float64), offsets, "".join(texts))
+
+    @classmethod
+    def from_boundaries(cls, boundaries: Sequence[Dict]) -> "SubtitleTrack":
+        """Un cue por evento WordBoundary/SentenceBoundary de edge-tts."""
+        offsets = np.fromiter((b["offset"] for b in boundaries), dtype=np.float64, count=len(boundaries))
+        durations = np.fromiter((b["duration"] for b in boundaries), dtype=np.float64, count=len(boundaries))
+        starts = offsets / TICKS_PER_SECOND
+        return cls.from_cues(starts, starts + durations / TICKS_PER_SECOND, [b["text"] for b in boundaries])
+
+    @classmethod
+    def parse(cls, lines: Iterable[str]) -> "SubtitleTrack":
+        starts, ends, texts = [], [], []
+        for start, end, text in iter_cues(lines):
+            starts.append(start)
+            ends.append(end)
+            texts.append(text)
+        return cls.from_cues(starts, ends, texts)
+
+    @classmethod
+    def read(cls, path: str) -> "SubtitleTrack":
+        with open(path, "r", encoding="utf-8-sig") as file:
+            return cls.parse(file)
+
+    # -- acceso --------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def text(self, i: int) -> str:
+        return self.buffer[self.offsets[i]:self.offsets[i + 1]]
+
+    def texts(self) -> List[str]:
+        o = self.offsets.tolist()
+        return [self.buffer[o[i]:o[i + 1]] for i in range(len(self))]
+
+    def word_counts(self) -> np.ndarray:
+        """Palabras por cue (número de espacios/saltos + 1 en cues no vacíos)."""
+        codes = self._codes()
+        is_space = np.isin(codes, (32, 10)).astype(np.int64)
+        cum = np.concatenate(([0], np.cumsum(is_space)))
+        spaces = cum[self.offsets[1:]] - cum[self.offsets[:-1]]
+        return np.where(self.offsets[1:] > self.offsets[:-1], spaces + 1, 0)
+
+    def _codes(self) -> np.ndarray:
+        return np.frombuffer(self.buffer.encode("utf-32-le"), dtype=np.uint32)
+
+    def natural_breaks(self) -> np.ndarray:
+        """True donde el cue termina en puntuación de pausa (. , ! ?)."""
+        lengths = np.diff(self.offsets)
+        if not len(lengths):
+            return np.zeros(0, dtype=bool)
+        last = self._codes()[np.maximum(self.offsets[1:] - 1, 0)] if self.buffer else np.zeros(len(lengths), np.uint32)
+        return (lengths > 0) & np.isin(last, _NATURAL_BREAKS)
+
+    # -- agrupación ----------------------------------------------------------
+
+    def group_bounds(self, max_duration: float, max_words: int, pause_threshold: float) -> np.ndarray:
+        """
+        Índices de inicio de cada grupo (más len(self) al final).
+
+        Para cada cue i se calcula de forma vectorizada dónde terminaría un grupo
+        que empezase en i: el siguiente corte por pausa tras puntuación, el primer
+        cue que supera max_duration y el límite de max_words. Después basta con
+        saltar de grupo en grupo.
+        """
+        n = len(self)
+        if n == 0:
+            return np.zeros(1, dtype=np.int64)
+        idx = np.arange(n)
+        pause_cut = np.zeros(n, dtype=bool)
+        pause_cut[1:] = ((self.starts[1:] - self.ends[:-1]) > pause_threshold) & self.natural_breaks()[:-1]
+        cut_idx = np.append(np.flatnonzero(pause_cut), n)
+        next_cut = cut_idx[np.searchsorted(cut_idx, idx, side="right")]
+
+        ends_max = np.maximum.accumulate(self.ends)
+        duration_stop = np.searchsorted(ends_max, self.starts + max_duration, side="right")
+
+        cum_words = np.concatenate(([0], np.cumsum(self.word_counts())))
+        words_stop = np.searchsorted(cum_words, cum_words[:-1] + max_words, side="right") - 1
+
+        stop = np.minimum.reduce([next_cut, duration_stop, words_stop, idx + max_words])
+        stop = np.maximum(stop, idx + 1).tolist()  # un grupo siempre incluye su primer cue
+
+        bounds = [0]
+        i = 0
+        while i < n:
+            i = stop[i]
+            bounds.append(i)
+        return np.asarray(bounds, dtype=np.int64)
+
+    def regroup(self, max_duration: float = 2.0, max_words: int = 5, pause_threshold: float = 0.3) -> "SubtitleTrack":
+        bounds = self.group_bounds(max_duration, max_words, pause_threshold)
+        first, last = bounds[:-1], bounds[1:] - 1
+        texts = self.texts()
+        joined = [" ".join(texts[a:b]) for a, b in zip(first.tolist(), bounds[1:].tolist())]
+        return SubtitleTrack.from_cues(self.starts[first], self.ends[last], joined)
+
+    # -- escritura -----------------------------------------------------------
+
+    def to_srt(self) -> str:
+        texts = self.texts()
+        return "\n".join(
+            f"{i}\n{format_timestamp(start)} --> {format_timestamp(end)}\n{text}\n"
+            for i, (start, end, text) in enumerate(zip(self.starts.tolist(), self.ends.tolist(), texts), 1)
+        )
+
+    def write(self, path: str) -> str:
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(self.to_srt())
+        return path
+
 
 class SRTProcessor:
-    def __init__(self, input_file, max_duration=2.0, max_words=5, pause_threshold=0.3):
+    def __init__(self, input_file, max_duration=2.0, max_words=5, pause_threshold=0.3, output_file=None):
         """
         Procesador de subtítulos SRT para agrupar palabras en frases con mejor fluidez.
-        
-        :param input_file: Archivo SRT de entrada (será sobrescrito).
+
+        :param input_file: Archivo SRT de entrada (será sobrescrito salvo que se indique output_file).
         :param max_duration: Máximo tiempo en segundos por frase.
         :param max_words: Máximo número de palabras por frase.
         :param pause_threshold: Tiempo de pausa mínima (segundos) para permitir grupos más largos.
+        :param output_file: Archivo de salida opcional.
         """
         self.input_file = input_file
+        self.output_file = output_file or input_file
         self.max_duration = max_duration
         self.max_words = max_words
         self.pause_threshold = pause_threshold
 
+    def load(self) -> SubtitleTrack:
+        return SubtitleTrack.read(self.input_file)
+
     def parse_srt(self):
-        """Lee el archivo SRT en memoria y extrae los tiempos y palabras."""
-        pattern = re.compile(r"(\d+)\n(\d{2}:\d{2}:\d{2},\d{3}) --> (\d{2}:\d{2}:\d{2},\d{3})\n(.+)")
-        subtitles = []
-
-        with open(self.input_file, "r", encoding="utf-8") as file:
-            content = file.read()
-
-        matches = pattern.findall(content)
-        for index, start, end, text in matches:
-            subtitles.append({
-                "index": int(index),
-                "start": self.srt_time_to_seconds(start),
-                "end": self.srt_time_to_seconds(end),
-                "text": text
-            })
-        
-        return subtitles
+        """Lee el archivo SRT y extrae los tiempos y textos (cues de varias líneas incluidos)."""
+        track = self.load()
+        return [
+            {"index": i, "start": start, "end": end, "text": text}
+            for i, (start, end, text) in enumerate(zip(track.starts.tolist(), track.ends.tolist(), track.texts()), 1)
+        ]
 
     def srt_time_to_seconds(self, time_str):
         """Convierte un tiempo SRT a segundos."""
-        h, m, s, ms = map(int, re.split("[:,]", time_str))
-        return h * 3600 + m * 60 + s + ms / 1000
+        h, m, s, ms = re.split("[:,.]", time_str)
+        return _timestamp_to_seconds(h, m, s, ms)
 
     def seconds_to_srt_time(self, seconds):
         """Convierte segundos a formato SRT."""
-        h = int(seconds // 3600)
-        m = int((seconds % 3600) // 60)
-        s = int(seconds % 60)
-        ms = int((seconds - int(seconds)) * 1000)
-        return f"{h:02}:{m:02}:{s:02},{ms:03}"
+        return format_timestamp(seconds)
 
     def is_natural_break(self, text):
         """Verifica si una palabra es un punto de pausa natural."""
         return text.endswith((".", ",", "!", "?"))
 
+    def group_track(self, track: SubtitleTrack) -> SubtitleTrack:
+        return track.regroup(self.max_duration, self.max_words, self.pause_threshold)
+
     def group_subtitles(self, subtitles):
         """Agrupa palabras en frases con mejor sincronización y fluidez."""
-        grouped = []
-        temp_group = []
-        group_start = None
-        last_end = None
-
-        for sub in subtitles:
-            if not temp_group:
-                temp_group.append(sub)
-                group_start = sub["start"]
-                last_end = sub["end"]
-            else:
-                pause = sub["start"] - last_end
-                last_end = sub["end"]
-
-                if pause > self.pause_threshold and self.is_natural_break(temp_group[-1]["text"]):
-                    grouped.append(temp_group)
-                    temp_group = [sub]
-                    group_start = sub["start"]
-                else:
-                    if (sub["end"] - group_start > self.max_duration) or (len(temp_group) >= self.max_words):
-                        grouped.append(temp_group)
-                        temp_group = [sub]
-                        group_start = sub["start"]
-                    else:
-                        temp_group.append(sub)
-
-        if temp_group:
-            grouped.append(temp_group)
-
-        return grouped
+        track = SubtitleTrack.from_cues(
+            [s["start"] for s in subtitles], [s["end"] for s in subtitles], [s["text"] for s in subtitles]
+        )
+        bounds = track.group_bounds(self.max_duration, self.max_words, self.pause_threshold).tolist()
+        return [subtitles[a:b] for a, b in zip(bounds[:-1], bounds[1:])]
 
     def write_srt(self, grouped_subtitles):
-        """Sobrescribe el archivo SRT original con las frases agrupadas."""
-        with open(self.input_file, "w", encoding="utf-8") as file:
-            index = 1
-            for group in grouped_subtitles:
-                start_time = self.seconds_to_srt_time(group[0]["start"])
-                end_time = self.seconds_to_srt_time(group[-1]["end"])
-                text = " ".join(sub["text"] for sub in group)
-
-                file.write(f"{index}\n{start_time} --> {end_time}\n{text}\n\n")
-                index += 1
+        """Escribe las frases agrupadas en el archivo de salida."""
+        SubtitleTrack.from_cues(
+            [group[0]["start"] for group in grouped_subtitles],
+            [group[-1]["end"] for group in grouped_subtitles],
+            [" ".join(sub["text"] for sub in group) for group in grouped_subtitles],
+        ).write(self.output_file)
 
     def process(self):
-        """Ejecuta todo el proceso en el mismo archivo."""
-        subtitles = self.parse_srt()
-        grouped_subtitles = self.group_subtitles(subtitles)
-        self.write_srt(grouped_subtitles)
+        """Ejecuta todo el proceso: lectura, agrupación y escritura sin pasar por dicts."""
+        self.group_track(self.load()).write(self.output_file)
 
 # # Uso:
 # input_srt = "scripts\MediaManagers\word_level_subtitles.srt"
@@ -0,0 +1,148 @@
+"""
+Offline benchmark of the content (LLM) stage.
+
+Runs Chatbot.generate_article_and_phrases_short / _long against the replay
+provider (scripts/AI/llm_replay.py), so results depend only on the fixture file
+and the latency model, never on live providers or the network.
+
+Usage:
+    python -m scripts.benchmark_content_stage --runs 5 --latency lognormal --mean-ms 800
+    python -m scripts.benchmark_content_stage --fixtures my_capture.json --output metrics/content_stage.json
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List
+
+import scripts.AI.natural_language_generation as nlg
+from scripts.AI.llm_replay import DEFAULT_FIXTURES
+from scripts.AI.natural_language_generation import Chatbot, LLMProvider
+
+DEFAULT_TOPIC = "Los alquileres en España suben un doce por ciento en un año"
+
+
+class _ParseTimer:
+    """Wraps the Chatbot's JSON parser to accumulate time spent parsing responses."""
+
+    def __init__(self):
+        self.seconds = 0.0
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._original = nlg.parse_json_object
+
+    def __enter__(self):
+        original = self._original
+
+        def timed(text):
+            start = time.perf_counter()
+            try:
+                return original(text)
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._lock:
+                    self.seconds += elapsed
+                    self.calls += 1
+
+        nlg.parse_json_object = timed
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        nlg.parse_json_object = self._original
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def run_benchmark(
+    fixtures: str = str(DEFAULT_FIXTURES),
+    latency: Dict[str, Any] = None,
+    runs: int = 3,
+    max_concurrency: int = 6,
+    language: str = "es",
+    topic: str = DEFAULT_TOPIC,
+) -> Dict[str, Any]:
+    """Return wall time, token throughput and parse time per content flow."""
+    results: Dict[str, Any] = {}
+    for flow in ("short", "long"):
+        provider = LLMProvider([{
+            "type": "replay",
+            "fixtures": fixtures,
+            "latency": latency or {},
+            "max_concurrency": max_concurrency,
+        }])
+        client = provider.client("replay")
+        chatbot = Chatbot(language=language, model="replay", llm=provider)
+        generate = chatbot.generate_article_and_phrases_short if flow == "short" else chatbot.generate_article_and_phrases_long
+
+        walls = []
+        with _ParseTimer() as parse_timer:
+            for _ in range(runs):
+                start = time.perf_counter()
+                generate(topic)
+                walls.append(time.perf_counter() - start)
+
+        total_wall = sum(walls)
+        results[flow] = {
+            "runs": runs,
+            "wall_s_mean": round(statistics.mean(walls), 4),
+            "wall_s_p50": round(_percentile(walls, 50), 4),
+            "wall_s_p95": round(_percentile(walls, 95), 4),
+            "llm_calls": client.calls,
+            "output_tokens": client.output_tokens,
+            "tokens_per_s": round(client.output_tokens / total_wall, 1) if total_wall else 0.0,
+            "parse_ms_total": round(parse_timer.seconds * 1000, 3),
+            "parse_us_per_call": round(parse_timer.seconds / parse_timer.calls * 1e6, 2) if parse_timer.calls else 0.0,
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the content stage against recorded LLM fixtures.")
+    parser.add_argument("--fixtures", default=str(DEFAULT_FIXTURES))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=6, help="Replay provider max_concurrency")
+    parser.add_argument("--latency", default="none", choices=["none", "fixed", "uniform", "normal", "lognormal"])
+    parser.add_argument("--mean-ms", type=float, default=0.0)
+    parser.add_argument("--min-ms", type=float, default=0.0)
+    parser.add_argument("--max-ms", type=float, default=0.0)
+    parser.add_argument("--stddev-ms", type=float, default=0.0)
+    parser.add_argument("--sigma", type=float, default=0.5)
+    parser.add_argument("--per-token-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the results as JSON to this path")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    latency = {
+        "distribution": args.latency, "mean_ms": args.mean_ms, "min_ms": args.min_ms, "max_ms": args.max_ms,
+        "stddev_ms": args.stddev_ms, "sigma": args.sigma, "per_token_ms": args.per_token_ms, "seed": args.seed,
+    }
+    fixtures = os.path.abspath(args.fixtures)
+    output = os.path.abspath(args.output) if args.output else None
+
+    # Chatbot writes its bundles and context cache under ./.temp; keep them out of the tree
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            results = run_benchmark(fixtures, latency, args.runs, args.concurrency)
+        finally:
+            os.chdir(cwd)
+
+    print(json.dumps(results, indent=2))
+    if output:
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_SCORE_DB = 'article_scores.db'
+DEFAULT_HALF_LIFE_HOURS = 12.0
+DEFAULT_RETENTION_DAYS = 30
+
+_TRACKING_PARAMS = ('utm_', 'fbclid', 'gclid', 'mc_cid', 'mc_eid', 'ocid', 'cmpid', 'ref', 'ref_src')
+
+
+def normalize_url(url: str) -> str:
+    """
+    Canonical form of an article URL: lowercase scheme/host without "www.",
+    no fragment, tracking parameters dropped, remaining query sorted and no
+    trailing slash. Different links to the same article map to one key.
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not k.lower().startswith(_TRACKING_PARAMS)
+    )
+    path = parts.path.rstrip('/') or '/'
+    return urlunsplit(((parts.scheme or 'https').lower(), host, path, urlencode(query), ''))
+
+
+def text_hash(*parts: Optional[str]) -> str:
+    payload = '\x1f'.join(' '.join((p or '').split()) for p in parts)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ArticleScoreStore:
+    """
+    Persistent virality scores, keyed by normalized URL and indexed by content hash.
+
+    feed_hash is the hash of the title/description a source listed the article
+    with: while it doesn't change, the article is neither downloaded nor scored
+    again. content_hash is the hash of the extracted text, so the same story
+    under a different URL reuses its scores.
+    """
+
+    def __init__(self, db_name: str = DEFAULT_SCORE_DB):
+        self.db_name = db_name
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_name, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self.init_db()
+
+    def init_db(self):
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS article_scores (
+                    url_key TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    feed_hash TEXT,
+                    content_hash TEXT,
+                    published_at REAL,
+                    scored_at REAL NOT NULL,
+                    virality_score REAL NOT NULL,
+                    result TEXT NOT NULL
+                )
+            ''')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_scores_content ON article_scores(content_hash)')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_scores_published ON article_scores(published_at)')
+            self._conn.commit()
+
+    def is_current(self, url: str, feed_hash: str) -> bool:
+        """True when the article was already scored from the same listing."""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT feed_hash FROM article_scores WHERE url_key = ?', (normalize_url(url),)
+            ).fetchone()
+        return row is not None and row['feed_hash'] == feed_hash
+
+    def find_by_content(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT result FROM article_scores WHERE content_hash = ? ORDER BY scored_at DESC LIMIT 1',
+                (content_hash,)
+            ).fetchone()
+        return json.loads(row['result']) if row else None
+
+    def upsert(
+        self,
+        result: Dict[str, Any],
+        feed_hash: Optional[str],
+        content_hash: Optional[str],
+        published_at: Optional[float],
+    ) -> None:
+        with self._lock:
+            self._conn.execute('''
+                INSERT INTO article_scores
+                    (url_key, url, feed_hash, content_hash, published_at, scored_at, virality_score, result)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(url_key) DO UPDATE SET
+                    url = excluded.url,
+                    feed_hash = excluded.feed_hash,
+                    content_hash = excluded.content_hash,
+                    published_at = COALESCE(excluded.published_at, article_scores.published_at),
+                    scored_at = excluded.scored_at,
+                    virality_score = excluded.virality_score,
+                    result = excluded.result
+            ''', (
+                normalize_url(result['url']), result['url'], feed_hash, content_hash, published_at,
+                time.time(), result['virality_score'], json.dumps(result, ensure_ascii=False),
+            ))
+            self._conn.commit()
+
+    def ranked(
+        self,
+        threshold: float,
+        window_days: float,
+        half_life_hours: float = DEFAULT_HALF_LIFE_HOURS,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Articles above `threshold` published within the window, ordered by
+        virality decayed exponentially with age (halved every `half_life_hours`).
+        """
+        now = time.time()
+        since = now - window_days * 86400
+        with self._lock:
+            rows = self._conn.execute('''
+                SELECT result, virality_score, COALESCE(published_at, scored_at) AS ts
+                FROM article_scores
+                WHERE virality_score > ? AND COALESCE(published_at, scored_at) >= ?
+            ''', (threshold, since)).fetchall()
+        ranked = []
+        for row in rows:
+            age_hours = max(0.0, now - row['ts']) / 3600
+            news = json.loads(row['result'])
+            news['decayed_score'] = row['virality_score'] * 0.5 ** (age_hours / half_life_hours)
+            ranked.append(news)
+        ranked.sort(key=lambda news: news['decayed_score'], reverse=True)
+        return ranked[:limit] if limit else ranked
+
+    def prune(self, retention_days: float = DEFAULT_RETENTION_DAYS) -> int:
+        cutoff = time.time() - retention_days * 86400
+        with self._lock:
+            deleted = self._conn.execute(
+                'DELETE FROM article_scores WHERE COALESCE(published_at, scored_at) < ?', (cutoff,)
+            ).rowcount
+            self._conn.commit()
+        return deleted
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM article_scores').fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -16,7 +16,8 @@ from moviepy.video.fx import resize, crop
 from colorama import init, Fore
 from PIL import Image, ImageDraw, ImageFont
 import numpy as np
-from pydub import AudioSegment
+
+from scripts.utils.music_prep import FADE_OUT_SECONDS, music_bed
 
 log = logging.getLogger(__name__)
 
@@ -59,7 +60,6 @@ def _resolve_font_path(font_path: str) -> str:
     print(Fore.YELLOW + f"Font not found: {font_path}. No fallback found.")
     return font_path
 TEMP_DIR = ".temp"
-TEMP_MUSIC_FILENAME = "temp_music.wav"
 
 # ------------------ ENUMS ------------------
 class Position(Enum):
@@ -165,22 +165,15 @@ class AudioHelper:
 
     @staticmethod
     def add_background_music(video, music_file: str, audio_duration: float):
-        """Agrega música de fondo a un video."""
+        """Agrega música de fondo a un video (pista ya nivelada en caché, recortada y con fundido aquí)."""
         try:
-            music = AudioSegment.from_mp3(music_file)
-            os.makedirs(TEMP_DIR, exist_ok=True)
-            temp_music_path = os.path.join(TEMP_DIR, TEMP_MUSIC_FILENAME)
-            music.export(temp_music_path, format="wav")
-
-            with AudioFileClip(temp_music_path) as music_clip:
-                music_clip = (
-                    music_clip
-                    .volumex(0.2)
-                    .subclip(0, audio_duration)
-                    .audio_fadeout(2)
-                )
-                composite_audio = CompositeAudioClip([video.audio, music_clip])
-                video = video.set_audio(composite_audio)
+            bed_path, volume = music_bed(music_file, audio_duration)
+            music_clip = AudioFileClip(bed_path)
+            if volume is not None:
+                music_clip = music_clip.volumex(volume)
+            music_clip = music_clip.subclip(0, min(audio_duration, music_clip.duration)).audio_fadeout(FADE_OUT_SECONDS)
+            composite_audio = CompositeAudioClip([video.audio, music_clip])
+            video = video.set_audio(composite_audio)
         except Exception as e:
             raise ValueError(Fore.RED + f"❌ Error processing background music: {e}")
         return video
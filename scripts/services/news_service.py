@@ -2,7 +2,6 @@ from typing import Dict, Any, List
 import logging
 from pathlib import Path
 from scripts.AI.natural_language_generation import Chatbot
-from scripts.DataFetcher.news_extractor import NewsExtractor
 from ..interfaces import NewsProcessor
 from ..utils.app_logger import trace
 
@@ -15,23 +14,27 @@ class ArticleProcessor(NewsProcessor):
         language: str = "en",
         model: str = "nemotron-3-super:cloud",
         providers: list = None,
-        logger: logging.Logger = None
+        logger: logging.Logger = None,
+        measure_prompt_cache: bool = False
     ):
         self.logger = logger or logging.getLogger(__name__)
-        self.chatbot = Chatbot(language=language, model=model, providers=providers)
-        self.extractor = NewsExtractor()
+        self.chatbot = Chatbot(
+            language=language, model=model, providers=providers,
+            measure_prompt_cache=measure_prompt_cache
+        )
 
     @trace()
     def process_article(self, url: str) -> Dict[str, Any]:
         """Process news article and generate required content"""
         try:
-            # Extract article content
-            article_data = self.extractor.extract_article(url)
-            if not article_data or not getattr(article_data, 'text', None):
+            # Extract article content once, trimmed to the LLM token budget;
+            # the chatbot reuses this prepared context for generation
+            prepared = self.chatbot.prepare_context(url)
+            if not prepared or not prepared.text:
                 raise ValueError("Failed to extract article content")
 
-            title = getattr(article_data, 'title', '') or url
-            raw_text = article_data.text[:3000]  # Limit for processing
+            title = prepared.title or url
+            raw_text = prepared.text
 
             # Try LLM content generation; fall back to using extracted text directly
             try:
@@ -94,12 +97,12 @@ class ShortFormProcessor(ArticleProcessor):
     def process_article(self, url: str) -> Dict[str, Any]:
         try:
             # Override with short-form specific processing
-            article_data = self.extractor.extract_article(url)
-            if not article_data or not getattr(article_data, 'text', None):
+            prepared = self.chatbot.prepare_context(url)
+            if not prepared or not prepared.text:
                 raise ValueError("Failed to extract article content")
 
-            title = getattr(article_data, 'title', '') or url
-            raw_text = article_data.text[:2000]
+            title = prepared.title or url
+            raw_text = prepared.text
 
             # Try LLM content generation; fall back to using extracted text directly
             try:
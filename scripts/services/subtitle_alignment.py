@@ -0,0 +1,319 @@
+"""
+Offline alignment of a known script to its narration.
+
+Two aligners, both linear in the length of the input:
+
+* ``align_to_boundaries`` - banded DTW between the script's words and the
+  per-word boundaries reported by the TTS engine (edge-tts WordBoundary events).
+  Exact when boundaries are available.
+* ``align_by_energy`` - frame RMS energy marks speech and pauses. Line by line,
+  the remaining characters are spread over the remaining voiced time and the
+  line start is snapped to the nearest pause onset, which re-anchors the
+  estimate so rate errors do not accumulate. Needs only the audio; without
+  pauses it degrades to plain character-rate interpolation.
+
+Both return ``len(lines) + 1`` timestamps in seconds: the start of every line
+followed by the end of the last one. ``boundaries_from_audio`` turns the
+energy alignment into edge-tts style word boundaries for narrations
+synthesized without them.
+"""
+import re
+import time
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TICKS_PER_SECOND = 10_000_000  # edge-tts boundary offsets/durations are in 100 ns units
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def _normalize(word: str) -> str:
+    return "".join(_WORD_RE.findall(word.lower()))
+
+
+# -- DTW against TTS word boundaries ---------------------------------------
+
+def _word_cost(a: str, b: str) -> float:
+    if a == b:
+        return 0.0
+    if a and b and (a.startswith(b) or b.startswith(a)):
+        return 0.5
+    return 1.0
+
+
+def dtw_path(source: Sequence[str], target: Sequence[str], band: Optional[int] = None) -> List[int]:
+    """
+    Monotonic alignment of `source` tokens to `target` tokens.
+
+    Returns, for every source index, the index of the target token it maps to.
+    Only cells within `band` of the diagonal are evaluated, so the cost is
+    O(len(source) * band).
+    """
+    n, m = len(source), len(target)
+    if n == 0:
+        return []
+    if m == 0:
+        raise ValueError("Cannot align against an empty target")
+    band = band or max(16, abs(n - m) + 16)
+    inf = float("inf")
+    slope = m / n
+    # Per row i: the window [lo, hi) of target indices evaluated, its costs and back-pointers
+    rows: List[Tuple[int, List[float], List[int]]] = []
+    prev_lo, prev_cost = 0, None
+    for i in range(n):
+        center = int(i * slope)
+        lo, hi = max(0, center - band), min(m, center + band + 1)
+        cost = [inf] * (hi - lo)
+        back = [0] * (hi - lo)  # 0 = diagonal, 1 = from above (same j), 2 = from left (same i)
+        for k in range(hi - lo):
+            j = lo + k
+            local = _word_cost(source[i], target[j])
+            if i == 0 and j == 0:
+                cost[k] = local
+                continue
+            best, move = inf, 0
+            if prev_cost is not None:
+                pj = j - 1 - prev_lo
+                if 0 <= pj < len(prev_cost) and prev_cost[pj] < best:
+                    best, move = prev_cost[pj], 0
+                pj = j - prev_lo
+                if 0 <= pj < len(prev_cost) and prev_cost[pj] < best:
+                    best, move = prev_cost[pj], 1
+            if k > 0 and cost[k - 1] < best:
+                best, move = cost[k - 1], 2
+            if best < inf:
+                cost[k] = best + local
+                back[k] = move
+        rows.append((lo, cost, back))
+        prev_lo, prev_cost = lo, cost
+
+    # Backtrack from the cheapest end cell of the last row (the tail may be unmatched TTS tokens)
+    lo, cost, _ = rows[-1]
+    k = min(range(len(cost)), key=lambda idx: (cost[idx], -idx))
+    i, j = n - 1, lo + k
+    mapping = [0] * n
+    while i >= 0:
+        lo, _, back = rows[i]
+        mapping[i] = j
+        move = back[j - lo]
+        if i == 0 and j == 0:
+            break
+        if move == 0:
+            i, j = i - 1, j - 1
+        elif move == 1:
+            i -= 1
+        else:
+            j -= 1
+    return mapping
+
+
+def align_to_boundaries(lines: Sequence[str], boundaries: Sequence[Dict]) -> List[float]:
+    """Line timings from TTS word boundaries (edge-tts dicts with offset/duration/text)."""
+    words, line_first = [], []
+    for line in lines:
+        line_first.append(len(words))
+        words.extend(_normalize(w) for w in line.split())
+    tokens = [_normalize(b["text"]) for b in boundaries]
+    starts = [b["offset"] / TICKS_PER_SECOND for b in boundaries]
+    end = (boundaries[-1]["offset"] + boundaries[-1]["duration"]) / TICKS_PER_SECOND if boundaries else 0.0
+    if not words or not tokens:
+        return [0.0] * (len(lines) + 1)
+    mapping = dtw_path(words, tokens)
+    timings = []
+    for first in line_first:
+        timings.append(starts[mapping[min(first, len(words) - 1)]] if first < len(words) else end)
+    timings.append(end)
+    # Monotonic even if two lines collapse onto the same boundary
+    for idx in range(1, len(timings)):
+        timings[idx] = max(timings[idx], timings[idx - 1])
+    return timings
+
+
+# -- Energy / VAD + character-rate interpolation ---------------------------
+
+def voiced_frames(
+    samples: np.ndarray,
+    sample_rate: int,
+    frame_ms: int = 20,
+    threshold_db: float = -35.0,
+    min_pause_ms: int = 120,
+) -> Tuple[np.ndarray, float]:
+    """
+    Boolean speech mask per frame and the frame length in seconds.
+
+    A frame is voiced when its RMS is within `threshold_db` of the loudest
+    frame; pauses shorter than `min_pause_ms` are treated as speech.
+    """
+    frame = max(1, int(sample_rate * frame_ms / 1000))
+    count = len(samples) // frame
+    if count == 0:
+        return np.zeros(0, dtype=bool), frame / sample_rate
+    frames = samples[:count * frame].astype(np.float32).reshape(count, frame)
+    rms = np.sqrt(np.mean(frames * frames, axis=1)) + 1e-9
+    level = 20 * np.log10(rms / rms.max())
+    voiced = level > threshold_db
+
+    # Close short gaps: run-length encode the silent stretches and flip the short ones
+    min_gap = max(1, int(min_pause_ms / frame_ms))
+    edges = np.diff(np.concatenate(([1], voiced.astype(np.int8), [1])))
+    gap_starts, gap_ends = np.flatnonzero(edges == -1), np.flatnonzero(edges == 1)
+    for start, stop in zip(gap_starts, gap_ends):
+        if stop - start < min_gap and start > 0 and stop < count:
+            voiced[start:stop] = True
+    return voiced, frame / sample_rate
+
+
+def align_by_energy(
+    lines: Sequence[str],
+    samples: np.ndarray,
+    sample_rate: int,
+    snap_s: float = 0.35,
+    **vad_kwargs,
+) -> List[float]:
+    """
+    Line timings from the audio alone.
+
+    A line start is snapped to a speech onset within `snap_s`, or within half
+    the line's estimated duration when that is longer.
+    """
+    voiced, frame_s = voiced_frames(samples, sample_rate, **vad_kwargs)
+    total_s = len(samples) / sample_rate
+    if not lines:
+        return [0.0]
+    if not voiced.any():
+        step = total_s / len(lines)
+        return [i * step for i in range(len(lines) + 1)]
+
+    # Voiced time before each frame boundary: cum_voiced[f] is the speech in frames [0, f)
+    cum_voiced = np.concatenate(([0.0], np.cumsum(voiced) * frame_s))
+    onset_s = (np.flatnonzero(np.diff(voiced.astype(np.int8)) == 1) + 1) * frame_s
+    weights = [max(len(line), 1) for line in lines]
+    remaining = float(sum(weights))
+
+    first_voiced = np.argmax(voiced) * frame_s
+    last_voiced = (len(voiced) - np.argmax(voiced[::-1])) * frame_s
+    timings = [first_voiced]
+    cursor = first_voiced
+    for weight in weights[:-1]:
+        # Spread the speech left after the cursor over the characters left
+        done = cum_voiced[int(round(cursor / frame_s))]
+        target = done + (cum_voiced[-1] - done) * weight / remaining
+        estimate = np.searchsorted(cum_voiced, target, side="left") * frame_s
+        remaining -= weight
+
+        window = max(snap_s, 0.5 * (estimate - cursor))
+        pos = int(np.searchsorted(onset_s, estimate))
+        candidates = [onset_s[k] for k in (pos - 1, pos) if 0 <= k < len(onset_s) and onset_s[k] > cursor]
+        nearest = min(candidates, key=lambda onset: abs(onset - estimate), default=None)
+        if nearest is not None and abs(nearest - estimate) <= window:
+            estimate = nearest
+        cursor = max(cursor, estimate)
+        timings.append(cursor)
+    timings.append(max(cursor, min(total_s, last_voiced)))
+    return [float(t) for t in timings]
+
+
+def boundaries_from_audio(text: str, samples: np.ndarray, sample_rate: int, **kwargs) -> List[Dict]:
+    """Estimated WordBoundary events (offset/duration in 100 ns ticks) for `text` spoken in `samples`."""
+    words = text.split()
+    if not words:
+        return []
+    timings = align_by_energy(words, samples, sample_rate, **kwargs)
+    return [
+        {
+            "offset": int(round(start * TICKS_PER_SECOND)),
+            "duration": int(round(max(end - start, 0.0) * TICKS_PER_SECOND)),
+            "text": word,
+        }
+        for word, start, end in zip(words, timings, timings[1:])
+    ]
+
+
+# -- Benchmark -------------------------------------------------------------
+
+def _synthetic_fixture(n_lines: int, sample_rate: int = 16000, seed: int = 0, pause_s: float = 0.25,
+                       rate_jitter: float = 0.2):
+    """
+    Noise bursts standing in for speech, with the true start of every line.
+
+    Each line is spoken at 70 ms per character +/- `rate_jitter` (so character
+    share is only an estimate of time) and followed by `pause_s` of silence;
+    with pause_s=0 the lines run together like continuous speech.
+    """
+    rng = np.random.default_rng(seed)
+    lines, pieces, truth, rates, t = [], [], [], [], 0.0
+    pause = np.zeros(int(pause_s * sample_rate), dtype=np.float32)
+    for _ in range(n_lines):
+        line = " ".join("palabra" for _ in range(rng.integers(3, 9)))
+        rate = 0.07 * (1 + rng.uniform(-rate_jitter, rate_jitter))
+        lines.append(line)
+        truth.append(t)
+        rates.append(rate)
+        burst = (rng.standard_normal(int(len(line) * rate * sample_rate)) * 0.3).astype(np.float32)
+        pieces.extend((burst, pause))
+        t += (len(burst) + len(pause)) / sample_rate
+    return lines, np.concatenate(pieces), truth, rates
+
+
+def benchmark(sizes: Sequence[int] = (50, 200, 800), sample_rate: int = 16000) -> Dict[str, Dict[str, float]]:
+    """
+    Runtime and mean absolute line-start error of both aligners on synthetic fixtures.
+
+    "paused" puts 250 ms of silence after every line, where snapping to pause
+    onsets is exact; "continuous" has no pauses, so the energy aligner falls
+    back to character-rate interpolation alone.
+    """
+    results = {}
+    for label, pause_s in (("paused", 0.25), ("continuous", 0.0)):
+        for n in sizes:
+            results[f"{label}_{n}"] = _benchmark_case(n, sample_rate, pause_s)
+    return results
+
+
+def _benchmark_case(n: int, sample_rate: int, pause_s: float) -> Dict[str, float]:
+    lines, samples, truth, rates = _synthetic_fixture(n, sample_rate, pause_s=pause_s)
+    start = time.perf_counter()
+    energy = align_by_energy(lines, samples, sample_rate)
+    energy_s = time.perf_counter() - start
+
+    boundaries = []
+    for line, line_start, rate in zip(lines, truth, rates):
+        words = line.split()
+        per_word = len(line) * rate / len(words)
+        for k, word in enumerate(words):
+            boundaries.append({"offset": int((line_start + k * per_word) * TICKS_PER_SECOND),
+                               "duration": int(per_word * TICKS_PER_SECOND), "text": word})
+    start = time.perf_counter()
+    dtw = align_to_boundaries(lines, boundaries)
+    dtw_s = time.perf_counter() - start
+
+    return {
+        "energy_ms": round(energy_s * 1000, 2),
+        "energy_mae_s": round(float(np.mean(np.abs(np.array(energy[:-1]) - truth))), 3),
+        "dtw_ms": round(dtw_s * 1000, 2),
+        "dtw_mae_s": round(float(np.mean(np.abs(np.array(dtw[:-1]) - truth))), 3),
+    }
+
+
+if __name__ == '__main__':
+    import json
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) == 3:
+        # python -m scripts.services.subtitle_alignment narration.wav script.txt
+        from pydub import AudioSegment
+        audio = AudioSegment.from_file(sys.argv[1]).set_channels(1)
+        samples = np.array(audio.get_array_of_samples())
+        with open(sys.argv[2], encoding="utf-8") as f:
+            script_lines = [line.strip() for line in f if line.strip()]
+        start = time.perf_counter()
+        result = align_by_energy(script_lines, samples, audio.frame_rate)
+        print(json.dumps({"lines": len(script_lines), "ms": round((time.perf_counter() - start) * 1000, 2),
+                          "timings": [round(t, 3) for t in result]}, indent=2))
+    else:
+        print(json.dumps(benchmark(), indent=2))
@@ -2,11 +2,10 @@ from typing import List, Dict, Optional
 import logging
 from pathlib import Path
 import re
-from datetime import timedelta
-import pysrt
+import numpy as np
 from pydub import AudioSegment
-import speech_recognition as sr
-from ..utils.retry import retry_with_backoff, is_transient_error
+from scripts.MediaManagers.SRT_Processor import SubtitleTrack
+from .subtitle_alignment import align_by_energy, align_to_boundaries
 
 class SubtitleError(Exception):
     """Custom exception for subtitle processing errors"""
@@ -22,9 +21,10 @@ class SubtitleEntry:
 class SubtitleProcessor:
     """Handles subtitle generation and synchronization"""
     
-    def __init__(self, audio_file: str, output_dir: str):
+    def __init__(self, audio_file: str, output_dir: str, word_boundaries: Optional[List[Dict]] = None):
         self.logger = logging.getLogger(__name__)
         self.audio_file = Path(audio_file)
+        self.word_boundaries = word_boundaries
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
         
@@ -33,9 +33,10 @@ class SubtitleProcessor:
         text: str,
         max_chars_per_line: int = 42,
         min_duration: float = 1.0,
-        max_duration: float = 4.0
+        max_duration: float = 4.0,
+        output_path: Optional[str] = None
     ) -> str:
-        """Process text into synchronized subtitles"""
+        """Process text into synchronized subtitles (written to output_path, or subtitles.srt in output_dir)"""
         try:
             # Split text into sentences
             sentences = self._split_into_sentences(text)
@@ -58,7 +59,7 @@ class SubtitleProcessor:
             )
             
             # Write SRT file
-            output_path = self.output_dir / "subtitles.srt"
+            output_path = Path(output_path) if output_path else self.output_dir / "subtitles.srt"
             self._write_srt_file(subtitle_entries, output_path)
             
             return str(output_path)
@@ -114,80 +115,20 @@ class SubtitleProcessor:
         
         return subtitle_lines
 
-    @retry_with_backoff(
-        retries=2,
-        backoff_in_seconds=1,
-        exceptions=(Exception,),
-        should_retry=is_transient_error
-    )
     def _analyze_audio_timing(self, subtitle_lines: List[str]) -> List[float]:
-        """Analyze audio file to determine subtitle timings"""
+        """Determine subtitle timings locally from word boundaries or the audio energy"""
         try:
-            # Convert audio to WAV for speech recognition
-            audio = AudioSegment.from_file(self.audio_file)
-            wav_path = self.output_dir / "temp_audio.wav"
-            audio.export(wav_path, format="wav")
-            
-            recognizer = sr.Recognizer()
-            timings = []
-            
-            with sr.AudioFile(str(wav_path)) as source:
-                audio = recognizer.record(source)
-                
-                # Use speech recognition to get word timings
-                result = recognizer.recognize_google(
-                    audio,
-                    show_all=True
-                )
-                
-                if result and 'alternative' in result:
-                    words = result['alternative'][0].get('words', [])
-                    timings = self._align_timings(words, subtitle_lines)
-                else:
-                    # Fallback to duration-based timing
-                    total_duration = len(audio) / 1000  # Convert to seconds
-                    avg_duration = total_duration / len(subtitle_lines)
-                    timings = [i * avg_duration for i in range(len(subtitle_lines) + 1)]
-            
-            # Cleanup
-            wav_path.unlink(missing_ok=True)
-            return timings
-            
+            if self.word_boundaries:
+                return align_to_boundaries(subtitle_lines, self.word_boundaries)
+
+            audio = AudioSegment.from_file(self.audio_file).set_channels(1)
+            samples = np.array(audio.get_array_of_samples())
+            return align_by_energy(subtitle_lines, samples, audio.frame_rate)
+
         except Exception as e:
             self.logger.error(f"Failed to analyze audio timing: {e}")
             raise
 
-    def _align_timings(
-        self,
-        word_timings: List[Dict],
-        subtitle_lines: List[str]
-    ) -> List[float]:
-        """Align speech recognition timings with subtitle lines"""
-        timings = [0.0]  # Start time
-        current_time = 0.0
-        
-        for line in subtitle_lines:
-            words = set(word.lower() for word in line.split())
-            
-            # Find matching words in timing data
-            matching_times = []
-            for word_data in word_timings:
-                if word_data['word'].lower() in words:
-                    matching_times.append(
-                        float(word_data.get('start_time', 0))
-                    )
-            
-            if matching_times:
-                # Use average of matching word timings
-                current_time = sum(matching_times) / len(matching_times)
-            else:
-                # Fallback: increment by estimated duration
-                current_time += len(line) * 0.06  # ~60ms per character
-            
-            timings.append(current_time)
-        
-        return timings
-
     def _create_subtitle_entries(
         self,
         lines: List[str],
@@ -216,32 +157,11 @@ class SubtitleProcessor:
     def _write_srt_file(self, entries: List[SubtitleEntry], output_path: Path) -> None:
         """Write subtitle entries to SRT file"""
         try:
-            subs = pysrt.SubRipFile()
-            
-            for i, entry in enumerate(entries, 1):
-                start = self._seconds_to_timestamp(entry.start_time)
-                end = self._seconds_to_timestamp(entry.end_time)
-                
-                sub = pysrt.SubRipItem(
-                    index=i,
-                    start=start,
-                    end=end,
-                    text=entry.text
-                )
-                subs.append(sub)
-            
-            subs.save(str(output_path), encoding='utf-8')
-            
+            SubtitleTrack.from_cues(
+                [entry.start_time for entry in entries],
+                [entry.end_time for entry in entries],
+                [entry.text for entry in entries],
+            ).write(str(output_path))
         except Exception as e:
             self.logger.error(f"Failed to write SRT file: {e}")
             raise
-
-    def _seconds_to_timestamp(self, seconds: float) -> str:
-        """Convert seconds to SRT timestamp format"""
-        td = timedelta(seconds=seconds)
-        hours = td.seconds // 3600
-        minutes = (td.seconds % 3600) // 60
-        seconds = td.seconds % 60
-        milliseconds = round(td.microseconds / 1000)
-        
-        return f"{hours:02d}:{minutes:02d}:{seconds:02d},{milliseconds:03d}"
\ No newline at end of file
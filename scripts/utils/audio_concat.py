@@ -0,0 +1,158 @@
+"""
+Audio concatenation without quadratic copies or re-encoding.
+
+* Encoded chunks of the same codec (edge-tts MP3s, rendered segments) are joined
+  with ffmpeg's concat demuxer and ``-c copy``: packets are copied, nothing is
+  decoded or re-encoded.
+* PCM sources (Bark's NumPy output) are copied once into a preallocated buffer
+  and written as a 16-bit WAV.
+
+``AudioSegment += chunk`` in a loop copies the whole accumulated buffer on every
+iteration (O(n^2) bytes moved) and, for MP3, is followed by a full decode and
+re-encode. Run this module to compare both approaches on synthetic chunks.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import tracemalloc
+import wave
+import logging
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def write_concat_list(paths: Iterable[str], list_path: str) -> str:
+    """Write an ffmpeg concat-demuxer list file for `paths`."""
+    with open(list_path, "w", encoding="utf-8") as listing:
+        for path in paths:
+            escaped = Path(os.path.abspath(path)).as_posix().replace("'", r"'\''")
+            listing.write(f"file '{escaped}'\n")
+    return list_path
+
+
+def concat_files(paths: Sequence[str], output_path: str) -> str:
+    """Join same-codec media files with the concat demuxer (stream copy, no re-encode)."""
+    if not paths:
+        raise ValueError("No files to concatenate")
+    if len(paths) == 1:
+        shutil.copyfile(paths[0], output_path)
+        return output_path
+    fd, list_path = tempfile.mkstemp(suffix=".txt")
+    os.close(fd)
+    try:
+        write_concat_list(paths, list_path)
+        cmd = ['ffmpeg', '-y', '-v', 'error', '-f', 'concat', '-safe', '0',
+               '-i', list_path, '-c', 'copy', output_path]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg concat failed: {result.stderr.strip()[-500:]}")
+    finally:
+        os.remove(list_path)
+    return output_path
+
+
+def concat_pcm(chunks: Sequence[np.ndarray]) -> np.ndarray:
+    """Concatenate mono PCM arrays into one preallocated buffer (single copy per chunk)."""
+    if not chunks:
+        return np.zeros(0, dtype=np.float32)
+    total = sum(len(c) for c in chunks)
+    out = np.empty(total, dtype=np.result_type(*chunks))
+    pos = 0
+    for chunk in chunks:
+        out[pos:pos + len(chunk)] = chunk
+        pos += len(chunk)
+    return out
+
+
+def to_int16(samples: np.ndarray) -> np.ndarray:
+    """Float PCM in [-1, 1] to 16-bit integers; integer input is returned unchanged."""
+    if np.issubdtype(samples.dtype, np.integer):
+        return samples.astype(np.int16, copy=False)
+    return (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+def write_wav(samples: np.ndarray, sample_rate: int, output_path: str) -> str:
+    """Write mono PCM samples as a 16-bit WAV file."""
+    data = to_int16(samples)
+    with wave.open(str(output_path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(data.tobytes())
+    return str(output_path)
+
+
+def concat_pcm_to_wav(chunks: Sequence[np.ndarray], sample_rate: int, output_path: str) -> str:
+    return write_wav(concat_pcm(chunks), sample_rate, output_path)
+
+
+def _measure(fn) -> dict:
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(elapsed, 4), "peak_mb": round(peak / 1e6, 1)}
+
+
+def benchmark(n_chunks: int = 50, chunk_seconds: float = 6.0, sample_rate: int = 24000) -> dict:
+    """
+    Compare pydub `+=` concatenation with the preallocated-buffer and stream-copy paths.
+
+    Peak memory is the Python-level allocation peak (tracemalloc) during each run.
+    """
+    from pydub import AudioSegment
+
+    rng = np.random.default_rng(0)
+    chunks = [(rng.standard_normal(int(chunk_seconds * sample_rate)) * 0.1).astype(np.float32)
+              for _ in range(n_chunks)]
+    results = {"chunks": n_chunks, "audio_seconds": n_chunks * chunk_seconds}
+
+    with tempfile.TemporaryDirectory() as work:
+        def pydub_pcm():
+            combined = AudioSegment.empty()
+            for c in chunks:
+                combined += AudioSegment(data=to_int16(c).tobytes(), sample_width=2,
+                                         frame_rate=sample_rate, channels=1)
+            combined.export(os.path.join(work, "pydub.wav"), format="wav")
+
+        results["pcm_pydub"] = _measure(pydub_pcm)
+        results["pcm_prealloc"] = _measure(
+            lambda: concat_pcm_to_wav(chunks, sample_rate, os.path.join(work, "numpy.wav"))
+        )
+
+        if shutil.which("ffmpeg"):
+            mp3s = []
+            for i, c in enumerate(chunks):
+                wav_path = write_wav(c, sample_rate, os.path.join(work, f"c{i}.wav"))
+                mp3 = os.path.join(work, f"c{i}.mp3")
+                subprocess.run(['ffmpeg', '-y', '-v', 'error', '-i', wav_path, '-b:a', '48k', mp3], check=True)
+                mp3s.append(mp3)
+
+            def pydub_mp3():
+                combined = AudioSegment.empty()
+                for path in mp3s:
+                    combined += AudioSegment.from_mp3(path)
+                combined.export(os.path.join(work, "pydub.mp3"), format="mp3")
+
+            results["mp3_pydub"] = _measure(pydub_mp3)
+            results["mp3_stream_copy"] = _measure(lambda: concat_files(mp3s, os.path.join(work, "copy.mp3")))
+        else:
+            logger.warning("ffmpeg not found; skipping the MP3 comparison")
+    return results
+
+
+if __name__ == '__main__':
+    import json
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    print(json.dumps(benchmark(count), indent=2))
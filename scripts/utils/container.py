@@ -82,7 +82,8 @@ class PipelineContainer(Container):
         normalized["serpapi_api_key"] = serpapi.get("api_key", "")
         normalized["serpapi_use_cache"] = serpapi.get("use_cache", True)
         normalized["serpapi_cache_ttl_hours"] = serpapi.get("cache_ttl_hours", 24)
-        normalized["serpapi_cache_dir"] = serpapi.get("cache_dir", ".temp/cache/serpapi")
+        normalized["serpapi_cache_dir"] = serpapi.get("cache_dir", ".cache/serpapi")
+        normalized["serpapi_fresh_ttl_minutes"] = serpapi.get("fresh_ttl_minutes")
 
         newsapi = config.get("newsapi", {})
         normalized["newsapi_api_key"] = newsapi.get("api_key", "")
@@ -97,6 +98,7 @@ class PipelineContainer(Container):
 
         llm_config = config.get("llm", {})
         normalized["llm_providers"] = llm_config.get("providers", [])
+        normalized["llm_measure_prompt_cache"] = llm_config.get("measure_prompt_cache", False)
 
         azure_images = config.get("azure_images", {})
         normalized["azure_image_endpoint"] = azure_images.get("endpoint", "")
@@ -214,6 +216,7 @@ class PipelineContainer(Container):
             language=self.config.get("article_language", "en"),
             model=self.config.get("article_model", "nemotron-3-super:cloud"),
             providers=self.config.get("llm_providers", []),
+            measure_prompt_cache=self.config.get("llm_measure_prompt_cache", False),
         )
         media_generator = self.resolve(MediaGenerator)
         tts_service = self.resolve(TextToSpeech)
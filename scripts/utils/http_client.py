@@ -0,0 +1,248 @@
+"""
+Shared HTTP layer for API clients and media fetchers.
+
+One ``requests.Session`` serves every caller, so keep-alive connections are
+pooled per host (``pool_maxsize`` connections each) instead of one pool per
+client or a new connection per call. All requests share the same policy:
+
+- retries with exponential backoff and jitter on connection errors, timeouts
+  and 429/5xx responses, honouring ``Retry-After``;
+- an optional token bucket per API (see ``rate_limiter.RateLimiter``), taken
+  before every attempt, retries included;
+- per-API timing metrics (requests, errors, retries, latency).
+
+Clients hold an ``ApiSession`` from ``get_http_client().for_api(name)``. It
+exposes the ``get``/``post`` subset of ``requests.Session``, so it can also be
+handed to libraries that accept a session.
+"""
+import random
+import threading
+import time
+import logging
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from scripts.utils import rate_limiter
+from scripts.utils.rate_limiter import RateLimiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = (5, 30)
+DEFAULT_RETRIES = 3
+DEFAULT_BACKOFF = 0.5
+DEFAULT_MAX_BACKOFF = 30.0
+DEFAULT_POOL_HOSTS = 32
+DEFAULT_POOL_MAXSIZE = 10
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+RETRY_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+# Published plan limits as (calls, period in seconds); override via configure_rate_limits
+DEFAULT_RATE_LIMITS: Dict[str, Tuple[int, float]] = {
+    'pexels': (200, 3600.0),
+}
+
+Timeout = Union[float, Tuple[float, float]]
+
+
+@dataclass
+class RequestStats:
+    requests: int = 0
+    errors: int = 0
+    retries: int = 0
+    total_time: float = 0.0
+    max_time: float = 0.0
+
+    @property
+    def avg_time(self) -> float:
+        return self.total_time / self.requests if self.requests else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'retries': self.retries,
+            'avg_ms': round(self.avg_time * 1000, 1),
+            'max_ms': round(self.max_time * 1000, 1),
+        }
+
+
+class HttpClient:
+    """
+    Pooled, rate-limited HTTP client with uniform retries.
+
+    Args:
+        timeout: Default (connect, read) timeout.
+        retries: Retries after the first attempt for idempotent methods.
+        backoff: First backoff in seconds; doubled on every retry.
+        max_backoff: Upper bound for a single wait, Retry-After included.
+        pool_hosts: Number of per-host pools kept alive.
+        pool_maxsize: Connections kept per host.
+    """
+
+    def __init__(
+        self,
+        timeout: Timeout = DEFAULT_TIMEOUT,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+        pool_hosts: int = DEFAULT_POOL_HOSTS,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+    ):
+        self.timeout = timeout
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=pool_maxsize, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._lock = threading.Lock()
+        self._limiters: Dict[str, RateLimiter] = {}
+        self._stats: Dict[str, RequestStats] = {}
+        self.configure_rate_limits(DEFAULT_RATE_LIMITS)
+
+    # -- configuration -------------------------------------------------------
+
+    def configure_rate_limits(self, limits: Dict[str, Iterable]) -> None:
+        """Sets token buckets from {api: (max_calls, period_seconds)}; a non-positive max_calls removes the limit."""
+        with self._lock:
+            for api, (max_calls, period) in limits.items():
+                self._limiters[api] = rate_limiter.create(max_calls, float(period))
+
+    def for_api(self, api: str) -> "ApiSession":
+        return ApiSession(self, api)
+
+    # -- requests ------------------------------------------------------------
+
+    def request(self, method: str, url: str, api: Optional[str] = None, **kwargs: Any) -> requests.Response:
+        """
+        Sends a request under the shared policy and returns the final response.
+
+        Non-2xx responses are returned as-is (callers keep using
+        ``raise_for_status``); only the last network error is raised.
+        """
+        method = method.upper()
+        name = api or urlsplit(url).netloc.lower()
+        kwargs.setdefault('timeout', self.timeout)
+        limiter = self._limiters.get(name)
+        attempts = 1 + (self.retries if method in RETRY_METHODS else 0)
+        delay = self.backoff
+
+        for attempt in range(1, attempts + 1):
+            if limiter:
+                limiter.acquire()
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._record(name, time.perf_counter() - start, error=True, retried=attempt < attempts)
+                if attempt == attempts:
+                    raise
+                wait = self._wait(delay)
+                logger.warning(f"{name}: attempt {attempt}/{attempts} failed ({e}); retrying in {wait:.1f}s")
+            else:
+                failed = response.status_code >= 400
+                retry = response.status_code in RETRY_STATUSES and attempt < attempts
+                self._record(name, time.perf_counter() - start, error=failed, retried=retry)
+                if not retry:
+                    return response
+                wait = self._wait(delay, response.headers.get('Retry-After'))
+                logger.warning(f"{name}: HTTP {response.status_code} on attempt {attempt}/{attempts}; "
+                               f"retrying in {wait:.1f}s")
+                response.close()
+            time.sleep(wait)
+            delay *= 2
+        raise RuntimeError("unreachable")
+
+    def get(self, url: str, api: Optional[str] = None, **kwargs: Any) -> requests.Response:
+        return self.request('GET', url, api=api, **kwargs)
+
+    def post(self, url: str, api: Optional[str] = None, **kwargs: Any) -> requests.Response:
+        return self.request('POST', url, api=api, **kwargs)
+
+    def download(self, url: str, path: str, api: Optional[str] = None, chunk_size: int = 8192, **kwargs: Any) -> str:
+        """Streams a response body to `path`; raises on HTTP errors."""
+        with self.get(url, api=api, stream=True, **kwargs) as response:
+            response.raise_for_status()
+            with open(path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+        return path
+
+    def _wait(self, delay: float, retry_after: Optional[str] = None) -> float:
+        if retry_after:
+            try:
+                seconds = float(retry_after)
+            except ValueError:
+                try:
+                    seconds = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    seconds = delay
+            return min(max(seconds, 0.0), self.max_backoff)
+        return min(delay * random.uniform(0.8, 1.2), self.max_backoff)
+
+    # -- metrics -------------------------------------------------------------
+
+    def _record(self, name: str, elapsed: float, error: bool, retried: bool) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(name, RequestStats())
+            stats.requests += 1
+            stats.errors += int(error)
+            stats.retries += int(retried)
+            stats.total_time += elapsed
+            stats.max_time = max(stats.max_time, elapsed)
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in sorted(self._stats.items())}
+
+    def summary(self) -> str:
+        return ', '.join(
+            f"{name}: {s['requests']} req, {s['errors']} err, {s['retries']} retries, avg {s['avg_ms']:.0f} ms"
+            for name, s in self.stats().items()
+        ) or 'no requests'
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+    def close(self) -> None:
+        self.session.close()
+
+
+class ApiSession:
+    """HttpClient bound to one API name (its rate limit and metrics bucket)."""
+
+    def __init__(self, client: HttpClient, api: str):
+        self.client = client
+        self.api = api
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        return self.client.request(method, url, api=self.api, **kwargs)
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.client.request('GET', url, api=self.api, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.client.request('POST', url, api=self.api, **kwargs)
+
+    def download(self, url: str, path: str, **kwargs: Any) -> str:
+        return self.client.download(url, path, api=self.api, **kwargs)
+
+
+_default: Optional[HttpClient] = None
+_default_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Process-wide HttpClient shared by every fetcher."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = HttpClient()
+        return _default
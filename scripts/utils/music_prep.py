@@ -0,0 +1,286 @@
+"""
+Background music preparation, done once per track instead of once per render.
+
+* ``analyze`` measures a track's EBU R128 loudness (ffmpeg ``loudnorm`` first
+  pass) and duration, cached by path, size and mtime.
+* ``prepare_bed`` writes an AAC bed gain-corrected to a target loudness with
+  a static gain (no second loudnorm pass). Beds are cached per (track,
+  target, loop count): a track at least as long as the narration is encoded
+  once and reused for every render, and a shorter one only once per number
+  of repeats it needs.
+* ``music_bed`` is what renders call: the bed, or the raw track at the old
+  fixed volume when analysis or encoding fails, so a bad music file never
+  fails a render.
+* ``bed_filter`` trims the bed to the narration and fades it out inside the
+  final mix, and ``ducking_filters`` mixes it under the voice with
+  ``sidechaincompress`` so the music dips while someone is speaking.
+
+The cache lives under ``.cache/music``, outside the processor's temp_dir,
+and is bounded by age and total size.
+"""
+import hashlib
+import json
+import math
+import os
+import re
+import subprocess
+import threading
+import time
+import logging
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from scripts.utils.file_cache import FileCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MUSIC_CACHE_DIR = ".cache/music"
+DEFAULT_TARGET_LUFS = -30.0  # bed level under a ~-16 LUFS narration
+DEFAULT_BED_TTL = 7 * 86400
+DEFAULT_BED_CACHE_BYTES = 500 * 1024 * 1024
+ANALYSIS_TTL = 365 * 86400  # keyed by size/mtime, so only a changed file invalidates it
+FADE_OUT_SECONDS = 2.0
+MAX_GAIN_DB = 30.0
+FALLBACK_VOLUME = 0.2  # raw track level used before beds were leveled
+
+_LOUDNORM_JSON_RE = re.compile(r"\{[^{}]*\"input_i\"[^{}]*\}", re.S)
+
+
+@dataclass
+class MusicAnalysis:
+    integrated_lufs: float
+    true_peak: float
+    loudness_range: float
+    duration: float
+
+    def gain_db(self, target_lufs: float, peak_ceiling: float = -1.0) -> float:
+        """
+        Static gain to reach `target_lufs` without pushing the true peak above `peak_ceiling`.
+
+        Clamped to +/-MAX_GAIN_DB; a silent track (-inf LUFS) gets no gain.
+        """
+        if not math.isfinite(self.integrated_lufs):
+            return 0.0
+        gain = target_lufs - self.integrated_lufs
+        if math.isfinite(self.true_peak):
+            gain = min(gain, peak_ceiling - self.true_peak)
+        return round(max(-MAX_GAIN_DB, min(gain, MAX_GAIN_DB)), 2)
+
+
+def _track_key(path: str) -> str:
+    stat = os.stat(path)
+    payload = f"{os.path.abspath(path)}\x1f{stat.st_size}\x1f{stat.st_mtime_ns}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:24]
+
+
+def _probe_duration(path: str) -> float:
+    result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+         '-of', 'default=noprint_wrappers=1:nokey=1', path],
+        capture_output=True, text=True, check=True,
+    )
+    return float(result.stdout.strip())
+
+
+def _measure_loudness(path: str) -> dict:
+    cmd = ['ffmpeg', '-hide_banner', '-nostats', '-i', path,
+           '-af', 'loudnorm=print_format=json', '-vn', '-f', 'null', '-']
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    match = _LOUDNORM_JSON_RE.search(result.stderr)
+    if result.returncode != 0 or not match:
+        raise RuntimeError(f"Loudness analysis failed for {path}: {result.stderr.strip()[-300:]}")
+    return json.loads(match.group(0))
+
+
+class MusicPrep:
+    """
+    Per-track loudness analysis and leveled beds, cached on disk.
+
+    Args:
+        cache_dir: Root of the analysis and bed caches.
+        target_lufs: Integrated loudness of prepared beds.
+        bed_ttl: Seconds an unused bed is kept.
+        max_bytes: Total size of the beds kept; least recently used go first.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_MUSIC_CACHE_DIR,
+        target_lufs: float = DEFAULT_TARGET_LUFS,
+        bed_ttl: int = DEFAULT_BED_TTL,
+        max_bytes: int = DEFAULT_BED_CACHE_BYTES,
+    ):
+        self.root = Path(cache_dir)
+        self.beds_dir = self.root / "beds"
+        self.beds_dir.mkdir(parents=True, exist_ok=True)
+        self.target_lufs = target_lufs
+        self.bed_ttl = bed_ttl
+        self.max_bytes = max_bytes
+        self._analysis = FileCache(cache_dir=str(self.root / "analysis"), ttl=ANALYSIS_TTL)
+        self._locks: dict = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        with self._locks_guard:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def analyze(self, path: str) -> MusicAnalysis:
+        """EBU R128 loudness and duration of `path`, measured once per file version."""
+        key = _track_key(path)
+        cached = self._analysis.get(key)
+        if cached:
+            return MusicAnalysis(**cached)
+        with self._lock_for(f"analysis:{key}"):
+            cached = self._analysis.get(key)
+            if cached:
+                return MusicAnalysis(**cached)
+            start = time.perf_counter()
+            stats = _measure_loudness(path)
+            analysis = MusicAnalysis(
+                integrated_lufs=float(stats['input_i']),
+                true_peak=float(stats['input_tp']),
+                loudness_range=float(stats['input_lra']),
+                duration=_probe_duration(path),
+            )
+            self._analysis.set(key, asdict(analysis))
+            logger.info(f"Analyzed {os.path.basename(path)} in {time.perf_counter() - start:.1f}s: "
+                        f"{analysis.integrated_lufs} LUFS, {analysis.duration:.1f}s")
+            return analysis
+
+    def prepare_bed(self, path: str, duration: float = 0.0) -> str:
+        """
+        AAC bed of `path` at the target loudness, at least `duration` seconds long.
+
+        Tracks shorter than `duration` are looped a whole number of times.
+        Trim and fade belong to the mix (see ``bed_filter``), so the same bed
+        serves every narration that fits in it. Returns the cached file when
+        one exists.
+        """
+        analysis = self.analyze(path)
+        loops = max(1, math.ceil(duration / analysis.duration)) if analysis.duration > 0 else 1
+        key = f"{_track_key(path)}_{self.target_lufs:g}_x{loops}"
+        bed = self.beds_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:24]}.m4a"
+        with self._lock_for(f"bed:{bed.name}"):
+            if bed.exists() and time.time() - bed.stat().st_mtime <= self.bed_ttl:
+                os.utime(bed)  # recency for the size-bound eviction
+                return str(bed)
+            start = time.perf_counter()
+            loop = ['-stream_loop', str(loops - 1)] if loops > 1 else []
+            tmp = bed.with_name(f"{bed.stem}.tmp.m4a")
+            cmd = ['ffmpeg', '-y', '-v', 'error', *loop, '-i', path, '-vn',
+                   '-af', f"volume={analysis.gain_db(self.target_lufs)}dB",
+                   '-c:a', 'aac', '-b:a', '128k', str(tmp)]
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            if result.returncode != 0:
+                tmp.unlink(missing_ok=True)
+                raise RuntimeError(f"Music bed preparation failed: {result.stderr.strip()[-300:]}")
+            tmp.replace(bed)
+            logger.info(f"Prepared bed for {os.path.basename(path)} (x{loops}) "
+                        f"in {time.perf_counter() - start:.1f}s")
+        self._evict()
+        return str(bed)
+
+    def _evict(self) -> None:
+        """Drops beds unused for bed_ttl, then the least recently used until under max_bytes."""
+        now = time.time()
+        kept = []
+        for old in self.beds_dir.glob("*.m4a"):
+            try:
+                stat = old.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.bed_ttl:
+                old.unlink(missing_ok=True)
+            elif not old.name.endswith(".tmp.m4a"):
+                kept.append((stat.st_mtime, stat.st_size, old))
+        total = sum(size for _, size, _ in kept)
+        for _, size, old in sorted(kept, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            old.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        for old in self.beds_dir.glob("*.m4a"):
+            old.unlink(missing_ok=True)
+        self._analysis.clear()
+
+
+def bed_filter(duration: float, fade_out: float = FADE_OUT_SECONDS, volume: Optional[float] = None) -> str:
+    """
+    Filter chain that trims a bed to `duration` seconds and fades out its last `fade_out`.
+
+    `volume` scales an unleveled track (see ``music_bed``).
+    """
+    fade_start = max(0.0, duration - fade_out)
+    gain = f"volume={volume:g}," if volume is not None else ""
+    return (f"{gain}atrim=end={duration:.3f},asetpts=PTS-STARTPTS,"
+            f"afade=t=out:st={fade_start:.3f}:d={fade_out:g}")
+
+
+def ducking_filters(
+    voice_label: str,
+    bed_label: str,
+    out_label: str = "[mix]",
+    threshold: float = 0.03,
+    ratio: float = 8,
+    attack_ms: int = 20,
+    release_ms: int = 400,
+) -> List[str]:
+    """
+    Filters that duck `bed_label` under `voice_label` and mix both into `out_label`.
+
+    The voice is split once: one copy keys the compressor, the other goes to the mix.
+    """
+    return [
+        f"{voice_label}asplit=2[voice_mix][voice_key]",
+        f"{bed_label}[voice_key]sidechaincompress=threshold={threshold}:ratio={ratio}:"
+        f"attack={attack_ms}:release={release_ms}[ducked]",
+        f"[voice_mix][ducked]amix=inputs=2:duration=first:normalize=0{out_label}",
+    ]
+
+
+_default: Optional[MusicPrep] = None
+_default_lock = threading.Lock()
+
+
+def get_music_prep() -> MusicPrep:
+    """Process-wide MusicPrep with the default cache location."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = MusicPrep()
+        return _default
+
+
+def prepare_bed(path: str, duration: float) -> str:
+    return get_music_prep().prepare_bed(path, duration)
+
+
+def music_bed(path: str, duration: float) -> Tuple[str, Optional[float]]:
+    """
+    (file, volume) to mix as background music for `duration` seconds.
+
+    Normally the leveled bed with volume None. If the bed can't be prepared, the
+    failure is logged and the raw track comes back with FALLBACK_VOLUME.
+    """
+    try:
+        return get_music_prep().prepare_bed(path, duration), None
+    except Exception as e:
+        logger.warning(f"Could not prepare music bed for {path}, mixing the raw track instead: {e}")
+        return path, FALLBACK_VOLUME
+
+
+if __name__ == '__main__':
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    # python -m scripts.utils.music_prep music.mp3 95.5
+    prep = get_music_prep()
+    track, length = sys.argv[1], float(sys.argv[2])
+    for attempt, seconds in (("cold", length), ("warm", length), ("other length", length * 0.9)):
+        start = time.perf_counter()
+        out = prep.prepare_bed(track, seconds)
+        print(f"{attempt}: {out} in {(time.perf_counter() - start) * 1000:.0f} ms")
+    print(asdict(prep.analyze(track)))
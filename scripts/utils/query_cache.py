@@ -0,0 +1,271 @@
+"""
+Persistent query cache with stale-while-revalidate.
+
+Entries are keyed by a SHA-256 of the namespace plus the canonical JSON of the
+query parameters (sorted keys, trimmed values, secrets dropped). Equivalent
+queries therefore share one entry however their dicts were built. Each entry
+has two ages:
+
+- younger than ``fresh_ttl``: served as is;
+- younger than ``stale_ttl``: served immediately while a background refresh
+  replaces it (at most one refresh in flight per key);
+- older than that, or missing: fetched synchronously, and concurrent callers
+  wait for the same fetch.
+
+Everything lives in one SQLite file holding zlib-compressed JSON. Every
+``compact_every`` writes the store is compacted: expired entries are dropped,
+the least recently used go until it is back under ``max_entries`` and
+``max_bytes``, and freed pages are returned to the filesystem.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+import zlib
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUERY_CACHE_DIR = ".cache/queries"
+DEFAULT_FRESH_TTL = 30 * 60
+DEFAULT_STALE_TTL = 24 * 3600
+DEFAULT_MAX_ENTRIES = 2000
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_COMPACT_EVERY = 100
+SECRET_PARAMS = frozenset({'api_key', 'apikey', 'key', 'token', 'access_token'})
+
+
+def canonical_key(namespace: str, params: Dict[str, Any]) -> str:
+    """Stable hash of a query: parameter order, surrounding whitespace and secrets don't matter."""
+    canonical = {
+        str(k).lower(): ' '.join(v.split()) if isinstance(v, str) else v
+        for k, v in params.items()
+        if v is not None and str(k).lower() not in SECRET_PARAMS
+    }
+    payload = json.dumps([namespace, canonical], sort_keys=True, separators=(',', ':'), ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    key: str
+    data: Any
+    fetched_at: float
+    tag: Optional[str] = None
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class QueryCache:
+    """
+    Bounded on-disk query cache; see the module docstring for the serving rules.
+
+    Args:
+        cache_dir: Directory of the SQLite store (queries.db).
+        max_entries: Entry count kept after compaction.
+        max_bytes: Compressed payload bytes kept after compaction.
+        compact_every: Writes between automatic compactions.
+        refresh_workers: Threads for background refreshes.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = DEFAULT_QUERY_CACHE_DIR,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        compact_every: int = DEFAULT_COMPACT_EVERY,
+        refresh_workers: int = 2,
+    ):
+        self.root = Path(cache_dir)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.path = self.root / "queries.db"
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.compact_every = max(1, compact_every)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._inflight: Dict[str, Future] = {}
+        self._executor = ThreadPoolExecutor(max_workers=max(1, refresh_workers), thread_name_prefix="query-cache")
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self.init_db()
+
+    def init_db(self) -> None:
+        with self._lock:
+            # Must precede table creation to take effect on a new file
+            self._conn.execute('PRAGMA auto_vacuum=INCREMENTAL')
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS query_cache (
+                    key TEXT PRIMARY KEY,
+                    namespace TEXT NOT NULL,
+                    tag TEXT,
+                    data BLOB NOT NULL,
+                    size INTEGER NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            ''')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_query_cache_ns ON query_cache(namespace, tag)')
+            self._conn.execute('CREATE INDEX IF NOT EXISTS idx_query_cache_lru ON query_cache(accessed_at)')
+            self._conn.commit()
+
+    # -- storage ---------------------------------------------------------------
+
+    def lookup(self, namespace: str, params: Dict[str, Any]) -> Optional[CacheEntry]:
+        """The stored entry, however old, unless it is past its stale TTL."""
+        key = canonical_key(namespace, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT data, fetched_at, expires_at, tag FROM query_cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None or row['expires_at'] < now:
+                return None
+            self._conn.execute('UPDATE query_cache SET accessed_at = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+        try:
+            data = json.loads(zlib.decompress(row['data']))
+        except (zlib.error, ValueError):
+            return None
+        return CacheEntry(key, data, row['fetched_at'], row['tag'])
+
+    def put(self, namespace: str, params: Dict[str, Any], data: Any,
+            stale_ttl: float = DEFAULT_STALE_TTL, tag: Optional[str] = None) -> None:
+        blob = zlib.compress(json.dumps(data, ensure_ascii=False).encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            self._conn.execute('''
+                INSERT OR REPLACE INTO query_cache
+                    (key, namespace, tag, data, size, fetched_at, expires_at, accessed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (canonical_key(namespace, params), namespace, tag, blob, len(blob), now, now + stale_ttl, now))
+            self._conn.commit()
+            self._writes += 1
+            due = self._writes % self.compact_every == 0
+        if due:
+            self.compact()
+
+    def entries(self, namespace: str) -> List[Dict[str, Any]]:
+        """Tag, age and size of every live entry in a namespace (no payloads)."""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT tag, fetched_at, size FROM query_cache WHERE namespace = ? AND expires_at >= ?',
+                (namespace, now)
+            ).fetchall()
+        return [{'tag': r['tag'], 'age': now - r['fetched_at'], 'size': r['size']} for r in rows]
+
+    def compact(self) -> Dict[str, int]:
+        """Drops expired entries, evicts LRU entries beyond the bounds and reclaims free pages."""
+        now = time.time()
+        with self._lock:
+            expired = self._conn.execute('DELETE FROM query_cache WHERE expires_at < ?', (now,)).rowcount
+            count, total = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM query_cache').fetchone()
+            evicted = 0
+            if count > self.max_entries or total > self.max_bytes:
+                for row in self._conn.execute('SELECT key, size FROM query_cache ORDER BY accessed_at').fetchall():
+                    if count <= self.max_entries and total <= self.max_bytes:
+                        break
+                    self._conn.execute('DELETE FROM query_cache WHERE key = ?', (row['key'],))
+                    count -= 1
+                    total -= row['size']
+                    evicted += 1
+            self._conn.commit()
+            if expired or evicted:
+                self._conn.execute('PRAGMA incremental_vacuum')
+        if expired or evicted:
+            logger.info(f"Query cache compacted: {expired} expired, {evicted} evicted, {count} kept")
+        return {'expired': expired, 'evicted': evicted, 'kept': count}
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        with self._lock:
+            if namespace is None:
+                self._conn.execute('DELETE FROM query_cache')
+            else:
+                self._conn.execute('DELETE FROM query_cache WHERE namespace = ?', (namespace,))
+            self._conn.commit()
+            self._conn.execute('PRAGMA incremental_vacuum')
+
+    # -- serving ---------------------------------------------------------------
+
+    def get_or_fetch(
+        self,
+        namespace: str,
+        params: Dict[str, Any],
+        fetch: Callable[[], Any],
+        fresh_ttl: float = DEFAULT_FRESH_TTL,
+        stale_ttl: float = DEFAULT_STALE_TTL,
+        tag: Optional[str] = None,
+    ) -> Any:
+        """
+        Cached result for a query, refreshing in the background once it is stale.
+
+        Empty results are returned but not stored, so a failed or empty fetch
+        never replaces good data. If a synchronous fetch raises, the exception
+        propagates.
+        """
+        entry = self.lookup(namespace, params)
+        if entry is not None:
+            if entry.age > fresh_ttl:
+                self.refresh(namespace, params, fetch, stale_ttl, tag)
+            return entry.data
+        return self._fetch_once(canonical_key(namespace, params), namespace, params, fetch, stale_ttl, tag, wait=True)
+
+    def refresh(self, namespace: str, params: Dict[str, Any], fetch: Callable[[], Any],
+                stale_ttl: float = DEFAULT_STALE_TTL, tag: Optional[str] = None) -> Future:
+        """Refetches a query in the background; returns the in-flight future for that key."""
+        return self._fetch_once(canonical_key(namespace, params), namespace, params, fetch, stale_ttl, tag, wait=False)
+
+    def _fetch_once(self, key, namespace, params, fetch, stale_ttl, tag, wait: bool):
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+        if owner:
+            if wait:
+                self._run_fetch(key, future, namespace, params, fetch, stale_ttl, tag)
+            else:
+                self._executor.submit(self._run_fetch, key, future, namespace, params, fetch, stale_ttl, tag)
+        return future.result() if wait else future
+
+    def _run_fetch(self, key, future: Future, namespace, params, fetch, stale_ttl, tag) -> None:
+        try:
+            data = fetch()
+            if data:
+                self.put(namespace, params, data, stale_ttl, tag)
+            future.set_result(data)
+        except BaseException as e:
+            logger.warning(f"Query cache fetch failed for {namespace}/{tag or key[:12]}: {e}")
+            future.set_exception(e)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            self._conn.close()
+
+
+_caches: Dict[str, QueryCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_query_cache(cache_dir: str = DEFAULT_QUERY_CACHE_DIR) -> QueryCache:
+    """Process-wide QueryCache per directory, so every client on a store shares refreshes."""
+    key = str(Path(cache_dir).resolve())
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = QueryCache(cache_dir)
+        return cache
@@ -10,7 +10,7 @@ import logging
 import gc
 import contextlib
 import shutil
-from typing import List, Optional, Tuple, Dict
+from typing import Callable, List, Optional, Tuple, Dict
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from multiprocessing import cpu_count
 from pathlib import Path
@@ -26,6 +26,9 @@ from moviepy.editor import (
 )
 from moviepy.video.fx import resize, crop
 
+from scripts.AI.chunked_tts import boundaries_to_srt
+from scripts.utils.audio_concat import write_concat_list
+from scripts.utils.music_prep import FADE_OUT_SECONDS, bed_filter, ducking_filters, music_bed
 from scripts.helpers.media_helper import ImageHelper, Position, Style, SubtitleHelper
 from .interfaces import VideoAssembler as VideoAssemblerInterface, VideoMetadata
 from .utils.app_logger import trace
@@ -113,6 +116,7 @@ class VideoAssembler(VideoAssemblerInterface):
         self.media_videos = media_videos or []
         self.aspect_ratio = aspect_ratio
         self.background_music = background_music
+        self._beds: Dict[float, Tuple[str, Optional[float]]] = {}
         self._check_dependencies()
 
     @staticmethod
@@ -240,6 +244,111 @@ class VideoAssembler(VideoAssemblerInterface):
         p = re.sub(r'^([a-zA-Z]):', lambda m: m.group(1) + '\\:', p)
         return p
 
+    def _zoom_filter(self, input_index: int, frames: int, fps: int, zoom_from: float = 1.0,
+                     zoom_to: float = 1.15, label: Optional[str] = None) -> str:
+        """Ken Burns zoompan filter for one still image input, `frames` frames long."""
+        target_w, target_h = self.get_target_dimensions()
+        if frames > 1:
+            zoom_expr = f"{zoom_from:g}+{round(zoom_to - zoom_from, 5):g}*on/({frames}-1)"
+        else:
+            zoom_expr = f"{zoom_from:g}"
+        return (
+            f"[{input_index}:v]zoompan=z='{zoom_expr}':"
+            f"d={frames}:fps={fps}:"
+            f"s={target_w}x{target_h},"
+            f"scale=w={target_w}:h={target_h}:force_original_aspect_ratio=1,"
+            f"pad=w={target_w}:h={target_h}:x=(ow-iw)/2:y=(oh-ih)/2:color=black,"
+            f"setpts=PTS-STARTPTS{label or f'[s{input_index}]'}"
+        )
+
+    def _audio_filters(self, voice_index: int, audio_duration: float) -> Tuple[List[str], str]:
+        """Voiceover fade plus optional background music mix; returns (filters, output label)."""
+        filters = []
+        fade_start = max(0.0, audio_duration - 2.0)
+        filters.append(
+            f"[{voice_index}:a]adelay=0,afade=t=out:st={fade_start}:d=2[voice]"
+        )
+        audio_map = "[voice]"
+
+        # Background bed (already leveled) is the input right after the voiceover; trim and fade it here
+        if self._has_background_music():
+            _, volume = self._music_bed(audio_duration)
+            filters.append(f"[{voice_index + 1}:a]{bed_filter(audio_duration, volume=volume)}[bed]")
+            filters.extend(ducking_filters("[voice]", "[bed]", "[mix]"))
+            audio_map = "[mix]"
+        return filters, audio_map
+
+    def _has_background_music(self) -> bool:
+        return bool(self.background_music) and os.path.isfile(self.background_music)
+
+    def _music_bed(self, audio_duration: float) -> Tuple[str, Optional[float]]:
+        """Bed (or raw-track fallback) for this narration, resolved once so inputs and filters agree."""
+        if audio_duration not in self._beds:
+            self._beds[audio_duration] = music_bed(self.background_music, audio_duration)
+        return self._beds[audio_duration]
+
+    def _audio_inputs(self, audio_duration: float) -> List[str]:
+        cmd = ['-i', str(self.voiceover_file)]
+        if self._has_background_music():
+            cmd.extend(['-i', self._music_bed(audio_duration)[0]])
+        return cmd
+
+    def _subtitle_filter(
+        self,
+        in_label: str,
+        out_label: str,
+        style: Style,
+        position: Position,
+        subtitle_file: Optional[str] = None,
+    ) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Subtitle burn-in filter for `subtitle_file` (defaults to self.subtitle_file).
+
+        Returns (filter, local_srt); the caller removes local_srt after running ffmpeg.
+        """
+        subtitle_file = subtitle_file or self.subtitle_file
+        if not subtitle_file or not os.path.isfile(subtitle_file):
+            return None, None
+        srt_size = os.path.getsize(subtitle_file)
+        self.logger.info(f"SRT: path={subtitle_file!r}, size={srt_size}")
+        if srt_size == 0:
+            self.logger.warning("SRT is empty (0 bytes), skipping subtitles")
+            return None, None
+        is_short = self.aspect_ratio == '9:16'
+        style_params = SubtitleHelper.get_style_parameters(style)
+        font_name = Path(style_params['font_path']).stem
+        font_size = min(style_params['fontsize'], 48 if is_short else 28)
+        margin_v = 80 if is_short else 40
+        align_map = {
+            Position.BOTTOM_CENTER: '2',
+            Position.BOTTOM_LEFT: '1',
+            Position.BOTTOM_RIGHT: '3',
+            Position.MIDDLE_CENTER: '10',
+            Position.MIDDLE_LEFT: '4',
+            Position.MIDDLE_RIGHT: '6',
+            Position.TOP_CENTER: '8',
+            Position.TOP_LEFT: '7',
+            Position.TOP_RIGHT: '9',
+        }
+        alignment = align_map.get(position, '2')
+        # Copy SRT to a simple name in CWD (guarantees no colons, no path issues in filter)
+        local_srt = f"_vid_srt_{uuid.uuid4().hex[:8]}.srt"
+        shutil.copy2(subtitle_file, local_srt)
+        # Simple basename in filter, force_style quoted for comma protection
+        sub_filter = (
+            f"{in_label}subtitles={local_srt}:"
+            f"force_style='FontName={font_name},"
+            f"FontSize={font_size},"
+            f"PrimaryColour=&H00FFFFFF,"
+            f"OutlineColour=&H00000000,"
+            f"Outline=2,BorderStyle=1,"
+            f"MarginV={margin_v},"
+            f"Alignment={alignment}'"
+            f"{out_label}"
+        )
+        self.logger.info(f"Subtitle filter: {sub_filter}")
+        return sub_filter, local_srt
+
     @trace()
     def _assemble_with_ffmpeg(
         self,
@@ -287,88 +396,20 @@ class VideoAssembler(VideoAssemblerInterface):
 
         for i, img in enumerate(valid_images):
             self.logger.info(f"  Image {i+1}/{num_images}: {os.path.basename(img)}")
-            fc = frame_counts[i]
-            if fc > 1:
-                zoom_expr = f"1+0.15*on/({fc}-1)"
-            else:
-                zoom_expr = "1"
-            filters.append(
-                f"[{i}:v]zoompan=z='{zoom_expr}':"
-                f"d={fc}:fps={fps}:"
-                f"s={target_w}x{target_h},"
-                f"scale=w={target_w}:h={target_h}:force_original_aspect_ratio=1,"
-                f"pad=w={target_w}:h={target_h}:x=(ow-iw)/2:y=(oh-ih)/2:color=black,"
-                f"setpts=PTS-STARTPTS[s{i}]"
-            )
+            filters.append(self._zoom_filter(i, frame_counts[i], fps))
             concat_labels.append(f"[s{i}]")
 
         n = len(concat_labels)
         filters.append(f"{''.join(concat_labels)}concat=n={n}:v=1:a=0[vid]")
 
-        # Voiceover audio
-        a_main = num_images
-        fade_start = max(0.0, audio_duration - 2.0)
-        filters.append(
-            f"[{a_main}:a]adelay=0,afade=t=out:st={fade_start}:d=2[voice]"
-        )
-        audio_map = "[voice]"
-        a_total = a_main + 1
-
-        # Background music
-        if self.background_music and os.path.isfile(self.background_music):
-            bg_idx = a_total
-            a_total += 1
-            filters.append(
-                f"[{bg_idx}:a]volume=0.2,adelay=0,"
-                f"afade=t=out:st={fade_start}:d=2[bg]"
-            )
-            filters.append(f"[voice][bg]amix=inputs=2:duration=first[mix]")
-            audio_map = "[mix]"
+        audio_filters, audio_map = self._audio_filters(num_images, audio_duration)
+        filters.extend(audio_filters)
 
-        # --- Subtitles: copy to CWD with simple name (no colons) + quoted force_style (for commas) ---
-        has_subtitles = False
-        _local_srt = None
-        if self.subtitle_file and os.path.isfile(self.subtitle_file):
-            srt_size = os.path.getsize(self.subtitle_file)
-            self.logger.info(f"SRT: path={self.subtitle_file!r}, size={srt_size}")
-            if srt_size == 0:
-                self.logger.warning("SRT is empty (0 bytes), skipping subtitles")
-            else:
-                is_short = self.aspect_ratio == '9:16'
-                style_params = SubtitleHelper.get_style_parameters(style)
-                font_name = Path(style_params['font_path']).stem
-                font_size = min(style_params['fontsize'], 48 if is_short else 28)
-                margin_v = 80 if is_short else 40
-                align_map = {
-                    Position.BOTTOM_CENTER: '2',
-                    Position.BOTTOM_LEFT: '1',
-                    Position.BOTTOM_RIGHT: '3',
-                    Position.MIDDLE_CENTER: '10',
-                    Position.MIDDLE_LEFT: '4',
-                    Position.MIDDLE_RIGHT: '6',
-                    Position.TOP_CENTER: '8',
-                    Position.TOP_LEFT: '7',
-                    Position.TOP_RIGHT: '9',
-                }
-                alignment = align_map.get(position, '2')
-                # Copy SRT to a simple name in CWD (guarantees no colons, no path issues in filter)
-                _local_srt = f"_vid_srt_{uuid.uuid4().hex[:8]}.srt"
-                shutil.copy2(self.subtitle_file, _local_srt)
-                # Simple basename in filter, force_style quoted for comma protection
-                sub_filter = (
-                    f"[vid]subtitles={_local_srt}:"
-                    f"force_style='FontName={font_name},"
-                    f"FontSize={font_size},"
-                    f"PrimaryColour=&H00FFFFFF,"
-                    f"OutlineColour=&H00000000,"
-                    f"Outline=2,BorderStyle=1,"
-                    f"MarginV={margin_v},"
-                    f"Alignment={alignment}'"
-                    f"[outv]"
-                )
-                self.logger.info(f"Subtitle filter: {sub_filter}")
-                filters.append(sub_filter)
-                has_subtitles = True
+        # --- Subtitles ---
+        sub_filter, _local_srt = self._subtitle_filter("[vid]", "[outv]", style, position)
+        has_subtitles = sub_filter is not None
+        if has_subtitles:
+            filters.append(sub_filter)
 
         last_video_label = "[outv]" if has_subtitles else "[vid]"
         self.logger.info(f"Subtitles: {'ON' if has_subtitles else 'OFF'} (map label: {last_video_label})")
@@ -378,10 +419,7 @@ class VideoAssembler(VideoAssemblerInterface):
 
         for img in valid_images:
             cmd.extend(['-i', img])
-        cmd.extend(['-i', str(self.voiceover_file)])
-
-        if self.background_music and os.path.isfile(self.background_music):
-            cmd.extend(['-i', str(self.background_music)])
+        cmd.extend(self._audio_inputs(audio_duration))
 
         cmd.extend(['-filter_complex', ';'.join(filters)])
         cmd.extend(['-map', last_video_label, '-map', audio_map])
@@ -446,6 +484,182 @@ class VideoAssembler(VideoAssemblerInterface):
         """
         self._assemble_with_ffmpeg(style, position)
 
+    @staticmethod
+    def plan_chunk_pieces(
+        num_images: int,
+        chunk_chars: List[int],
+        index: int,
+        start: float,
+        duration: float,
+    ) -> List[Tuple[int, float, float, float, float]]:
+        """
+        Images shown during narration chunk `index`.
+
+        Image i covers the i-th equal share of the script's characters; a chunk
+        shows every image whose share overlaps its own characters, for a time
+        proportional to the overlap. An image split across two chunks continues
+        its zoom where the previous segment left off.
+
+        Returns (image index, start s, end s, zoom from, zoom to) per piece, on
+        the narration timeline.
+        """
+        total = sum(chunk_chars)
+        chunk_start = sum(chunk_chars[:index])
+        chunk_end = chunk_start + chunk_chars[index]
+        span = max(chunk_end - chunk_start, 1)
+        share = total / num_images
+        first = min(num_images - 1, int(chunk_start // share))
+        pieces = []
+        for i in range(first, num_images):
+            img_start, img_end = i * share, (i + 1) * share
+            if img_start >= chunk_end:
+                break
+            lo, hi = max(img_start, chunk_start), min(img_end, chunk_end)
+            if hi <= lo:
+                continue
+            pieces.append((
+                i,
+                start + (lo - chunk_start) / span * duration,
+                start + (hi - chunk_start) / span * duration,
+                1 + 0.15 * (lo - img_start) / share,
+                1 + 0.15 * (hi - img_start) / share,
+            ))
+        return pieces
+
+    def _run_ffmpeg(self, cmd: List[str], what: str, timeout: int = 600) -> None:
+        self.logger.debug(f"FFmpeg command: {' '.join(cmd)}")
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            raise RuntimeError(Fore.RED + f"❌ FFmpeg {what} timed out (>{timeout}s).")
+        if result.returncode != 0:
+            self.logger.error(f"FFmpeg stderr (last 3K): {result.stderr[-3000:]}")
+            raise RuntimeError(Fore.RED + f"❌ FFmpeg {what} failed (exit {result.returncode}).")
+
+    def render_segment(
+        self,
+        images: List[str],
+        pieces: List[Tuple[int, float, float, float, float]],
+        output_path: str,
+        style: Style = Style.DEFAULT,
+        position: Position = Position.MIDDLE_CENTER,
+        subtitle_file: Optional[str] = None,
+        fps: int = 24,
+    ) -> Optional[str]:
+        """Encode one silent video segment from planned image pieces, with its subtitles burned in."""
+        inputs, filters, labels = [], [], []
+        for image_index, t0, t1, z0, z1 in pieces:
+            # Frame counts come from the global timeline so segments add up to the narration exactly
+            frames = int(round(t1 * fps)) - int(round(t0 * fps))
+            if frames <= 0:
+                continue
+            n = len(inputs)
+            inputs.extend(['-i', images[image_index]])
+            filters.append(self._zoom_filter(n, frames, fps, z0, z1))
+            labels.append(f"[s{n}]")
+        if not labels:
+            return None
+        filters.append(f"{''.join(labels)}concat=n={len(labels)}:v=1:a=0[vid]")
+        sub_filter, local_srt = self._subtitle_filter("[vid]", "[outv]", style, position, subtitle_file)
+        if sub_filter:
+            filters.append(sub_filter)
+        cmd = ['ffmpeg', '-y', *inputs,
+               '-filter_complex', ';'.join(filters),
+               '-map', "[outv]" if sub_filter else "[vid]",
+               '-an', '-c:v', 'libx264', '-preset', 'ultrafast', '-crf', '23',
+               str(output_path)]
+        try:
+            self._run_ffmpeg(cmd, f"segment {os.path.basename(output_path)}")
+        finally:
+            if local_srt and os.path.isfile(local_srt):
+                os.remove(local_srt)
+        return output_path
+
+    def assemble_segments(self, segments: List[str], audio_duration: float) -> None:
+        """Join pre-rendered video segments (stream copy) and mux the voiceover and music."""
+        if not self.voiceover_file or not os.path.isfile(self.voiceover_file):
+            raise ValueError(Fore.RED + "❌ Voiceover audio file is missing.")
+        list_path = f"{self.output_file}.segments.txt"
+        write_concat_list(segments, list_path)
+        audio_filters, audio_map = self._audio_filters(1, audio_duration)
+        cmd = ['ffmpeg', '-y', '-f', 'concat', '-safe', '0', '-i', list_path,
+               *self._audio_inputs(audio_duration),
+               '-filter_complex', ';'.join(audio_filters),
+               '-map', '0:v', '-map', audio_map,
+               '-c:v', 'copy', '-c:a', 'aac', '-shortest', '-movflags', '+faststart',
+               str(self.output_file)]
+        try:
+            self._run_ffmpeg(cmd, "segment mux")
+        finally:
+            os.remove(list_path)
+        print(Fore.GREEN + f"✅ Video assembled from {len(segments)} segments: {self.output_file}")
+
+    @trace()
+    def assemble_streaming(
+        self,
+        chunks,
+        media_images,
+        style: Style = Style.DEFAULT,
+        position: Position = Position.MIDDLE_CENTER,
+        subtitle_postprocess: Optional[Callable[[str], None]] = None,
+        max_workers: int = 2,
+    ) -> None:
+        """
+        Render the video while the narration is still being synthesized.
+
+        Args:
+            chunks: A ChunkStream (scripts/AI/chunked_tts.py): iterable of narration
+                chunks with `texts` known up front and `audio_path` set once exhausted.
+            media_images: Image paths, or a Future resolving to them (so image
+                generation can overlap with TTS as well).
+            subtitle_postprocess: Applied to each segment's SRT before burning
+                (e.g. SRTProcessor regrouping for word-level boundaries).
+            max_workers: Segments encoded concurrently.
+
+        Each chunk becomes one silent segment as soon as it lands; the segments
+        are joined without re-encoding and the full voiceover is muxed at the end.
+        """
+        chunk_chars = [len(t) for t in chunks.texts]
+        work_dir = os.path.join(os.path.dirname(os.path.abspath(self.output_file)), f"_segments_{uuid.uuid4().hex[:8]}")
+        os.makedirs(work_dir, exist_ok=True)
+
+        def images() -> List[str]:
+            resolved = media_images.result() if hasattr(media_images, 'result') else media_images
+            valid = [img for img in resolved or [] if self._is_valid_image_file(img)]
+            if not valid:
+                raise ValueError(Fore.RED + "🚨 No valid image files found.")
+            return valid
+
+        def render(chunk, start: float) -> Optional[str]:
+            valid = images()
+            pieces = self.plan_chunk_pieces(len(valid), chunk_chars, chunk.index, start, chunk.duration)
+            srt_path = None
+            if chunk.boundaries:
+                srt_path = os.path.join(work_dir, f"segment_{chunk.index:04d}.srt")
+                with open(srt_path, 'w', encoding='utf-8') as f:
+                    f.write(boundaries_to_srt(chunk.boundaries))
+                if subtitle_postprocess is not None:
+                    subtitle_postprocess(srt_path)
+            out = os.path.join(work_dir, f"segment_{chunk.index:04d}.mp4")
+            return self.render_segment(valid, pieces, out, style, position, srt_path)
+
+        try:
+            start = 0.0
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = []
+                for chunk in chunks:
+                    futures.append(executor.submit(render, chunk, start))
+                    self.logger.info(f"Narration chunk {chunk.index + 1}/{len(chunk_chars)} "
+                                     f"({chunk.duration:.1f}s) queued for rendering")
+                    start += chunk.duration
+                segments = [path for path in (f.result() for f in futures) if path]
+            if not segments:
+                raise VideoAssemblerError("No video segments were rendered")
+            self.voiceover_file = chunks.audio_path
+            self.assemble_segments(segments, start)
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
     def generate_subtitle(
         self,
         txt: str,
@@ -689,9 +903,12 @@ class VideoAssembler(VideoAssemblerInterface):
         try:
             audio = mp.AudioFileClip(self.voiceover_file)
             
-            if self.background_music:
-                bg_music = mp.AudioFileClip(self.background_music)
-                bg_music = bg_music.volumex(0.1)  # Lower background volume
+            if self._has_background_music():
+                bed_path, volume = self._music_bed(audio.duration)
+                bg_music = mp.AudioFileClip(bed_path)
+                if volume is not None:
+                    bg_music = bg_music.volumex(volume)
+                bg_music = bg_music.subclip(0, min(audio.duration, bg_music.duration)).audio_fadeout(FADE_OUT_SECONDS)
                 audio = mp.CompositeAudioClip([audio, bg_music])
 
             return video.set_audio(audio)
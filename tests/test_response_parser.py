@@ -0,0 +1,62 @@
+import pytest
+
+from scripts.AI.response_parser import (
+    ResponseParseError,
+    _legacy_parse,
+    extract_json_text,
+    parse_json_object,
+    parse_json_response,
+)
+
+
+@pytest.mark.parametrize("response", [
+    '{"title": "x", "full_article": "y"}',
+    'Claro, aquí tienes el JSON:\n```json\n{"title": "x"}\n```',
+    'Respuesta [1]: {"title": "x"}',
+    "{'title': 'x', 'ok': True}",
+    '{title: "x",}',
+])
+def test_matches_legacy_parser(response):
+    assert parse_json_response(response) == _legacy_parse(response)
+
+
+def test_prefers_object_over_leading_array():
+    assert parse_json_response('Respuesta [1]: {"title": "x"}') == {"title": "x"}
+
+
+def test_repairs_outer_object_instead_of_returning_nested_one():
+    assert parse_json_response('{"a": {"b": 1}, }') == {"a": {"b": 1}}
+
+
+def test_array_enclosing_objects_is_kept():
+    assert parse_json_response('Resultados:\n[{"a": 1}, {"a": 2}]') == [{"a": 1}, {"a": 2}]
+    assert parse_json_response('[{"a": 1}, {"a": 2},]') == [{"a": 1}, {"a": 2}]
+
+
+def test_skips_unrepairable_braced_prose():
+    assert parse_json_response('Nota previa {no json}. {"title": "x"}') == {"title": "x"}
+
+
+def test_braces_inside_strings_do_not_end_the_span():
+    response = 'Ok: {"text": "llaves } y [corchetes]", "n": 2,}'
+    assert parse_json_response(response) == {"text": "llaves } y [corchetes]", "n": 2}
+
+
+def test_extract_json_text_returns_payload_substring():
+    assert extract_json_text('Respuesta [1]: {"title": "x"} fin') == '{"title": "x"}'
+
+
+@pytest.mark.parametrize("response", ["", "sin json", "{roto"])
+def test_unparseable_raises(response):
+    with pytest.raises(ResponseParseError):
+        parse_json_response(response)
+
+
+def test_parse_json_object_returns_objects():
+    assert parse_json_object('Claro: {"title": "x"}') == {"title": "x"}
+
+
+@pytest.mark.parametrize("response", ['Sure: ["a", "b"]', '["a", "b"]', '42'])
+def test_parse_json_object_rejects_non_objects(response):
+    with pytest.raises(ResponseParseError):
+        parse_json_object(response)